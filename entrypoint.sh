@@ -1,12 +1,19 @@
 #!/bin/sh
 PORT=${PORT:-8000}
 
-echo "Collecting static files..."
-python manage.py collectstatic --noinput
+# Static files are collected when the image is built (see Dockerfile); only a bind-mounted
+# source tree without them (docker-compose development) collects them here
+if [ ! -f staticfiles/staticfiles.json ]; then
+    echo "Collecting static files..."
+    python manage.py collectstatic --noinput
+fi
 
-if [ "$DJANGO_ENV" = "production" ]; then
-    echo "Starting Gunicorn server"
-    gunicorn mysite.wsgi:application --bind 0.0.0.0:$PORT
+if [ "$DJANGO_ENV" = "production" ] && [ "$SERVER_MODE" = "asgi" ]; then
+    echo "Starting Gunicorn server with Uvicorn (ASGI) workers"
+    gunicorn mysite.asgi:application -c python:mysite.gunicorn_conf
+elif [ "$DJANGO_ENV" = "production" ]; then
+    echo "Starting Gunicorn server (see mysite/gunicorn_conf.py)"
+    gunicorn mysite.wsgi:application -c python:mysite.gunicorn_conf
 else
     echo "Starting Django development server"
     python manage.py runserver 0.0.0.0:$PORT
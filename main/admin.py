@@ -4,10 +4,22 @@ from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin as DefaultUserAdmin
 from django.contrib.admin import AdminSite
 from .decorators import staff_member_required_403
-from django.utils import timezone
+from .search import RankedSearchMixin, autocomplete_clients, search_clients, search_client_requests
+from .autocomplete import CachedAutocompleteJsonView
+from .facets import FacetCountsMixin, facets_changed
+from .pagination import KeysetPaginationMixin, PaginatedInlineMixin
+from .rollups import DASHBOARD_CACHE_KEY, dashboard_summary
+from .exports import streaming_export_response
+from .routers import allow_replica_reads
+from .fragments import cached_fragment, cached_recent_actions, fragment_key, picklable_app_list
+from django.conf import settings
+from django.core.cache import caches
 
 # Custom AdminSite subclass to override permission checks and caching behavior
 class CustomAdminSite(AdminSite):
+    # Index template adding the request overview above the app list
+    index_template = 'admin/dashboard_index.html'
+
     # Override admin_view to apply custom access control and caching rules
     def admin_view(self, view, cacheable=False):
         # Wrap the original admin view with a custom decorator that restricts access
@@ -21,23 +33,99 @@ class CustomAdminSite(AdminSite):
         # Return the decorated view function
         return view
 
+    # Changelists using KeysetPaginationMixin switch to cursor pagination and estimated
+    # counts once a table's estimated row count reaches this size
+    @property
+    def large_table_threshold(self):
+        return settings.ADMIN_LARGE_TABLE_THRESHOLD
+
+    # The app list (index page and every page's nav sidebar) is cached per user under their
+    # permission version, so it's only rebuilt after their access changes
+    def get_app_list(self, request, app_label=None):
+        key = fragment_key(f'app-list:{self.name}:{app_label or ""}', request.user)
+        return cached_fragment(
+            key, lambda: picklable_app_list(super(CustomAdminSite, self).get_app_list(request, app_label))
+        )
+
+    # Add the request overview to the dashboard for users who can view ClientRequests.
+    # It reads the rollup table, so its cost doesn't grow with the number of requests, and
+    # is shared by all users for ADMIN_DASHBOARD_CACHE_TIMEOUT seconds.
+    # The recent-actions panel comes from the per-user fragment cache instead of django_admin_log
+    def index(self, request, extra_context=None):
+        extra_context = extra_context or {}
+        model_admin = self._registry.get(ClientRequest)
+        if model_admin is not None and model_admin.has_view_permission(request):
+            extra_context['request_overview'] = caches[settings.ADMIN_FRAGMENT_CACHE_ALIAS].get_or_set(
+                DASHBOARD_CACHE_KEY, dashboard_summary, settings.ADMIN_DASHBOARD_CACHE_TIMEOUT
+            )
+        extra_context['recent_actions'] = cached_recent_actions(request.user)
+        return super().index(request, extra_context)
+
+    # Lookups for autocomplete_fields widgets; cached, count-free for ModelAdmins that
+    # define get_autocomplete_results (main/autocomplete.py)
+    def autocomplete_view(self, request):
+        return CachedAutocompleteJsonView.as_view(admin_site=self)(request)
+
 # Instantiate the custom admin site; models will be registered on this instead of default admin site
 custom_admin_site = CustomAdminSite(name='custom_admin')
 
 # Inline admin for editing ClientRequest directly on the Client admin page
-class ClientRequestInline(admin.TabularInline):
+class ClientRequestInline(PaginatedInlineMixin, admin.TabularInline):
     model = ClientRequest
     extra = 1  # Number of extra blank forms to show
     fields = ('request_type', 'status', 'description', 'created_at')  # Fields shown in inline
     readonly_fields = ('created_at',)  # created_at is read-only
     show_change_link = True  # Show link to edit full ClientRequest object
+    per_page = 20  # Newest requests shown; older pages load on demand, plus a link to the filtered changelist
+    shared_choice_fields = ('request_type',)  # One RequestType query for every row's <select>
+
+    # Load each inline row's request type in the same query as the row itself
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('request_type')
        
 
+# Factory function to create admin actions that stream the selected rows as a file download.
+# With "select all" the action receives the whole filtered changelist queryset.
+def make_export_action(fmt, compress=False):
+    def action(modeladmin, request, queryset):
+        return streaming_export_response(queryset, fmt, compress, request=request)
+    suffix = '_gz' if compress else ''
+    action.__name__ = f'export_as_{fmt}{suffix}'
+    action.short_description = f'Export selected as {fmt.upper()}' + (' (gzip)' if compress else '')
+    # Exporting only needs read access
+    action.allowed_permissions = ('view',)
+    return action
+
+
+# Export actions shared by ClientAdmin and ClientRequestAdmin
+export_actions = [
+    make_export_action('csv'),
+    make_export_action('csv', compress=True),
+    make_export_action('jsonl'),
+    make_export_action('jsonl', compress=True),
+]
+
+
+# Admin actions are POSTs, which main/routers.py pins to the primary. Actions that only need
+# view permission (the exports) don't write, so their reads go back to the replicas.
+class ReplicaReadActionsMixin:
+    def response_action(self, request, queryset):
+        try:
+            name = request.POST.getlist('action')[int(request.POST.get('index', 0))]
+        except (IndexError, ValueError):
+            name = None
+        action = self.get_actions(request).get(name)
+        if action is not None and getattr(action[0], 'allowed_permissions', None) == ('view',):
+            allow_replica_reads()
+        return super().response_action(request, queryset)
+
+
 # Register Client table(model) with custom admin options
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(ReplicaReadActionsMixin, FacetCountsMixin, KeysetPaginationMixin, RankedSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'name', 'email', 'contact_number', 'company_url', 'created_at', 'is_active')  # Columns in list view
-    search_fields = ('name', 'email', 'contact_number', 'company_url')  # Searchable fields
-    list_filter = ('is_active', 'created_at')  # Filters on sidebar
+    search_fields = ('name', 'email', 'contact_number', 'company_url')  # Searchable fields (enables the search box)
+    search_backend = staticmethod(search_clients)  # Full-text + trigram search replaces icontains lookups
+    list_filter = ('is_active', 'created_at')  # Filters on sidebar, with cached counts per option (FacetCountsMixin)
     readonly_fields = ('created_at',)  # created_at cannot be edited
     ordering = ('-created_at',)  # Default ordering: newest first
     fieldsets = (
@@ -52,6 +140,24 @@ class ClientAdmin(admin.ModelAdmin):
     
     inlines = [ClientRequestInline]  # Include the ClientRequest inline admin on Client detail page
 
+    actions = [*export_actions]  # Streaming CSV/JSONL downloads of the selected clients
+
+    # Save inline ClientRequests with the editing user so status changes are attributed
+    def save_formset(self, request, form, formset, change):
+        if formset.model is not ClientRequest:
+            return super().save_formset(request, form, formset, change)
+        for obj in formset.save(commit=False):
+            obj.save(changed_by=request.user)
+        for obj in formset.deleted_objects:
+            obj.delete()
+        formset.save_m2m()
+
+    # Client autocomplete (ClientRequest forms): active clients whose name starts with the
+    # term, from the name prefix index. Add ?inactive=1 to the lookup URL to include the rest.
+    def get_autocomplete_results(self, request, queryset, term, offset, limit):
+        include_inactive = request.GET.get('inactive') == '1'
+        return autocomplete_clients(queryset, term, include_inactive)[offset:offset + limit]
+
 # Register Client model with custom admin site and ClientAdmin options
 custom_admin_site.register(Client, ClientAdmin)
 
@@ -76,9 +182,11 @@ custom_admin_site.register(RequestType, RequestTypeAdmin)
 # Factory function to create admin actions to update status of ClientRequest
 def make_status_action(status_value):
     def action(modeladmin, request, queryset):
-        now = timezone.now()
-        # Update selected ClientRequest objects with new status and updated timestamp
-        updated_count = queryset.update(status=status_value, updated_at=now)
+        # Update selected ClientRequest objects with new status and updated timestamp,
+        # recording the transitions in the status history with one INSERT ... SELECT
+        updated_count = queryset.set_status(status_value, changed_by=request.user)
+        # queryset.update() sends no signals, so drop the cached status counts here
+        facets_changed(ClientRequest)
         # Show message to user confirming how many were updated
         modeladmin.message_user(request, f'{updated_count} requests marked as {status_value}.')
     # Set the function name and description for display in admin UI
@@ -88,12 +196,18 @@ def make_status_action(status_value):
 
 
 # Admin customization for ClientRequest model
-class ClientRequestAdmin(admin.ModelAdmin):
+class ClientRequestAdmin(ReplicaReadActionsMixin, FacetCountsMixin, KeysetPaginationMixin, RankedSearchMixin, admin.ModelAdmin):
     list_display = ('id', 'client_name', 'request_type_name', 'status', 'description','created_at', 'updated_at')
     list_filter = ('status', 'created_at')
-    search_fields = ('client__name', 'request_type__name')
+    search_fields = ('client__name', 'request_type__name', 'description')
+    search_backend = staticmethod(search_client_requests)  # Description full-text + fuzzy client/type names
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-created_at',)
+    # Join client and request type into the changelist query so the name columns
+    # don't run two extra queries per row
+    list_select_related = ('client', 'request_type')
+    # Search-as-you-type widgets instead of <select>s listing every client and request type
+    autocomplete_fields = ('client', 'request_type')
     fieldsets = (
         (None, {
             'fields': ('client', 'request_type', 'status')
@@ -113,7 +227,17 @@ class ClientRequestAdmin(admin.ModelAdmin):
         make_status_action('Pending'),
         make_status_action('In Progress'),
         make_status_action('Completed'),
+        *export_actions,
     ]
+
+    # Attribute status changes made on the change form to the editing user
+    def save_model(self, request, obj, form, change):
+        obj.save(changed_by=request.user)
+
+    # Change view, delete view and actions all start from this queryset, so joining
+    # the related rows here keeps __str__ (titles, log entries, delete confirmation) query-free
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_related()
     
     # Display client name in list view by accessing related object
     def client_name(self, obj):
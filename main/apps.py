@@ -3,4 +3,8 @@ from django.apps import AppConfig
 class MainConfig(AppConfig):
     # Use BigAutoField by default for model primary keys
     default_auto_field = "django.db.models.BigAutoField"
-    name = "main"
\ No newline at end of file
+    name = "main"
+
+    # Connect the cache invalidation and session sweeper signals
+    def ready(self):
+        from . import fragments, permissions, sessions  # noqa: F401
@@ -0,0 +1,13 @@
+# Helpers shared by the benchmark_* management commands.
+
+
+class Rollback(Exception):
+    # Raised at the end of a transaction.atomic() block to discard everything a
+    # benchmark wrote, then caught right outside it
+    pass
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile: percentile(timings, 0.95) is the p95
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
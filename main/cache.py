@@ -0,0 +1,134 @@
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.functional import cached_property
+
+# Two-level cache backend: a per-worker in-memory layer in front of a shared backend.
+#
+# Reads try the local layer first and fall back to the shared one, copying hits into the
+# local layer for at most LOCAL_TIMEOUT seconds. Writes and deletes go to both layers of
+# this worker; other workers can keep serving their local copy until it expires, so only
+# cache data that is either immutable (versioned keys) or fine to be LOCAL_TIMEOUT seconds
+# stale. Anything that must be consistent everywhere (sessions, version counters, locks)
+# should use the shared alias directly.
+#
+#     CACHES = {
+#         'local': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+#         'shared': {...},
+#         'default': {
+#             'BACKEND': 'main.cache.TieredCache',
+#             'OPTIONS': {'LOCAL': 'local', 'SHARED': 'shared', 'LOCAL_TIMEOUT': 10},
+#         },
+#     }
+
+_MISSING = object()
+
+
+class TieredCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.local_alias = options.get('LOCAL', 'local')
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 10)
+
+    @cached_property
+    def local(self):
+        return caches[self.local_alias]
+
+    @cached_property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _local_timeout(self, timeout):
+        # Local copies never outlive the shared entry or LOCAL_TIMEOUT
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return self.local_timeout if timeout is None else min(timeout, self.local_timeout)
+
+    def get(self, key, default=None, version=None):
+        value = self.local.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                return default
+            self.local.set(key, value, self.local_timeout, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = self.local.get_many(keys, version=version)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.shared.get_many(missing, version=version)
+            if shared:
+                self.local.set_many(shared, self.local_timeout, version=version)
+            found.update(shared)
+        return found
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self.local.set(key, value, self._local_timeout(timeout), version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        self.local.set_many(data, self._local_timeout(timeout), version=version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.local.set(key, value, self._local_timeout(timeout), version=version)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.incr(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self.local.delete(key, version=version)
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        self.local.delete_many(keys, version=version)
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+# Version tokens for invalidating whole families of cache keys: callers put the current
+# token in their keys and bump it to orphan every key built from the old one. Tokens live
+# in the shared cache so a bump is seen by every worker, and are timestamps rather than
+# counters so a token lost to eviction is never reissued with stale keys still around.
+
+def _new_version():
+    return str(time.time_ns())
+
+
+def cache_versions(*names):
+    # Current token for each name, in order; missing tokens are created
+    cache = caches[settings.CACHE_VERSION_ALIAS]
+    keys = [f'version:{name}' for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # add() keeps a token another process set in the meantime; read that one back
+            token = _new_version()
+            versions[key] = token if cache.add(key, token, None) else cache.get(key, token)
+    return [versions[key] for key in keys]
+
+
+def bump_cache_version(name):
+    caches[settings.CACHE_VERSION_ALIAS].set(f'version:{name}', _new_version(), None)
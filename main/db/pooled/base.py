@@ -0,0 +1,89 @@
+import threading
+from functools import partial
+import psycopg2
+import psycopg2.extras
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel, is_psycopg3
+from .creation import DatabaseCreation
+from .pool import ConnectionPool, PoolTimeout
+
+# PostgreSQL backend that borrows connections from a per-process pool (pool.py) instead of
+# opening one per thread. Enabled by DB_POOL_SIZE in settings.py:
+#
+#     'ENGINE': 'main.db.pooled',
+#     'CONN_MAX_AGE': 0,
+#     'OPTIONS': {'pool': {'max_size': 10, 'timeout': 10, 'check_interval': 30, 'max_lifetime': 3600}},
+#
+# With CONN_MAX_AGE = 0 Django "closes" the connection when each request finishes, which
+# here returns it to the pool, so a worker holds at most max_size connections however many
+# threads it runs. The pool keeps no session state of its own and opens no server-side
+# prepared statements, so it also works behind PgBouncer in transaction mode.
+
+if is_psycopg3:
+    raise ImproperlyConfigured('main.db.pooled supports psycopg2 only.')
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def connect(params, options):
+    # What the parent class's get_new_connection() does to a fresh connection
+    connection = psycopg2.connect(**params)
+    if 'isolation_level' in options:
+        connection.isolation_level = IsolationLevel(options['isolation_level'])
+    psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+    return connection
+
+
+def get_pool(key, connect, options):
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(connect, **options)
+        return _pools[key]
+
+
+def close_pools():
+    # Closes every idle pooled connection in this process, e.g. before forking workers
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict['OPTIONS']
+        pool_options = options.get('pool', {})
+        # One pool per distinct set of connection parameters, so the test database and
+        # the database it was created from never share connections
+        key = (self.alias, repr(sorted(pool_options.items())), repr(sorted(conn_params.items())))
+        return get_pool(key, partial(connect, conn_params, options), pool_options)
+
+    @property
+    def pool(self):
+        return self.get_pool(self.get_connection_params())
+
+    def get_new_connection(self, conn_params):
+        # Remembered so the connection goes back to the pool it came from
+        self.connection_pool = self.get_pool(conn_params)
+        try:
+            connection = self.connection_pool.acquire()
+        except PoolTimeout as error:
+            raise self.Database.OperationalError(str(error)) from error
+        self.isolation_level = IsolationLevel(self.settings_dict['OPTIONS'].get('isolation_level', IsolationLevel.READ_COMMITTED))
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            self.connection_pool.release(self.connection)
+
+    def close_pool(self):
+        self.pool.close()
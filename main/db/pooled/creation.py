@@ -0,0 +1,10 @@
+from django.db.backends.postgresql import creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # PostgreSQL refuses to drop a database with open connections, pooled ones included,
+        # and replicas mirroring the test database have pools of their own
+        from .base import close_pools
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+# A bounded, thread-safe pool of psycopg2 connections, shared by the threads of one process.
+#
+# At most max_size connections exist at once, counting both idle and borrowed ones; when
+# all are borrowed, acquire() waits up to `timeout` seconds for one to be released. Idle
+# connections are pinged before reuse once they've sat for check_interval seconds, and
+# replaced after max_lifetime seconds so that none outlives a failover or a pooler reload.
+#
+# Pools are per process. Connections a forked child inherits are abandoned, never closed:
+# closing them would end the parent's sessions on the shared sockets.
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size=10, timeout=10, check_interval=30, max_lifetime=3600):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.max_lifetime = max_lifetime
+        self.pid = os.getpid()
+        self.size = 0
+        # (connection, created, released) tuples, most recently released last
+        self.idle = []
+        # id(connection) -> created, for borrowed connections
+        self.borrowed = {}
+        self.abandoned = []
+        self.condition = threading.Condition()
+
+    def _check_pid(self):
+        if self.pid != os.getpid():
+            self.abandoned += [conn for conn, _, _ in self.idle]
+            self.pid, self.size, self.idle, self.borrowed = os.getpid(), 0, [], {}
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self.condition:
+                self._check_pid()
+                while not self.idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f'No connection available within {self.timeout}s ({self.max_size} in use)')
+                    self.condition.wait(remaining)
+                if self.idle:
+                    conn, created, released = self.idle.pop()
+                else:
+                    conn, self.size = None, self.size + 1
+
+            if conn is None:
+                try:
+                    conn = self.connect()
+                except BaseException:
+                    self._discard(None)
+                    raise
+                created = time.monotonic()
+            elif not self._usable(conn, created, released):
+                self._discard(conn)
+                continue
+            with self.condition:
+                self.borrowed[id(conn)] = created
+            return conn
+
+    def _usable(self, conn, created, released):
+        now = time.monotonic()
+        if conn.closed or now - created > self.max_lifetime:
+            return False
+        if now - released < self.check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            return False
+
+    def release(self, conn):
+        with self.condition:
+            created = self.borrowed.pop(id(conn), None)
+        if created is None:
+            # Borrowed before a fork, or already released
+            return
+        if not conn.closed and conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            # Left inside a transaction (or an aborted one): roll back so the next borrower
+            # starts clean, and drop the connection if even that fails
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+        if conn.closed or conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+            self._discard(conn)
+            return
+        with self.condition:
+            self.idle.append((conn, created, time.monotonic()))
+            self.condition.notify()
+
+    def _discard(self, conn):
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def close(self):
+        # Closes the idle connections; borrowed ones rejoin the pool when released
+        with self.condition:
+            self._check_pid()
+            idle, self.idle = self.idle, []
+        for conn, _, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        with self.condition:
+            return {'size': self.size, 'idle': len(self.idle), 'borrowed': len(self.borrowed)}
@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+import zlib
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from .models import Client, ClientRequest
+
+# Streaming CSV/JSONL exports shared by the admin export actions and `manage.py export_data`.
+#
+# Rows come from values_list(...).iterator(chunk_size=...), which PostgreSQL serves from a
+# server-side cursor, and are encoded (and optionally gzipped) as they are read, so memory
+# stays flat whether an export has a thousand rows or ten million.
+#
+# The cursor is read inside a transaction. Outside one Django declares it WITH HOLD, which
+# PostgreSQL materializes in full when the declaring statement commits, and which can't
+# survive a transaction-mode pooler handing the next fetch to a different server connection.
+#
+# Under ASGI, Django reads a sync streaming iterator into a list before sending any of it,
+# so ASGI requests get an async iterator that produces one chunk at a time in the request's
+# sync thread (which holds the cursor's connection and transaction).
+
+# Rows fetched per server-side cursor round trip
+CHUNK_SIZE = 2000
+
+# Encoded bytes buffered before a chunk is handed to the response / output file
+FLUSH_BYTES = 64 * 1024
+
+# (column name, ORM lookup) per exportable model; related names are joined in the query
+EXPORT_COLUMNS = {
+    ClientRequest: (
+        ('id', 'id'),
+        ('client', 'client__name'),
+        ('request_type', 'request_type__name'),
+        ('status', 'status'),
+        ('description', 'description'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ),
+    Client: (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('email', 'email'),
+        ('contact_number', 'contact_number'),
+        ('company_url', 'company_url'),
+        ('created_at', 'created_at'),
+        ('is_active', 'is_active'),
+    ),
+}
+
+CONTENT_TYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+
+
+def _plain(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def export_rows(queryset):
+    columns = EXPORT_COLUMNS[queryset.model]
+    with transaction.atomic(using=queryset.db):
+        yield from queryset.values_list(*[lookup for _, lookup in columns]).iterator(chunk_size=CHUNK_SIZE)
+
+
+def _encode_csv(queryset):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS[queryset.model]])
+    for row in export_rows(queryset):
+        writer.writerow([_plain(value) for value in row])
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _encode_jsonl(queryset):
+    names = [name for name, _ in EXPORT_COLUMNS[queryset.model]]
+    lines = []
+    size = 0
+    for row in export_rows(queryset):
+        line = json.dumps(dict(zip(names, map(_plain, row)))) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield ''.join(lines).encode('utf-8')
+            lines = []
+            size = 0
+    yield ''.join(lines).encode('utf-8')
+
+
+def _gzip(chunks):
+    # wbits=31 writes a gzip header/trailer, so the output is a normal .gz file
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(queryset, fmt='csv', compress=False):
+    # Generator of encoded byte chunks for `queryset` in the given format
+    chunks = _encode_csv(queryset) if fmt == 'csv' else _encode_jsonl(queryset)
+    return _gzip(chunks) if compress else chunks
+
+
+async def _async_chunks(chunks):
+    next_chunk = sync_to_async(next, thread_sensitive=True)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        # Closes the cursor and its transaction when the client disconnects mid-export
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def export_filename(model, fmt, compress=False):
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+    return f'{model._meta.model_name}-{stamp}.{fmt}' + ('.gz' if compress else '')
+
+
+def streaming_export_response(queryset, fmt='csv', compress=False, request=None):
+    # The rows are read after the request has left the middleware, so the database (a
+    # replica, when main/routers.py routes this request's reads to one) is chosen now
+    queryset = queryset.using(queryset.db)
+    chunks = stream_export(queryset, fmt, compress)
+    if isinstance(request, ASGIRequest):
+        chunks = _async_chunks(chunks)
+    response = StreamingHttpResponse(
+        chunks,
+        content_type='application/gzip' if compress else CONTENT_TYPES[fmt],
+    )
+    filename = export_filename(queryset.model, fmt, compress)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
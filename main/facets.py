@@ -0,0 +1,121 @@
+import copy
+import hashlib
+from django.conf import settings
+from django.contrib.admin import FieldListFilter
+from django.contrib.admin.utils import prepare_lookup_value
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import QueryDict
+from django.utils.functional import SimpleLazyObject
+from .cache import bump_cache_version, cache_versions
+from .models import Client, ClientRequest
+from .pagination import estimated_count
+
+# Facet counts for changelist filter sidebars ("Pending (1204)").
+#
+# Each count follows the rest of the page: it's the number of rows the changelist would
+# show with that option picked, under the current search and the other filters. A facet
+# takes one aggregate over that queryset with a filtered COUNT per option, so the table
+# is read once per facet rather than once per option.
+#
+# Counts are cached per facet under a key built from what they depend on: the other
+# filters' parameters (sorted, so their order in the URL doesn't matter), the normalized
+# search term and the options' lookups. Paging, sorting and the facet's own selection
+# aren't part of it, so paging through a list or switching between a facet's options
+# reuses its counts. Keys carry a per-model version bumped by ORM saves and deletes and
+# by the admin status actions; ADMIN_FACET_CACHE_TIMEOUT bounds staleness after bulk
+# writes that bypass both (COPY imports, seeding).
+#
+# Large-table changelists (main/pagination.py) don't count rows, and neither do their
+# facets: each option shows the planner's estimate instead, marked with a "~" like the
+# list's own estimated total.
+#
+# Only FieldListFilters get counts: their options are plain lookups on the queryset.
+# SimpleListFilters filter in arbitrary code and are rendered as usual.
+
+
+def facet_version(model):
+    return f'facets:{model._meta.label_lower}'
+
+
+def facets_changed(model):
+    bump_cache_version(facet_version(model))
+
+
+def choice_lookups(spec, choice):
+    # The filter lookups an option's link applies for this facet ({} for "All")
+    params = QueryDict(choice['query_string'].lstrip('?'))
+    return {
+        name: prepare_lookup_value(name, params[name])
+        for name in spec.expected_parameters()
+        if name in params
+    }
+
+
+def facet_queryset(changelist, request, spec):
+    # The changelist's queryset with the search and every filter except `spec` applied.
+    # get_queryset() stores filter state on the changelist, so it runs on a copy.
+    other = copy.copy(changelist)
+    other.params = {
+        name: value for name, value in changelist.params.items()
+        if name not in spec.expected_parameters()
+    }
+    return other.get_queryset(request).order_by()
+
+
+def facet_key(changelist, spec, lookups, estimated):
+    own = set(spec.expected_parameters())
+    filters = sorted((name, value) for name, value in changelist.get_filters_params().items() if name not in own)
+    search = ' '.join(changelist.query.split())
+    digest = hashlib.md5(repr((spec.field_path, filters, search, lookups, estimated)).encode()).hexdigest()
+    model = changelist.model
+    return f"admin:facets:{model._meta.label_lower}:{cache_versions(facet_version(model))[0]}:{digest}"
+
+
+def facet_counts(changelist, request, spec, lookups, estimated=False):
+    # Row count for each option's lookups, in order
+    cache = caches[settings.ADMIN_FRAGMENT_CACHE_ALIAS]
+    key = facet_key(changelist, spec, lookups, estimated)
+    counts = cache.get(key)
+    if counts is None:
+        queryset = facet_queryset(changelist, request, spec)
+        if estimated:
+            counts = [estimated_count(queryset.filter(**option)) for option in lookups]
+        else:
+            totals = queryset.aggregate(**{
+                f'option_{n}': Count('pk', filter=Q(**option)) if option else Count('pk')
+                for n, option in enumerate(lookups)
+            })
+            counts = [totals[f'option_{n}'] for n in range(len(lookups))]
+        cache.set(key, counts, settings.ADMIN_FACET_CACHE_TIMEOUT)
+    return counts
+
+
+def facet_choices(changelist, request, spec):
+    choices = list(spec.choices(changelist))
+    estimated = getattr(changelist, 'large_table', False)
+    counts = facet_counts(changelist, request, spec, [choice_lookups(spec, choice) for choice in choices], estimated)
+    return [{**choice, 'count': count, 'estimated': estimated} for choice, count in zip(choices, counts)]
+
+
+class FacetCountsMixin:
+    # ModelAdmin mixin adding facet counts to the list_filter sidebar
+
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        for spec in changelist.filter_specs:
+            if isinstance(spec, FieldListFilter):
+                # Counted when the sidebar renders, so action POSTs and exports skip them
+                spec.facet_choices = SimpleLazyObject(
+                    lambda spec=spec: facet_choices(changelist, request, spec)
+                )
+                spec.template = 'admin/facet_filter.html'
+        return changelist
+
+
+@receiver([post_save, post_delete], sender=Client)
+@receiver([post_save, post_delete], sender=ClientRequest)
+def facet_source_changed(sender, **kwargs):
+    facets_changed(sender)
@@ -1,3 +1,4 @@
+from asgiref.sync import sync_to_async
 from django import forms
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
@@ -78,4 +79,17 @@ class UserRegistrationForm (forms.ModelForm):
             except Group.DoesNotExist:
                 # If group doesn't exist, silently ignore
                 pass
-        return user
\ No newline at end of file
+        return user
+
+    async def asave(self):
+        # Async twin of save() for the async RegisterView. Password hashing is CPU-bound,
+        # so it runs in a worker thread instead of blocking the event loop
+        user = super().save(commit=False)
+        await sync_to_async(user.set_password)(self.cleaned_data['password'])
+        user.is_staff = True
+        await user.asave()
+        # Add the user to the 'LimitedUsers' group if it exists
+        limited_group = await Group.objects.filter(name='LimitedUsers').afirst()
+        if limited_group is not None:
+            await user.groups.aadd(limited_group)
+        return user
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.core.cache import caches
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils.translation import get_language
+from .cache import bump_cache_version, cache_versions
+from .permissions import permission_version
+
+# Per-user cached admin fragments: the app list behind the index page and nav sidebar,
+# and the index page's "Recent actions" panel.
+#
+# Keys include the user's permission version (main/permissions.py), so granting or revoking
+# access rebuilds them, and the recent-actions key also includes a version bumped by every
+# new LogEntry. The active language is part of the key because both hold translated names.
+
+ADMIN_LOG_VERSION = 'admin-log'
+
+# Number of entries in the index page's "Recent actions" panel (as in Django's template)
+RECENT_ACTIONS = 10
+
+
+def fragment_key(name, user, *versions):
+    parts = ['admin', name, str(user.pk), get_language() or '', permission_version(user)]
+    return ':'.join(parts + cache_versions(*versions))
+
+
+def cached_fragment(key, build):
+    cache = caches[settings.ADMIN_FRAGMENT_CACHE_ALIAS]
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, settings.ADMIN_FRAGMENT_CACHE_TIMEOUT)
+    return value
+
+
+def picklable_app_list(app_list):
+    # AdminSite.get_app_list() names are lazy translations, which can't be pickled;
+    # the key already includes the language, so they're rendered to plain strings
+    return [
+        {
+            **app,
+            'name': str(app['name']),
+            'models': [{**model, 'name': str(model['name'])} for model in app['models']],
+        }
+        for app in app_list
+    ]
+
+
+def recent_actions(user, limit=RECENT_ACTIONS):
+    # The data Django's index template reads from get_admin_log, as plain dicts
+    entries = LogEntry.objects.filter(user=user).select_related('content_type')[:limit]
+    return [
+        {
+            'is_addition': entry.is_addition(),
+            'is_change': entry.is_change(),
+            'is_deletion': entry.is_deletion(),
+            'url': None if entry.is_deletion() else entry.get_admin_url(),
+            'object_repr': entry.object_repr,
+            'content_type': str(entry.content_type.name) if entry.content_type else None,
+        }
+        for entry in entries
+    ]
+
+
+def cached_recent_actions(user):
+    return cached_fragment(fragment_key('recent-actions', user, ADMIN_LOG_VERSION), lambda: recent_actions(user))
+
+
+@receiver(post_save, sender=LogEntry)
+def admin_log_written(sender, created, **kwargs):
+    if created:
+        bump_cache_version(ADMIN_LOG_VERSION)
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+
+# Password hashers with costs taken from settings (ARGON2_*, SCRYPT_*, PBKDF2_ITERATIONS), so
+# they can be tuned per deployment; `manage.py benchmark_hashers` measures the candidates.
+#
+# The algorithm names are Django's own, so existing hashes keep verifying. Whenever a stored
+# hash uses another algorithm than PASSWORD_HASHER, or other costs than these, Django
+# re-encodes it with the current settings the next time that user logs in
+# (User.check_password() saves the upgraded hash).
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    time_cost = settings.ARGON2_TIME_COST
+    memory_cost = settings.ARGON2_MEMORY_COST
+    parallelism = settings.ARGON2_PARALLELISM
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = settings.SCRYPT_WORK_FACTOR
+    block_size = settings.SCRYPT_BLOCK_SIZE
+    parallelism = settings.SCRYPT_PARALLELISM
+    # hashlib.scrypt() refuses to use more than 32 MiB by default (N=2**15, r=8 already needs
+    # that much); allow up to 1 GiB so that older, costlier hashes still verify
+    maxmem = 2**30
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = settings.PBKDF2_ITERATIONS
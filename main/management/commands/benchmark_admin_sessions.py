@@ -0,0 +1,74 @@
+"""
+Measure admin page latency and queries per request under each session store.
+
+Runs inside a transaction that is rolled back, with a throwaway superuser logged in
+through Django's test client, so it leaves no rows behind. Point CACHE_URL at the
+real shared backend to include its round trips.
+
+Usage:
+    python manage.py benchmark_admin_sessions
+    python manage.py benchmark_admin_sessions --requests 500 --path /admin/main/clientrequest/
+    python manage.py benchmark_admin_sessions --store db --store cached_db
+"""
+import statistics
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from main.benchmarking import Rollback, percentile
+
+STORES = ['db', 'cached_db', 'cache']
+
+
+def benchmark_store(store, path, requests, warmup=5):
+    # Returns {'p50': ms, 'p95': ms, 'queries': mean, 'session_queries': mean} for one store
+    timings, queries, session_queries = [], [], []
+    with override_settings(SESSION_ENGINE=f'django.contrib.sessions.backends.{store}', SESSION_SWEEP_INTERVAL=0):
+        try:
+            with transaction.atomic():
+                user = get_user_model().objects.create_superuser(username=f'benchmark-{store}', password=None)
+                client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+                client.force_login(user)
+                for _ in range(warmup):
+                    client.get(path)
+                for _ in range(requests):
+                    with CaptureQueriesContext(connection) as context:
+                        started = time.perf_counter()
+                        response = client.get(path)
+                        timings.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        raise CommandError(f'{path} returned {response.status_code} with {store} sessions')
+                    queries.append(len(context.captured_queries))
+                    session_queries.append(sum('django_session' in q['sql'] for q in context.captured_queries))
+                raise Rollback
+        except Rollback:
+            pass
+    return {
+        'p50': statistics.median(timings),
+        'p95': percentile(timings, 0.95),
+        'queries': statistics.mean(queries),
+        'session_queries': statistics.mean(session_queries),
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare admin page latency and query counts for the db, cached_db and cache session stores."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Timed requests per store (default 200).")
+        parser.add_argument("--path", default="/admin/", help="Admin page to request (default /admin/).")
+        parser.add_argument("--store", action="append", choices=STORES, help="Store to measure; repeat for several (default: all).")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1.")
+        for store in options["store"] or STORES:
+            result = benchmark_store(store, options["path"], options["requests"])
+            self.stdout.write(
+                f"{store:>10}: p50 {result['p50']:.2f} ms, p95 {result['p95']:.2f} ms, "
+                f"{result['queries']:.1f} queries/request ({result['session_queries']:.1f} on django_session)"
+            )
+        self.stdout.write(self.style.NOTICE(f"Shared cache backend: {settings.CACHES['shared']['BACKEND']}"))
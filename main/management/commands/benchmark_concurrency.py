@@ -0,0 +1,98 @@
+"""
+Fire concurrent HTTP requests at a running server to compare WSGI and ASGI serving.
+
+Start the app in each mode with the same number of workers, then point this at it:
+
+    gunicorn mysite.wsgi:application -w 2 --bind 127.0.0.1:8001
+    gunicorn mysite.asgi:application -w 2 -k uvicorn_worker.UvicornWorker --bind 127.0.0.1:8002
+
+Usage:
+    python manage.py benchmark_concurrency http://127.0.0.1:8001/login/
+    python manage.py benchmark_concurrency http://127.0.0.1:8002/login/ --concurrency 200 --requests 2000
+    python manage.py benchmark_concurrency http://127.0.0.1:8001/login/ --slow-ms 250   ← clients that
+                                                        take 250 ms to finish sending their request,
+                                                        which is what ties up sync workers
+"""
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+from main.benchmarking import percentile
+
+
+async def fetch(host, port, path, slow):
+    # One HTTP/1.1 GET on a fresh connection; returns (status code, seconds)
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n'.encode())
+        await writer.drain()
+        if slow:
+            await asyncio.sleep(slow)
+        writer.write(b'\r\n')
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+    finally:
+        writer.close()
+    return int(status_line.split()[1]), time.perf_counter() - started
+
+
+async def run_load(url, requests, concurrency, slow):
+    # Returns (latencies in seconds, error count, wall-clock seconds)
+    parts = urlsplit(url)
+    path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            try:
+                status, elapsed = await fetch(parts.hostname, parts.port or 80, path, slow)
+            except (OSError, IndexError, ValueError):
+                errors += 1
+                return
+            if status >= 500:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies, errors, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Measure throughput and latency percentiles of a running server under concurrent load."
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Full URL to request, e.g. http://127.0.0.1:8000/login/")
+        parser.add_argument("--requests", type=int, default=1000, help="Total requests (default 1000).")
+        parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight at once (default 100).")
+        parser.add_argument("--slow-ms", type=int, default=0, help="Delay before each client finishes its request.")
+
+    def handle(self, *args, **options):
+        if urlsplit(options["url"]).scheme != "http":
+            raise CommandError("Only plain http:// URLs are supported.")
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+
+        latencies, errors, wall = asyncio.run(
+            run_load(options["url"], options["requests"], options["concurrency"], options["slow_ms"] / 1000)
+        )
+        if not latencies:
+            raise CommandError(f"All {errors} requests failed.")
+
+        def ms(fraction):
+            return percentile(latencies, fraction) * 1000
+
+        self.stdout.write(
+            f"{len(latencies)} ok, {errors} failed in {wall:.2f}s "
+            f"({len(latencies) / wall:,.0f} req/s at concurrency {options['concurrency']})"
+        )
+        self.stdout.write(
+            f"latency p50 {ms(0.5):.1f} ms, p95 {ms(0.95):.1f} ms, p99 {ms(0.99):.1f} ms, "
+            f"mean {statistics.mean(latencies) * 1000:.1f} ms"
+        )
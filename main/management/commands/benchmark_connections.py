@@ -0,0 +1,111 @@
+"""
+Load test: many threads serving admin requests, while sampling how many connections
+PostgreSQL sees from this process.
+
+Each thread stands in for a gunicorn gthread worker thread and makes requests through
+Django's test client, so connections are opened and released by the normal request cycle.
+Compare the plain backend with the pooled one (main/db/pooled):
+
+Usage:
+    python manage.py benchmark_connections                       ← one connection per thread
+    DB_POOL_SIZE=5 python manage.py benchmark_connections        ← never more than 5
+    python manage.py benchmark_connections --threads 50 --requests 40 --path /admin/main/clientrequest/
+"""
+import threading
+import time
+import psycopg2
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+
+COUNT_CONNECTIONS = """
+    SELECT count(*) FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()
+"""
+
+
+def sample_connections(params, stop, samples, interval=0.02):
+    # Runs on its own psycopg2 connection, outside Django and any pool
+    monitor = psycopg2.connect(**params)
+    monitor.autocommit = True
+    try:
+        with monitor.cursor() as cursor:
+            while not stop.is_set():
+                cursor.execute(COUNT_CONNECTIONS)
+                samples.append(cursor.fetchone()[0])
+                stop.wait(interval)
+    finally:
+        monitor.close()
+
+
+def run_load(user, path, threads, requests):
+    # Returns (status code -> count, error messages, seconds)
+    statuses, errors = {}, []
+    lock = threading.Lock()
+
+    def worker():
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        client.force_login(user)
+        for _ in range(requests):
+            try:
+                status = client.get(path).status_code
+            except Exception as error:
+                with lock:
+                    errors.append(str(error))
+                continue
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+        connections.close_all()
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return statuses, errors, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Serve admin requests from many threads and report PostgreSQL connection counts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=20, help="Concurrent request threads (default 20).")
+        parser.add_argument("--requests", type=int, default=20, help="Requests per thread (default 20).")
+        parser.add_argument("--path", default="/admin/", help="Admin page to request (default /admin/).")
+
+    def handle(self, *args, **options):
+        if options["threads"] < 1 or options["requests"] < 1:
+            raise CommandError("--threads and --requests must be at least 1.")
+
+        pool = connection.settings_dict["OPTIONS"].get("pool")
+        self.stdout.write(
+            f"Backend: {connection.settings_dict['ENGINE']}"
+            + (f" (pool of {pool['max_size']})" if pool else " (one connection per thread)")
+        )
+
+        user = get_user_model().objects.create_superuser(username="benchmark-connections", password=None)
+        connection.close()
+        stop, samples = threading.Event(), []
+        sampler = threading.Thread(target=sample_connections, args=(connection.get_connection_params(), stop, samples))
+        sampler.start()
+        try:
+            statuses, errors, wall = run_load(user, options["path"], options["threads"], options["requests"])
+        finally:
+            stop.set()
+            sampler.join()
+            user.delete()
+
+        total = sum(statuses.values())
+        self.stdout.write(
+            f"{total} requests in {wall:.2f}s ({total / wall:,.0f} req/s), "
+            f"statuses {dict(sorted(statuses.items()))}, {len(errors)} errors"
+        )
+        self.stdout.write(
+            f"PostgreSQL connections: peak {max(samples, default=0)}, "
+            f"mean {sum(samples) / max(len(samples), 1):.1f} over {len(samples)} samples"
+        )
+        for message in sorted(set(errors))[:5]:
+            self.stdout.write(self.style.WARNING(message))
@@ -0,0 +1,119 @@
+"""
+Time password hashing per algorithm and cost, to choose PASSWORD_HASHER and its
+ARGON2_* / SCRYPT_* / PBKDF2_ITERATIONS settings (main/hashers.py).
+
+Every login hashes the submitted password once (twice when the stored hash is upgraded),
+so the chosen cost is added to login latency and burns that much CPU per attempt. Run
+this on the production hardware; candidates over --budget-ms are flagged.
+
+Usage:
+    python manage.py benchmark_hashers
+    python manage.py benchmark_hashers --algorithm argon2 --budget-ms 100
+    python manage.py benchmark_hashers --candidate argon2:time_cost=3,memory_cost=65536   ← extra
+                                                        candidates, repeatable
+"""
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+# Cost parameters per algorithm (attribute names on the hasher classes), and a spread of
+# candidates around the common recommendations
+PARAMETERS = {
+    'argon2': ('time_cost', 'memory_cost', 'parallelism'),
+    'scrypt': ('work_factor', 'block_size', 'parallelism'),
+    'pbkdf2': ('iterations',),
+}
+CANDIDATES = {
+    'argon2': [
+        {'time_cost': 1, 'memory_cost': 47104, 'parallelism': 1},
+        {'time_cost': 2, 'memory_cost': 19456, 'parallelism': 1},
+        {'time_cost': 3, 'memory_cost': 12288, 'parallelism': 1},
+        {'time_cost': 2, 'memory_cost': 65536, 'parallelism': 2},
+    ],
+    'scrypt': [
+        {'work_factor': 2**14, 'block_size': 8, 'parallelism': 1},
+        {'work_factor': 2**15, 'block_size': 8, 'parallelism': 1},
+        {'work_factor': 2**16, 'block_size': 8, 'parallelism': 1},
+    ],
+    'pbkdf2': [
+        {'iterations': 210000},
+        {'iterations': 600000},
+        {'iterations': 1000000},
+    ],
+}
+
+
+def parse_candidate(value):
+    # 'argon2:time_cost=3,memory_cost=65536' -> ('argon2', {'time_cost': 3, 'memory_cost': 65536})
+    algorithm, _, params = value.partition(':')
+    if algorithm not in PARAMETERS:
+        raise CommandError(f"Unknown algorithm {algorithm!r}; expected one of {', '.join(PARAMETERS)}.")
+    parsed = {}
+    for pair in filter(None, params.split(',')):
+        name, _, number = pair.partition('=')
+        if name not in PARAMETERS[algorithm] or not number.isdigit():
+            raise CommandError(f"Bad parameter {pair!r} for {algorithm}; expected {', '.join(PARAMETERS[algorithm])}.")
+        parsed[name] = int(number)
+    return algorithm, parsed
+
+
+def configured_hasher(algorithm, params):
+    # The tuned hasher from settings.TUNED_HASHERS, with `params` overriding its costs
+    hasher = import_string(settings.TUNED_HASHERS[algorithm])()
+    for name, value in params.items():
+        setattr(hasher, name, value)
+    return hasher
+
+
+def time_hasher(hasher, rounds):
+    # Milliseconds per encode(), after one untimed warm-up
+    hasher.encode('benchmark-password', hasher.salt())
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.encode('benchmark-password', hasher.salt())
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+class Command(BaseCommand):
+    help = "Measure password hash time per algorithm and cost, against a latency budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--algorithm", action="append", choices=list(PARAMETERS), help="Algorithm to measure; repeat for several (default: all).")
+        parser.add_argument("--candidate", action="append", default=[], help="Extra 'algorithm:name=value,...' to measure.")
+        parser.add_argument("--rounds", type=int, default=5, help="Timed hashes per candidate (default 5).")
+        parser.add_argument("--budget-ms", type=float, default=250, help="Acceptable time per hash (default 250 ms).")
+
+    def handle(self, *args, **options):
+        if options["rounds"] < 1:
+            raise CommandError("--rounds must be at least 1.")
+        algorithms = options["algorithm"] or list(PARAMETERS)
+        extra = [parse_candidate(value) for value in options["candidate"]]
+
+        for algorithm in algorithms:
+            current = {name: getattr(configured_hasher(algorithm, {}), name) for name in PARAMETERS[algorithm]}
+            candidates = [current] + [c for c in CANDIDATES[algorithm] if c != current]
+            candidates += [{**current, **params} for name, params in extra if name == algorithm]
+
+            preferred = " (PASSWORD_HASHER)" if algorithm == settings.PASSWORD_HASHER else ""
+            self.stdout.write(self.style.NOTICE(f"{algorithm}{preferred}"))
+            for params in candidates:
+                try:
+                    timings = time_hasher(configured_hasher(algorithm, params), options["rounds"])
+                except ValueError as error:
+                    # e.g. argon2-cffi not installed, or scrypt over its memory limit
+                    self.stdout.write(self.style.WARNING(f"  {self.describe(params)}: {error}"))
+                    continue
+                median = statistics.median(timings)
+                line = f"  {self.describe(params)}: median {median:.1f} ms, max {max(timings):.1f} ms"
+                if params == current:
+                    line += "  ← current settings"
+                style = self.style.SUCCESS if median <= options["budget_ms"] else self.style.WARNING
+                self.stdout.write(style(line if median <= options["budget_ms"] else line + "  (over budget)"))
+
+    @staticmethod
+    def describe(params):
+        return ", ".join(f"{name}={value}" for name, value in params.items())
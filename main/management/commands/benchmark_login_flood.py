@@ -0,0 +1,154 @@
+"""
+Load test: admin page latency before and during a login flood against a running server.
+
+A throwaway superuser gets a session straight from the session store, admin requests are
+timed on their own, then timed again while many concurrent clients POST wrong passwords to
+/login/ with a valid CSRF token, as a credential-stuffing script would. With throttling on
+(main/throttling.py) the flood is answered with cheap 429s and admin latency stays flat;
+run the server with THROTTLE_LOGIN_IP= THROTTLE_LOGIN_USERNAME= to see it without.
+
+The server must share this command's database, and its session store must be db or
+cached_db (or cache with a real shared CACHE_URL) so it can read the session created here.
+
+Usage:
+    python manage.py benchmark_login_flood http://127.0.0.1:8000
+    python manage.py benchmark_login_flood http://127.0.0.1:8000 --flood-concurrency 100 --admin-requests 200
+"""
+import asyncio
+import random
+import re
+import statistics
+import time
+from urllib.parse import urlencode, urlsplit
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from main.benchmarking import percentile
+
+CSRF_INPUT = re.compile(rb'name="csrfmiddlewaretoken" value="([^"]+)"')
+CSRF_COOKIE = re.compile(rf'{re.escape(settings.CSRF_COOKIE_NAME)}=([^;]+)'.encode())
+
+
+async def http_request(host, port, method, path, headers=None, body=b''):
+    # One HTTP/1.1 request on a fresh connection; returns (status, raw headers, body, seconds)
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {settings.ALLOWED_HOSTS[0]}', 'Connection: close']
+        lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+        if body:
+            lines.append(f'Content-Length: {len(body)}')
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+        response = await reader.read()
+    finally:
+        writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), head, content, time.perf_counter() - started
+
+
+def admin_session(user):
+    # A logged-in session for `user`, as login() would store it
+    store = import_string(f'{settings.SESSION_ENGINE}.SessionStore')()
+    store[SESSION_KEY] = str(user.pk)
+    store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    store.save()
+    return store
+
+
+async def time_admin(host, port, path, cookie, requests, concurrency=2):
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+
+    async def one():
+        async with semaphore:
+            status, _, _, elapsed = await http_request(host, port, 'GET', path, {'Cookie': cookie})
+            if status != 200:
+                raise CommandError(f'{path} returned {status}')
+            timings.append(elapsed * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return timings
+
+
+async def flood(host, port, concurrency, stop, statuses):
+    # Wrong-password logins for a handful of usernames until `stop` is set
+    status, head, content, _ = await http_request(host, port, 'GET', '/login/')
+    token, cookie = CSRF_INPUT.search(content), CSRF_COOKIE.search(head)
+    if status != 200 or not token or not cookie:
+        raise CommandError('Could not read a CSRF token from /login/.')
+    headers = {
+        'Cookie': f'{settings.CSRF_COOKIE_NAME}={cookie.group(1).decode()}',
+        'Content-Type': 'application/x-www-form-urlencoded',
+        'Referer': f'http://{settings.ALLOWED_HOSTS[0]}/login/',
+    }
+
+    async def attacker():
+        while not stop.is_set():
+            body = urlencode({
+                'csrfmiddlewaretoken': token.group(1).decode(),
+                'username': f'victim{random.randrange(10)}',
+                'password': f'guess-{random.random()}',
+            }).encode()
+            try:
+                status, _, _, _ = await http_request(host, port, 'POST', '/login/', headers, body)
+            except OSError:
+                status = 'error'
+            statuses[status] = statuses.get(status, 0) + 1
+
+    await asyncio.gather(*(attacker() for _ in range(concurrency)))
+
+
+async def run(host, port, path, cookie, admin_requests, flood_concurrency):
+    baseline = await time_admin(host, port, path, cookie, admin_requests)
+    stop, statuses = asyncio.Event(), {}
+    started = time.perf_counter()
+    flooding = asyncio.create_task(flood(host, port, flood_concurrency, stop, statuses))
+    await asyncio.sleep(1)  # let the flood build up
+    try:
+        during = await time_admin(host, port, path, cookie, admin_requests)
+    finally:
+        stop.set()
+        await flooding
+    return baseline, during, statuses, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Compare admin latency before and during a login flood against a running server."
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Server base URL, e.g. http://127.0.0.1:8000")
+        parser.add_argument("--admin-path", default="/admin/", help="Admin page to time (default /admin/).")
+        parser.add_argument("--admin-requests", type=int, default=100, help="Admin requests per phase (default 100).")
+        parser.add_argument("--flood-concurrency", type=int, default=50, help="Concurrent flooding clients (default 50).")
+
+    def handle(self, *args, **options):
+        parts = urlsplit(options["url"])
+        if parts.scheme != "http":
+            raise CommandError("Only plain http:// URLs are supported.")
+        if options["admin_requests"] < 1 or options["flood_concurrency"] < 1:
+            raise CommandError("--admin-requests and --flood-concurrency must be at least 1.")
+
+        user = get_user_model().objects.create_superuser(username="benchmark-login-flood", password=None)
+        session = admin_session(user)
+        try:
+            baseline, during, statuses, wall = asyncio.run(run(
+                parts.hostname, parts.port or 80, options["admin_path"],
+                f"{settings.SESSION_COOKIE_NAME}={session.session_key}",
+                options["admin_requests"], options["flood_concurrency"],
+            ))
+        finally:
+            session.delete()
+            user.delete()
+
+        for label, timings in (("before flood", baseline), ("during flood", during)):
+            self.stdout.write(
+                f"admin {label}: p50 {statistics.median(timings):.1f} ms, p95 {percentile(timings, 0.95):.1f} ms"
+            )
+        attempts = sum(statuses.values())
+        self.stdout.write(
+            f"flood: {attempts} login attempts ({attempts / wall:,.0f}/s), "
+            f"statuses {dict(sorted(statuses.items(), key=str))}"
+        )
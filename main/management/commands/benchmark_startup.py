@@ -0,0 +1,89 @@
+"""
+Measure cold-start time: from launching a server process to its first 200 response.
+
+The server command is started with PORT set to a free port (mysite/gunicorn_conf.py binds
+to it), the URL is polled until it answers 200, and the process is stopped again.
+
+Usage:
+    python manage.py benchmark_startup
+    python manage.py benchmark_startup --runs 5 --path /static/css/styles.css
+    python manage.py benchmark_startup --server "sh entrypoint.sh"   ← include the entrypoint's
+                                                        own work, e.g. collectstatic
+"""
+import os
+import shlex
+import signal
+import socket
+import statistics
+import subprocess
+import time
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_SERVER = 'gunicorn mysite.wsgi:application -c python:mysite.gunicorn_conf'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def first_ok(url, host, deadline, process):
+    # Polls until url returns 200; returns the time it did, or None if the server died
+    # or the deadline passed
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return None
+        try:
+            with urlopen(Request(url, headers={'Host': host}), timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except (HTTPError, URLError, ConnectionError, socket.timeout):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def measure(server, path, timeout):
+    port = free_port()
+    env = {**os.environ, 'PORT': str(port), 'DJANGO_ENV': 'production'}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        shlex.split(server), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    try:
+        ready = first_ok(f'http://127.0.0.1:{port}{path}', settings.ALLOWED_HOSTS[0], time.monotonic() + timeout, process)
+    finally:
+        # The whole process group, so shell wrappers take their server with them
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+    return None if ready is None else ready - started
+
+
+class Command(BaseCommand):
+    help = "Time how long a server takes from process start to its first 200 response."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--server", default=DEFAULT_SERVER, help=f"Server command (default: {DEFAULT_SERVER}).")
+        parser.add_argument("--path", default="/", help="Path that must return 200 (default /).")
+        parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure (default 3).")
+        parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for each start (default 60).")
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+        timings = []
+        for run in range(1, options["runs"] + 1):
+            elapsed = measure(options["server"], options["path"], options["timeout"])
+            if elapsed is None:
+                raise CommandError(f"Run {run}: no 200 from {options['path']} within {options['timeout']:g}s.")
+            timings.append(elapsed)
+            self.stdout.write(f"run {run}: first 200 after {elapsed * 1000:.0f} ms")
+        self.stdout.write(self.style.SUCCESS(
+            f"median {statistics.median(timings) * 1000:.0f} ms, "
+            f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms over {len(timings)} run(s)"
+        ))
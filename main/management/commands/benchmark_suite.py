@@ -0,0 +1,290 @@
+"""
+Benchmark the admin, auth and status-action hot paths at realistic data sizes.
+
+For each size the client tables are replaced with a seeded fixture: restored from a
+snapshot under --fixtures-dir when one exists, otherwise generated with seed_generic_data
+(one client per 100 requests, fixed seed and window) and snapshotted for the next run.
+Every path in PATHS is then requested through Django's test client as a logged-in
+superuser, each request in a savepoint that is rolled back, and its latency percentiles
+and query count are recorded. Login and registration throttling is switched off so the
+views themselves are measured, password hashing included.
+
+Results are written as JSON. With --baseline they are compared to an earlier results file,
+and the command fails (exit status 1) when a path's p95 grew by more than --threshold
+(and by more than --min-ms) or it runs more queries than before. Refresh the baseline by
+writing --output over it.
+
+⚠️ Replaces all Clients, RequestTypes and ClientRequests (see wipe_data / restore_data).
+Only run it against a benchmark database.
+
+Usage:
+    python manage.py benchmark_suite --yes
+    python manage.py benchmark_suite --yes --sizes 10k,100k --requests 50
+    python manage.py benchmark_suite --yes --baseline benchmarks/baseline.json   ← fail on regressions
+    python manage.py benchmark_suite --yes --output benchmarks/baseline.json     ← record a new baseline
+"""
+import json
+import os
+import platform
+import statistics
+import time
+from io import StringIO
+from django import get_version
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from main.benchmarking import Rollback, percentile
+from main.models import Client, ClientRequest
+from main.snapshots import read_manifest, restore_snapshot, truncate_data, write_snapshot
+
+DEFAULT_SIZES = '10k,100k,1m'
+REQUESTS_PER_CLIENT = 100
+FIXTURE_SEED = 20240101
+# A fixed window keeps fixtures (and so baselines) identical whenever they're generated
+FIXTURE_UNTIL = '2026-01-01'
+
+# Requests selected by the status action, one admin changelist page
+ACTION_BATCH = 100
+
+
+def parse_size(value):
+    # '10k' -> 10000, '1m' -> 1000000, '2500' -> 2500
+    value = value.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(value[-1:], 1)
+    number = value[:-1] if multiplier > 1 else value
+    if not number.isdigit() or int(number) < 1:
+        raise CommandError(f"Sizes look like 10k, 1m or 2500, got {value!r}")
+    return int(number) * multiplier
+
+
+class Fixture:
+    # What the paths need from the seeded data, looked up once per size
+    def __init__(self):
+        counts = Client.objects.annotate(requests=Count('clientrequest')).order_by('-requests', 'pk')
+        self.largest_client = counts.values_list('pk', flat=True).first()
+        self.typical_client = counts.values_list('pk', flat=True)[counts.count() // 2]
+        self.action_ids = [
+            str(pk) for pk in ClientRequest.objects.filter(status='Pending')
+            .order_by('-created_at', '-pk').values_list('pk', flat=True)[:ACTION_BATCH]
+        ]
+        self.users = 0
+
+    def anonymous(self):
+        # A fresh client per request, so a login doesn't carry over to the next one
+        return TestClient(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+
+    def username(self):
+        self.users += 1
+        return f'bench{self.users:07d}'
+
+
+def expect(response, status, label):
+    if response.status_code != status:
+        raise CommandError(f'{label} returned {response.status_code}, expected {status}')
+    return response
+
+
+# Path name -> function(admin test client, fixture) making one request
+PATHS = {
+    'admin clientrequest changelist': lambda admin, fixture: expect(
+        admin.get('/admin/main/clientrequest/'), 200, 'changelist'),
+    'admin clientrequest changelist, status filter': lambda admin, fixture: expect(
+        admin.get('/admin/main/clientrequest/?status__exact=Pending'), 200, 'filtered changelist'),
+    'admin clientrequest changelist, search': lambda admin, fixture: expect(
+        admin.get('/admin/main/clientrequest/?q=printer'), 200, 'changelist search'),
+    'admin client changelist': lambda admin, fixture: expect(
+        admin.get('/admin/main/client/'), 200, 'client changelist'),
+    'admin client change view (typical client)': lambda admin, fixture: expect(
+        admin.get(f'/admin/main/client/{fixture.typical_client}/change/'), 200, 'client change view'),
+    'admin client change view (largest client)': lambda admin, fixture: expect(
+        admin.get(f'/admin/main/client/{fixture.largest_client}/change/'), 200, 'client change view'),
+    'admin status action': lambda admin, fixture: expect(
+        admin.post('/admin/main/clientrequest/', {
+            'action': 'mark_as_completed', '_selected_action': fixture.action_ids, 'index': 0,
+        }), 302, 'status action'),
+    'login page': lambda admin, fixture: expect(fixture.anonymous().get('/login/'), 200, 'login page'),
+    'login': lambda admin, fixture: expect(
+        fixture.anonymous().post('/login/', {'username': 'benchmark-login', 'password': 'benchmark-password'}), 302, 'login'),
+    'register': lambda admin, fixture: expect(
+        fixture.anonymous().post('/register/', {
+            'username': fixture.username(), 'email': 'bench@example.com',
+            'password': 'benchmark-password', 'password_confirm': 'benchmark-password',
+        }), 200, 'register'),
+}
+
+
+def measure(request, requests, warmup, max_seconds):
+    # Times `request` (each call rolled back). After max_seconds the remaining warm-up is
+    # skipped and timing stops once there is at least one sample.
+    timings, queries = [], []
+    started = time.monotonic()
+    iteration = 0
+    while len(timings) < requests:
+        # The query log is capped (9000 entries), which would make later counts read 0
+        connection.queries_log.clear()
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as context:
+                    began = time.perf_counter()
+                    request()
+                    elapsed = (time.perf_counter() - began) * 1000
+                raise Rollback
+        except Rollback:
+            pass
+        if iteration >= warmup:
+            timings.append(elapsed)
+            queries.append(len(context.captured_queries))
+        iteration += 1
+        if time.monotonic() - started > max_seconds:
+            if timings:
+                break
+            warmup = iteration
+    return {
+        'samples': len(timings),
+        'p50': round(statistics.median(timings), 2),
+        'p95': round(percentile(timings, 0.95), 2),
+        'p99': round(percentile(timings, 0.99), 2),
+        'mean': round(statistics.mean(timings), 2),
+        'max': round(max(timings), 2),
+        'queries': max(queries),
+    }
+
+
+def compare(results, baseline, threshold, min_ms):
+    # Lines describing each regression of `results` against `baseline`
+    regressions = []
+    for size, paths in results.items():
+        for path, result in paths.items():
+            before = baseline.get(size, {}).get(path)
+            if before is None:
+                continue
+            if result['p95'] > before['p95'] * (1 + threshold) and result['p95'] - before['p95'] > min_ms:
+                regressions.append(f"{size} rows, {path}: p95 {before['p95']} -> {result['p95']} ms")
+            if result['queries'] > before['queries']:
+                regressions.append(f"{size} rows, {path}: {before['queries']} -> {result['queries']} queries")
+    return regressions
+
+
+class Command(BaseCommand):
+    help = "Measure admin/auth hot paths on 10k-1M row fixtures, write JSON and compare with a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated ClientRequest counts (default {DEFAULT_SIZES}).")
+        parser.add_argument("--path", action="append", choices=list(PATHS), help="Path to measure; repeat for several (default: all).")
+        parser.add_argument("--requests", type=int, default=20, help="Timed requests per path (default 20).")
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed requests per path first (default 2).")
+        parser.add_argument("--max-seconds", type=float, default=60, help="Stop timing a path after this long (default 60).")
+        parser.add_argument("--fixtures-dir", default="benchmarks/fixtures", help="Where fixture snapshots are kept (default benchmarks/fixtures).")
+        parser.add_argument("--output", default="benchmarks/results.json", help="Results file (default benchmarks/results.json).")
+        parser.add_argument("--baseline", help="Earlier results file to compare against.")
+        parser.add_argument("--threshold", type=float, default=0.25, help="Allowed p95 growth over the baseline (default 0.25 = 25%%).")
+        parser.add_argument("--min-ms", type=float, default=5, help="Ignore p95 growth smaller than this (default 5 ms).")
+        parser.add_argument("--yes", action="store_true", help="Skip the confirmation prompt.")
+
+    def handle(self, *args, **options):
+        sizes = [parse_size(value) for value in options["sizes"].split(",")]
+        if options["requests"] < 1 or options["warmup"] < 0:
+            raise CommandError("--requests must be at least 1 and --warmup at least 0.")
+        baseline = None
+        if options["baseline"] and not os.path.exists(options["baseline"]):
+            self.stdout.write(self.style.WARNING(
+                f"No baseline at {options['baseline']} yet; nothing to compare. "
+                f"Record one with --output {options['baseline']}."
+            ))
+        elif options["baseline"]:
+            try:
+                with open(options["baseline"]) as source:
+                    baseline = json.load(source)["results"]
+            except (OSError, ValueError, KeyError) as error:
+                raise CommandError(f"Can't read baseline {options['baseline']}: {error}")
+
+        if not options["yes"]:
+            confirm = input(
+                "⚠️  This will REPLACE all Clients, RequestTypes and ClientRequests with benchmark "
+                "fixtures.\nType 'benchmark' to continue: "
+            )
+            if confirm.lower().strip() != "benchmark":
+                self.stdout.write(self.style.WARNING("Aborted."))
+                return
+
+        paths = options["path"] or list(PATHS)
+        results = {}
+        for size in sizes:
+            self.load_fixture(size, options["fixtures_dir"])
+            results[str(size)] = self.run_paths(size, paths, options)
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "environment": {
+                "python": platform.python_version(),
+                "django": get_version(),
+                "database": f"{connection.vendor} {connection.pg_version}",
+                "password_hasher": settings.PASSWORD_HASHER,
+            },
+            "options": {name: options[name] for name in ("requests", "warmup", "max_seconds")},
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(options["output"])), exist_ok=True)
+        with open(options["output"], "w") as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(f"Results written to {options['output']}")
+
+        if baseline is not None:
+            regressions = compare(results, baseline, options["threshold"], options["min_ms"])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(f"  regression: {line}"))
+                raise CommandError(f"{len(regressions)} regressions against {options['baseline']}.")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}."))
+
+    def load_fixture(self, size, fixtures_dir):
+        directory = os.path.join(fixtures_dir, str(size))
+        started = time.monotonic()
+        try:
+            manifest = read_manifest(directory)
+        except ValueError:
+            manifest = None
+        if manifest is not None:
+            restore_snapshot(directory, manifest)
+            self.stdout.write(self.style.NOTICE(f"{size} rows: fixture restored in {time.monotonic() - started:.1f}s"))
+            return
+        truncate_data()
+        call_command(
+            "seed_generic_data", f"--until={FIXTURE_UNTIL}", seed=FIXTURE_SEED,
+            clients=max(1, size // REQUESTS_PER_CLIENT), requests=size, stdout=StringIO(),
+        )
+        write_snapshot(directory)
+        self.stdout.write(self.style.NOTICE(f"{size} rows: fixture seeded in {time.monotonic() - started:.1f}s"))
+
+    def run_paths(self, size, paths, options):
+        results = {}
+        User = get_user_model()
+        with override_settings(THROTTLE_RATES={scope: "" for scope in settings.THROTTLE_RATES}):
+            try:
+                with transaction.atomic():
+                    fixture = Fixture()
+                    user = User.objects.create_superuser(username="benchmark-suite", password=None)
+                    User.objects.create_user(username="benchmark-login", password="benchmark-password", is_staff=True)
+                    admin = TestClient(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+                    admin.force_login(user)
+                    for path in paths:
+                        request = PATHS[path]
+                        results[path] = result = measure(
+                            lambda: request(admin, fixture),
+                            options["requests"], options["warmup"], options["max_seconds"],
+                        )
+                        self.stdout.write(
+                            f"{size} rows, {path}: p50 {result['p50']} ms, p95 {result['p95']} ms, "
+                            f"{result['queries']} queries ({result['samples']} samples)"
+                        )
+                    raise Rollback
+            except Rollback:
+                pass
+        return results
@@ -0,0 +1,138 @@
+"""
+Run EXPLAIN on the queries the ClientRequest admin issues and report whether
+each one is served by an index.
+
+Usage:
+    python manage.py explain_admin_queries
+    python manage.py explain_admin_queries --analyze        ← EXPLAIN ANALYZE (executes the queries)
+    python manage.py explain_admin_queries --no-seqscan     ← show which index *could* serve each query,
+                                                              useful on small dev databases where the
+                                                              planner prefers a sequential scan anyway
+"""
+import json
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from main.models import ClientRequest
+
+# Plan node types that read through an index
+INDEX_NODE_TYPES = {'Index Scan', 'Index Only Scan', 'Bitmap Index Scan'}
+
+# The admin changelist shows 100 rows per page and always adds -pk as a tie-breaker
+PAGE_SIZE = 100
+CHANGELIST_ORDERING = ('-created_at', '-pk')
+
+
+def canonical_admin_queries():
+    # Querysets mirroring what ClientRequestAdmin runs, keyed by a readable label
+    now = timezone.now()
+    changelist = ClientRequest.objects.with_related().order_by(*CHANGELIST_ORDERING)
+    first_client_id = ClientRequest.objects.values_list('client_id', flat=True).first() or 0
+
+    return {
+        'changelist (default ordering)': changelist[:PAGE_SIZE],
+        'changelist filtered by status': changelist.filter(status='Pending')[:PAGE_SIZE],
+        'changelist filtered by created_at (past 7 days)': changelist.filter(
+            created_at__gte=now - timedelta(days=7), created_at__lt=now + timedelta(days=1)
+        )[:PAGE_SIZE],
+        'client requests (change view inline)': ClientRequest.objects.filter(
+            client_id=first_client_id
+        ).order_by('-created_at'),
+        'open requests': changelist.open()[:PAGE_SIZE],
+        'recently updated': ClientRequest.objects.filter(updated_at__gte=now - timedelta(days=1)),
+        'status action selection': ClientRequest.objects.filter(status='In Progress'),
+    }
+
+
+def walk_plan(plan):
+    # Yield every node of an EXPLAIN (FORMAT JSON) plan tree
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from walk_plan(child)
+
+
+def partition_names(relation):
+    # {partition name: parent name} for a partitioned table or index, including the parent itself.
+    # ClientRequest is partitioned by month, so plans name per-partition tables and indexes.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT t.relid::regclass::text FROM pg_partition_tree(%s::regclass) t',
+            [relation],
+        )
+        return {name: relation for (name,) in cursor.fetchall()} or {relation: relation}
+
+
+def summarise_plan(plan, table, index_names=None):
+    # Which indexes and partitions the plan reads, and whether it falls back to a sequential scan of `table`.
+    # `index_names` maps partition index names back to the index declared on the model.
+    index_names = index_names or {}
+    tables = partition_names(table)
+    nodes = list(walk_plan(plan))
+    return {
+        'indexes': list(dict.fromkeys(
+            index_names.get(node['Index Name'], node['Index Name'])
+            for node in nodes if node.get('Node Type') in INDEX_NODE_TYPES
+        )),
+        'seq_scan': any(
+            node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') in tables for node in nodes
+        ),
+        # Partitions the plan still reads after pruning
+        'partitions': sorted({node['Relation Name'] for node in nodes if node.get('Relation Name') in tables}),
+    }
+
+
+def explain_queries(analyze=False, no_seqscan=False):
+    # Returns {label: {'indexes': [...], 'seq_scan': bool, 'partitions': [...]}} for each canonical query
+    table = ClientRequest._meta.db_table
+    index_names = {}
+    for index in ClientRequest._meta.indexes:
+        index_names.update(partition_names(index.name))
+    results = {}
+    with transaction.atomic():
+        if no_seqscan:
+            with connection.cursor() as cursor:
+                # SET LOCAL only lasts until the end of this transaction
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        for label, queryset in canonical_admin_queries().items():
+            raw_plan = queryset.explain(format='json', analyze=analyze)
+            plan = json.loads(raw_plan)[0]['Plan']
+            results[label] = summarise_plan(plan, table, index_names)
+    return results
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the ClientRequest admin's canonical queries and report index usage."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Use EXPLAIN ANALYZE (executes each query).",
+        )
+        parser.add_argument(
+            "--no-seqscan",
+            action="store_true",
+            help="Disable sequential scans for the session to show which index can serve each query.",
+        )
+
+    def handle(self, *args, **options):
+        results = explain_queries(analyze=options["analyze"], no_seqscan=options["no_seqscan"])
+
+        missing = 0
+        for label, summary in results.items():
+            if summary['seq_scan']:
+                missing += 1
+                self.stdout.write(self.style.WARNING(f"{label}: NO INDEX (sequential scan)"))
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{label}: index ({', '.join(summary['indexes'])}), "
+                        f"{len(summary['partitions'])} partition(s)"
+                    )
+                )
+
+        self.stdout.write(
+            self.style.NOTICE(f"{len(results) - missing}/{len(results)} queries use an index.")
+        )
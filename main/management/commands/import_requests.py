@@ -0,0 +1,239 @@
+"""
+Stream historical ClientRequests from CSV or JSONL into the database.
+
+Each record needs `client` and `request_type` (names) and may carry `status`,
+`description`, `created_at` and `updated_at` (ISO 8601; naive values are UTC).
+
+Usage:
+    python manage.py import_requests tickets.csv
+    python manage.py import_requests tickets.jsonl --batch-size 20000
+    python manage.py import_requests tickets.csv --resume           ← skip records committed by an earlier run
+    cat tickets.jsonl | python manage.py import_requests - --format jsonl --job nightly
+    python manage.py import_requests tickets.csv --method bulk      ← bulk_create instead of COPY
+    python manage.py import_requests tickets.csv --create-missing   ← create unknown clients/request types
+"""
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import timezone as dt_timezone
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from main.models import Client, RequestType, ClientRequest, RequestImportCheckpoint
+
+VALID_STATUSES = {value for value, _ in ClientRequest.STATUS_CHOICES}
+
+# Columns written by the COPY path, in order
+COPY_COLUMNS = ('client_id', 'request_type_id', 'status', 'description', 'created_at', 'updated_at')
+
+
+class RejectedRecord(Exception):
+    pass
+
+
+def read_records(stream, fmt):
+    # Yield one dict per source record without reading the whole stream into memory.
+    # JSONL lines that aren't a JSON object are yielded as a RejectedRecord, so they're
+    # counted (and skipped on --resume) like any other record.
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield RejectedRecord(f'line {number}: invalid JSON ({exc})')
+                continue
+            if not isinstance(record, dict):
+                yield RejectedRecord(f'line {number}: expected a JSON object, got {type(record).__name__}')
+                continue
+            yield record
+
+
+def text_field(record, name):
+    # A field's value as a string ('' when missing); JSONL can hold numbers, lists...
+    value = record.get(name)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise RejectedRecord(f'{name} must be a string, got {value!r}')
+    return value
+
+
+def parse_timestamp(value, default):
+    if not value:
+        return default
+    if not isinstance(value, str):
+        raise RejectedRecord(f'invalid timestamp {value!r}')
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        # Well formed but not a real date or time (2023-02-30)
+        parsed = None
+    if parsed is None:
+        raise RejectedRecord(f'invalid timestamp {value!r}')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+class NameMap:
+    # name -> id for Clients or RequestTypes, loaded once so rows never query per lookup.
+    # Where names are duplicated the oldest row wins.
+    def __init__(self, model, create_missing):
+        self.model = model
+        self.create_missing = create_missing
+        self.ids = {}
+        # iterator() reads through a server-side cursor, which must stay inside one transaction
+        # (see DB_TRANSACTION_POOLER in settings)
+        with transaction.atomic():
+            for pk, name in model.objects.order_by('-pk').values_list('pk', 'name').iterator(chunk_size=10000):
+                self.ids[name] = pk
+        self.created = 0
+
+    def resolve(self, name):
+        if not name:
+            raise RejectedRecord(f'missing {self.model._meta.model_name}')
+        pk = self.ids.get(name)
+        if pk is None:
+            if not self.create_missing:
+                raise RejectedRecord(f'unknown {self.model._meta.model_name} {name!r}')
+            # Runs inside the importing batch's transaction, so it commits or rolls back with it
+            pk = self.ids[name] = self.model.objects.create(name=name).pk
+            self.created += 1
+        return pk
+
+
+class Command(BaseCommand):
+    help = "Import ClientRequests from a CSV/JSONL file or stdin in batches (COPY or bulk_create)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Path to a .csv/.jsonl file, or - for stdin.")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Input format (default: from file extension, csv for stdin).")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Records per transaction (default 10000).")
+        parser.add_argument("--method", choices=["copy", "bulk"], default="copy", help="Load with PostgreSQL COPY (default) or bulk_create.")
+        parser.add_argument("--create-missing", action="store_true", help="Create clients and request types that don't exist yet.")
+        parser.add_argument("--job", help="Checkpoint name (default: the source file's absolute path; required for stdin with --resume).")
+        parser.add_argument("--resume", action="store_true", help="Skip the records an earlier run of the same job committed.")
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        fmt = options["format"] or ("jsonl" if source.endswith((".jsonl", ".ndjson")) else "csv")
+        job = options["job"] or (None if source == "-" else os.path.abspath(source))
+        if options["resume"] and job is None:
+            raise CommandError("--resume from stdin needs a --job name.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        checkpoint = None
+        if job is not None:
+            checkpoint, _ = RequestImportCheckpoint.objects.get_or_create(name=job)
+            if not options["resume"] and checkpoint.rows_committed:
+                checkpoint.rows_committed = 0
+                checkpoint.save(update_fields=["rows_committed", "updated_at"])
+        skip = checkpoint.rows_committed if checkpoint else 0
+
+        self.clients = NameMap(Client, options["create_missing"])
+        self.request_types = NameMap(RequestType, options["create_missing"])
+        self.now = timezone.now()
+        load = self.copy_batch if options["method"] == "copy" else self.bulk_create_batch
+
+        stream = sys.stdin if source == "-" else open(source, newline="", encoding="utf-8")
+        try:
+            records = read_records(stream, fmt)
+            if skip:
+                self.stdout.write(f"Resuming {job}: skipping {skip} committed records.")
+                records = islice(records, skip, None)
+            imported, rejected = self.import_records(records, load, options["batch_size"], checkpoint, skip)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} requests, rejected {rejected} records "
+                f"({self.clients.created} clients and {self.request_types.created} request types created)."
+            )
+        )
+
+    def import_records(self, records, load, batch_size, checkpoint, committed):
+        imported = rejected = 0
+        started = time.monotonic()
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            # The batch, the clients and request types it created (--create-missing) and its
+            # checkpoint commit together, so --resume never re-imports it and a failed batch
+            # leaves nothing behind
+            with transaction.atomic():
+                rows = []
+                for position, record in enumerate(batch, start=committed + 1):
+                    try:
+                        rows.append(self.build_row(record))
+                    except RejectedRecord as exc:
+                        rejected += 1
+                        self.stderr.write(f"Record {position}: rejected, {exc}")
+                if rows:
+                    load(rows)
+                committed += len(batch)
+                if checkpoint is not None:
+                    checkpoint.rows_committed = committed
+                    checkpoint.save(update_fields=["rows_committed", "updated_at"])
+            imported += len(rows)
+
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self.stdout.write(f"{imported} imported ({imported / elapsed:,.0f} rows/s)")
+        return imported, rejected
+
+    def build_row(self, record):
+        if isinstance(record, RejectedRecord):
+            raise record
+        status = text_field(record, "status").strip() or None
+        if status is not None and status not in VALID_STATUSES:
+            raise RejectedRecord(f"invalid status {status!r}")
+        created_at = parse_timestamp(record.get("created_at"), self.now)
+        return (
+            self.clients.resolve(text_field(record, "client").strip()),
+            self.request_types.resolve(text_field(record, "request_type").strip()),
+            status,
+            text_field(record, "description") or None,
+            created_at,
+            parse_timestamp(record.get("updated_at"), created_at),
+        )
+
+    def copy_batch(self, rows):
+        # Stage the batch as CSV in memory and stream it through COPY in one round trip.
+        # COPY fires the table's triggers, so search vectors and rollups stay current.
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([value.isoformat() if hasattr(value, "isoformat") else value for value in row])
+        buffer.seek(0)
+        table = ClientRequest._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+
+    def bulk_create_batch(self, rows):
+        # Note: updated_at is auto_now, so bulk_create stamps it with the import time
+        ClientRequest.objects.bulk_create(
+            ClientRequest(
+                client_id=client_id,
+                request_type_id=request_type_id,
+                status=status,
+                description=description,
+                created_at=created_at,
+                updated_at=updated_at,
+            )
+            for client_id, request_type_id, status, description, created_at, updated_at in rows
+        )
@@ -0,0 +1,77 @@
+"""
+Create upcoming monthly ClientRequest partitions and retire old ones.
+Schedule it (e.g. daily) so next month's partition exists before the first request arrives.
+
+Usage:
+    python manage.py manage_partitions                          ← create partitions 3 months ahead, list them
+    python manage.py manage_partitions --ahead 6
+    python manage.py manage_partitions --backfill-from 2019-01  ← create historical months (run before
+                                                                  importing old requests), moving any of
+                                                                  their rows out of the default partition
+    python manage.py manage_partitions --retain 24              ← detach months older than 24 months;
+                                                                  their tables stay as archives
+    python manage.py manage_partitions --retain 24 --drop       ← drop them (and their status history) instead
+    python manage.py manage_partitions --retain 24 --dry-run    ← show what would change
+"""
+from datetime import datetime, timezone as dt_timezone
+from django.core.management.base import BaseCommand, CommandError
+from main.partitions import (
+    DEFAULT_PARTITION, MONTHS_AHEAD, create_partition, default_partition_has_rows,
+    expired_partitions, list_partitions, missing_months, partition_name, retire_partition,
+)
+
+
+def parse_month(value):
+    try:
+        return datetime.strptime(value, '%Y-%m').replace(tzinfo=dt_timezone.utc)
+    except ValueError:
+        raise CommandError(f"Months look like YYYY-MM, got {value!r}")
+
+
+class Command(BaseCommand):
+    help = "Maintain the monthly range partitions of the ClientRequest table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=MONTHS_AHEAD, help=f"Months to create ahead of the current one (default {MONTHS_AHEAD}).")
+        parser.add_argument("--backfill-from", metavar="YYYY-MM", help="Also create every month from this one onwards.")
+        parser.add_argument("--retain", type=int, metavar="MONTHS", help="Detach partitions older than this many months.")
+        parser.add_argument("--drop", action="store_true", help="With --retain, drop old partitions instead of detaching them.")
+        parser.add_argument("--dry-run", action="store_true", help="Report the changes without making them.")
+
+    def handle(self, *args, **options):
+        if options["ahead"] < 0:
+            raise CommandError("--ahead can't be negative.")
+        if options["retain"] is not None and options["retain"] < 1:
+            raise CommandError("--retain must be at least 1.")
+        if options["drop"] and options["retain"] is None:
+            raise CommandError("--drop needs --retain.")
+        start = parse_month(options["backfill_from"]) if options["backfill_from"] else None
+        dry_run = options["dry_run"]
+
+        for month in missing_months(options["ahead"], start=start):
+            if dry_run:
+                self.stdout.write(f"Would create {partition_name(month)}")
+                continue
+            moved = create_partition(month)
+            self.stdout.write(self.style.SUCCESS(f"Created {partition_name(month)}"))
+            if moved:
+                self.stdout.write(f"  moved {moved} rows out of {DEFAULT_PARTITION}")
+
+        if options["retain"] is not None:
+            action, done = ("drop", "Dropped") if options["drop"] else ("detach", "Detached")
+            for partition in expired_partitions(options["retain"]):
+                if dry_run:
+                    self.stdout.write(f"Would {action} {partition.name}")
+                    continue
+                retire_partition(partition, drop=options["drop"])
+                self.stdout.write(self.style.WARNING(f"{done} {partition.name}"))
+
+        for partition in list_partitions():
+            self.stdout.write(f"{partition.name}: ~{partition.rows} rows")
+        if default_partition_has_rows():
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{DEFAULT_PARTITION} holds rows outside every monthly partition; "
+                    "create their months with --backfill-from or --ahead."
+                )
+            )
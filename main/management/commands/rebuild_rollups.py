@@ -0,0 +1,38 @@
+"""
+Backfill or repair the ClientRequest dashboard rollups.
+
+Usage:
+    python manage.py rebuild_rollups            ← recount every rollup from ClientRequest
+    python manage.py rebuild_rollups --check    ← report drift only, change nothing
+"""
+from django.core.management.base import BaseCommand, CommandError
+from main.rollups import rebuild_rollups, rollup_drift
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ClientRequest (day, status, request type) rollup table from scratch."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report rollup rows that differ from ClientRequest; exits non-zero on drift.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = rollup_drift()
+            for (day, status, type_id), (stored, expected) in sorted(drift.items(), key=str):
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{day} | {status or '(no status)'} | request type {type_id}: "
+                        f"stored {stored}, expected {expected}"
+                    )
+                )
+            if drift:
+                raise CommandError(f"{len(drift)} rollup rows have drifted.")
+            self.stdout.write(self.style.SUCCESS("Rollups match ClientRequest."))
+            return
+
+        count = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} rollup rows."))
@@ -0,0 +1,45 @@
+"""
+Replace the client tables with a snapshot written by `snapshot_data`. Everything happens in
+one transaction: the tables are truncated, missing ClientRequest partitions created and the
+snapshot loaded with binary COPY. Users are left alone. See main/snapshots.py.
+
+Usage:
+    python manage.py restore_data snapshots/10m          ← shows a safety prompt
+    python manage.py restore_data snapshots/10m --yes    ← skips confirmation
+"""
+import time
+from django.core.management.base import BaseCommand, CommandError
+from main.snapshots import read_manifest, restore_snapshot
+
+
+class Command(BaseCommand):
+    help = "Restore the client tables from a snapshot_data directory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Snapshot directory written by snapshot_data.")
+        parser.add_argument("--yes", action="store_true", help="Skip confirmation prompt.")
+
+    def handle(self, *args, **options):
+        directory = options["directory"]
+        try:
+            manifest = read_manifest(directory)
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        if not options["yes"]:
+            confirm = input(
+                f"⚠️  This will REPLACE all Clients, RequestTypes and ClientRequests with the "
+                f"snapshot taken {manifest['created_at']}.\nType 'restore' to continue: "
+            )
+            if confirm.lower().strip() != "restore":
+                self.stdout.write(self.style.WARNING("Aborted."))
+                return
+
+        started = time.monotonic()
+        restore_snapshot(directory, manifest)
+        for entry in manifest["tables"]:
+            self.stdout.write(f"{entry['table']}: {entry['rows']} rows in {entry['seconds']:.1f}s")
+        rows = sum(entry["rows"] for entry in manifest["tables"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Restored {rows} rows from {directory} in {time.monotonic() - started:.1f}s.")
+        )
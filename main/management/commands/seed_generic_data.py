@@ -1,68 +1,347 @@
-# main/management/commands/seed_data.py
 """
-Create 10 Clients, 10 RequestTypes, 10 ClientRequests + 4 demo Users.
+Generate deterministic synthetic Clients, RequestTypes and ClientRequests for load testing.
+
+The same flags and --seed always produce the same rows, and re-running tops the data up to
+the requested counts instead of duplicating it. Seed clients are recognised by their
+@seed.example.com email. Requests are generated in fixed chunks of CHUNK_SIZE rows that
+each draw from their own random stream, and every chunk is recorded (main.models.SeedChunk)
+in the transaction that writes it, so a later run, or a rerun after a parallel run failed
+with chunks committed out of order, writes exactly the chunks a single run would have and
+that are still missing. Records are kept per dataset: --seed, the seed clients, the request
+types and the --until/--months window, which shape every request. Changing one of those
+starts a separate dataset rather than topping up the old one.
+Distributions aim to look like production rather than uniform noise:
+- clients: a few heavy clients and a long tail (Zipf-like), 90% active
+- request types: skewed towards the common ones
+- created_at: volume grows over the --months window, with weekday and business-hours peaks
+- status: recent requests are mostly Pending/In Progress, older ones mostly Completed
+- description: log-normal length, a few words to a few hundred, some left empty
+
+Rows are written with COPY (or bulk_create), so the table's triggers keep search vectors and
+rollups current, and monthly partitions are created for the window before loading.
 
 Usage:
-    python manage.py seed_data
+    python manage.py seed_generic_data                                     ← small example dataset
+    python manage.py seed_generic_data --clients 100000 --requests 10000000 --workers 8
+    python manage.py seed_generic_data --requests 20000000                 ← top up an earlier run
+    python manage.py seed_generic_data --seed 7 --until 2026-01-01 --months 36
+    python manage.py seed_generic_data --method bulk                       ← bulk_create instead of COPY
 """
+import csv
+import hashlib
+import io
+import math
+import multiprocessing
 import random
-from django.core.management.base import BaseCommand
-from django.contrib.auth import get_user_model
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from itertools import accumulate
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
 from django.utils import timezone
 
-from main.models import Client, RequestType, ClientRequest
+from main.models import Client, RequestType, ClientRequest, SeedChunk
+from main.partitions import add_months, create_partition, missing_months
+
+# Rows per chunk: the unit of generation, of one COPY/transaction and of work handed to a
+# worker. Changing it changes which rows a given --seed produces.
+CHUNK_SIZE = 10000
+
+DEFAULT_SEED = 20240101
+
+SEED_EMAIL_DOMAIN = 'seed.example.com'
+
+CLIENT_COLUMNS = ('name', 'email', 'contact_number', 'company_url', 'created_at', 'is_active')
+REQUEST_COLUMNS = ('client_id', 'request_type_id', 'status', 'description', 'created_at', 'updated_at')
+
+# (name, description, relative frequency)
+REQUEST_TYPES = [
+    ('Password Reset', 'Reset or unlock a user account', 30),
+    ('Bug Report', 'Something is not working as expected', 22),
+    ('Access Request', 'Grant a user access to a system or report', 15),
+    ('Billing Query', 'Questions about invoices and payments', 10),
+    ('Data Export', 'Extract data for the client', 7),
+    ('Feature Request', 'Suggest a new feature or improvement', 6),
+    ('Configuration Change', 'Change settings on the client account', 4),
+    ('Training', 'Book or request training sessions', 3),
+    ('Integration Support', 'Help connecting third-party systems', 2),
+    ('Account Closure', 'Close the client account and archive its data', 1),
+]
+
+# Requests per hour of the day (UTC), peaking in office hours
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 4, 8, 14, 18, 18, 16, 12, 15, 17, 16, 13, 9, 6, 4, 3, 2, 2, 1]
+WEEKEND_FACTOR = 0.3
+# Daily volume at the end of the window relative to its start
+GROWTH = 3
+
+# Client name parts and description vocabulary
+NAME_PREFIXES = [
+    'Blue', 'North', 'Bright', 'Oak', 'Silver', 'Harbor', 'Summit', 'Green', 'Iron', 'River',
+    'Cedar', 'Apex', 'Stone', 'Pioneer', 'Crown', 'Maple', 'Atlas', 'Beacon', 'Falcon', 'Lake',
+]
+NAME_NOUNS = [
+    'Logistics', 'Veterinary', 'Pharmacy', 'Energy', 'Foods', 'Dental', 'Partners', 'Systems',
+    'Retail', 'Health', 'Property', 'Travel', 'Legal', 'Finance', 'Labs', 'Media',
+]
+NAME_SUFFIXES = ['Ltd', 'Group', 'plc', 'LLP', 'Holdings', '& Co']
+WORDS = (
+    'account access admin after again all application approve archive attached billing broken '
+    'but cannot change client configure customer dashboard data delete email error export failed '
+    'for from help import invoice issue login missing monthly need new not office order page '
+    'password payment please portal printer refund report request reset role screen send server '
+    'since site slow staff system team the this today transfer unable update upload urgent user '
+    'users when with working yesterday'
+).split()
+
+
+def pick(cum_weights, rng):
+    # Index drawn by cumulative weight, as random.choices() does for a single item
+    return bisect_right(cum_weights, rng.random() * cum_weights[-1], 0, len(cum_weights) - 1)
+
+
+class RequestGenerator:
+    # Deterministic ClientRequest rows: chunk N always holds the same CHUNK_SIZE rows for the
+    # same seed, clients, request types and window, whichever process generates it.
+    def __init__(self, seed, client_ids, request_type_ids, start, end):
+        # Identifies these rows in SeedChunk records
+        self.dataset = hashlib.md5(repr((seed, client_ids, request_type_ids, start, end)).encode()).hexdigest()
+        self.seed = seed
+        self.client_ids = client_ids
+        self.request_type_ids = request_type_ids
+        self.end = end
+        # Zipf-like: client i gets 1/(i+1)**0.8 of the traffic
+        self.client_weights = list(accumulate(1 / (i + 1) ** 0.8 for i in range(len(client_ids))))
+        self.type_weights = list(accumulate(weight for _, _, weight in REQUEST_TYPES[:len(request_type_ids)]))
+        days = (end - start).days
+        self.days = [start + timedelta(days=d) for d in range(days)]
+        self.day_weights = list(accumulate(
+            (1 + (GROWTH - 1) * d / days) * (WEEKEND_FACTOR if day.weekday() >= 5 else 1)
+            for d, day in enumerate(self.days)
+        ))
+        self.hour_weights = list(accumulate(HOUR_WEIGHTS))
+
+    def rows(self, chunk, skip, count):
+        # Rows skip..count-1 of `chunk`; the skipped rows are still drawn so the rest match
+        rng = random.Random(f'{self.seed}:requests:{chunk}')
+        rows = []
+        for position in range(count):
+            row = self.row(rng)
+            if position >= skip:
+                rows.append(row)
+        return rows
+
+    def row(self, rng):
+        day = self.days[pick(self.day_weights, rng)]
+        hour = pick(self.hour_weights, rng)
+        created_at = day + timedelta(seconds=hour * 3600 + rng.randrange(3600))
+        age = (self.end - created_at).total_seconds() / 86400
+
+        # Most requests are closed within a couple of weeks
+        if rng.random() < 0.97 * (1 - math.exp(-age / 7)):
+            status = 'Completed'
+            updated_at = created_at + timedelta(days=min(rng.expovariate(1 / 2), age))
+        elif rng.random() < (0.5 if age > 1 else 0.3):
+            status = 'In Progress'
+            updated_at = created_at + timedelta(days=rng.random() * age)
+        else:
+            status = 'Pending'
+            updated_at = created_at
+
+        if rng.random() < 0.05:
+            description = None
+        else:
+            length = min(400, max(3, int(rng.lognormvariate(math.log(18), 0.9))))
+            description = ' '.join(rng.choices(WORDS, k=length)).capitalize() + '.'
+
+        return (
+            self.client_ids[pick(self.client_weights, rng)],
+            self.request_type_ids[pick(self.type_weights, rng)],
+            status,
+            description,
+            created_at,
+            updated_at,
+        )
+
+
+def client_rows(seed, first, count, start):
+    # Seed clients first..first+count-1 (0-based), drawn per chunk like the requests
+    rows = []
+    for chunk in range(first // CHUNK_SIZE, (first + count - 1) // CHUNK_SIZE + 1):
+        rng = random.Random(f'{seed}:clients:{chunk}')
+        for index in range(chunk * CHUNK_SIZE, (chunk + 1) * CHUNK_SIZE):
+            name = f'{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_NOUNS)} {rng.choice(NAME_SUFFIXES)}'
+            slug = name.lower().replace('& ', '').replace(' ', '-')
+            row = (
+                name,
+                f'contact{index + 1:07d}@{SEED_EMAIL_DOMAIN}',
+                f'07{rng.randrange(10**9):09d}',
+                f'https://{slug}.example.com',
+                start - timedelta(seconds=rng.randrange(365 * 86400)),
+                rng.random() < 0.9,
+            )
+            if first <= index < first + count:
+                rows.append(row)
+    return rows
+
+
+def copy_rows(model, columns, rows):
+    # Same CSV-over-COPY path as import_requests; COPY fires the table's triggers
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
+    buffer.seek(0)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {model._meta.db_table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def bulk_create_rows(model, columns, rows):
+    # Note: ClientRequest.updated_at is auto_now, so bulk_create stamps it with the current time
+    model.objects.bulk_create(model(**dict(zip(columns, row))) for row in rows)
+
+
+def write_rows(model, columns, rows, method):
+    # One transaction per chunk. Concurrent workers upsert overlapping rollup rows from their
+    # statement triggers; the triggers lock them in key order (migration 0014), so they queue
+    # behind each other instead of deadlocking.
+    load = copy_rows if method == 'copy' else bulk_create_rows
+    with transaction.atomic():
+        load(model, columns, rows)
+    return len(rows)
+
+
+# Worker processes are forked with the generator already built (see Command.write_requests)
+_worker_state = {}
+
+
+def _init_worker(generator, method):
+    _worker_state.update(generator=generator, method=method)
+
+
+def _write_chunk(chunk, skip, count):
+    generator = _worker_state['generator']
+    rows = generator.rows(chunk, skip, count)
+    with transaction.atomic():
+        written = write_rows(ClientRequest, REQUEST_COLUMNS, rows, _worker_state['method'])
+        SeedChunk.objects.update_or_create(dataset=generator.dataset, chunk=chunk, defaults={'rows': count})
+    return written
+
+
+def _write_chunk_args(args):
+    return _write_chunk(*args)
 
 
 class Command(BaseCommand):
-    help = "Populate the database with predictable seed data."
+    help = "Generate (or top up) a deterministic synthetic dataset of clients and requests."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=100, help="Seed clients to have in total (default 100).")
+        parser.add_argument("--requests", type=int, default=2000, help="Requests from seed clients to have in total (default 2000).")
+        parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Random seed (default {DEFAULT_SEED}).")
+        parser.add_argument("--months", type=int, default=24, help="Months of history created_at spans (default 24).")
+        parser.add_argument("--until", type=date.fromisoformat, help="End of the window, YYYY-MM-DD exclusive (default: today, UTC).")
+        parser.add_argument("--workers", type=int, default=1, help="Processes writing requests in parallel (default 1).")
+        parser.add_argument("--method", choices=["copy", "bulk"], default="copy", help="Load with PostgreSQL COPY (default) or bulk_create.")
 
     def handle(self, *args, **options):
+        if options["clients"] < 1 or options["requests"] < 0 or options["months"] < 1 or options["workers"] < 1:
+            raise CommandError("--clients, --months and --workers must be at least 1, --requests at least 0.")
+        if options["workers"] > 1 and connection.in_atomic_block:
+            raise CommandError("--workers needs autocommit: the workers can't see uncommitted rows.")
 
-        # -----------------------------------------------------------------
-        # 1. Clients
-        # -----------------------------------------------------------------
-        clients = []
-        for i in range(1, 11):
-            clients.append(
-                Client.objects.create(
-                    name=f"client{i:02d}",
-                    email=f"client{i:02d}@example.com",
-                    contact_number=f"07{random.randint(10000000, 99999999)}",
-                    company_url=f"https://client{i:02d}.com",
-                    is_active=bool(i % 2),
-                )
-            )
+        until = options["until"] or timezone.now().astimezone(dt_timezone.utc).date()
+        end = datetime(until.year, until.month, until.day, tzinfo=dt_timezone.utc)
+        start = add_months(end, -options["months"])
+        seed, method = options["seed"], options["method"]
+
+        request_type_ids = []
+        for name, description, _ in REQUEST_TYPES:
+            request_type, _ = RequestType.objects.get_or_create(name=name, defaults={"description": description})
+            request_type_ids.append(request_type.pk)
 
-        # -----------------------------------------------------------------
-        # 2. RequestTypes
-        # -----------------------------------------------------------------
-        request_types = []
-        for i in range(1, 11):
-            request_types.append(
-                RequestType.objects.create(
-                    name=f"Request Type #{i}",
-                    description=f"Seed description for request type {i}",
+        client_ids = self.seed_clients(options["clients"], seed, start, method)
+
+        for month in missing_months(start=start):
+            create_partition(month)
+
+        generator = RequestGenerator(seed, client_ids, request_type_ids, start, end)
+        done = dict(SeedChunk.objects.filter(dataset=generator.dataset).values_list("chunk", "rows"))
+        existing = sum(done.values())
+        if existing:
+            seeded = ClientRequest.objects.filter(client__email__endswith=f"@{SEED_EMAIL_DOMAIN}").count()
+            if seeded < existing:
+                raise CommandError(
+                    f"{existing} seed requests were written for these options but only {seeded} exist: "
+                    f"they were deleted without their SeedChunk records (wipe_data clears both)."
                 )
-            )
+        written = self.write_requests(generator, done, options["requests"], options["workers"], method)
 
-        # -----------------------------------------------------------------
-        # 3. ClientRequests
-        # -----------------------------------------------------------------
-        statuses = ["Pending", "In Progress", "Completed"]
-        now = timezone.now()
-
-        for i in range(10):
-            ClientRequest.objects.create(
-                client=clients[i],
-                request_type=request_types[i],
-                status=statuses[i % 3],
-                description=f"Seed request {i+1}",
-                created_at=now,
-                updated_at=now,
-            )
+        if written:
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {Client._meta.db_table}, {ClientRequest._meta.db_table}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Seed data: {len(client_ids)} clients, {len(request_type_ids)} request types, "
+            f"{existing + written} requests ({start:%Y-%m-%d} to {end:%Y-%m-%d})."
+        ))
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                "Seeded: 4 Users, 10 Clients, 10 RequestTypes, 10 ClientRequests."
-            )
-        )
+    def seed_clients(self, target, seed, start, method):
+        # Create the missing seed clients; returns the first `target` seed client ids in order
+        seed_clients = Client.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}")
+        existing = seed_clients.count()
+        if existing < target:
+            started = time.monotonic()
+            created = 0
+            for first in range(existing, target, CHUNK_SIZE):
+                rows = client_rows(seed, first, min(CHUNK_SIZE, target - first), start)
+                created += write_rows(Client, CLIENT_COLUMNS, rows, method)
+            self.report("clients", created, started)
+        return list(seed_clients.order_by("pk").values_list("pk", flat=True)[:target])
+
+    def write_requests(self, generator, done, target, workers, method):
+        # (chunk, rows to skip, rows in chunk) for each chunk an earlier run didn't write in
+        # full; `done` maps chunk numbers to the rows already written
+        existing = sum(done.values())
+        chunks = []
+        for chunk in range(math.ceil(target / CHUNK_SIZE)):
+            count = min(CHUNK_SIZE, target - chunk * CHUNK_SIZE)
+            if done.get(chunk, 0) < count:
+                chunks.append((chunk, done.get(chunk, 0), count))
+        if not chunks:
+            self.stdout.write(f"{existing} seed requests already exist, nothing to add.")
+            return 0
+
+        started = time.monotonic()
+        written = 0
+        report_every = max(1, len(chunks) // 20)
+        if workers == 1:
+            _init_worker(generator, method)
+            results = map(_write_chunk_args, chunks)
+            pool = None
+        else:
+            # Forked children must open their own database connections
+            connections.close_all()
+            pool = multiprocessing.get_context("fork").Pool(workers, _init_worker, (generator, method))
+            results = pool.imap_unordered(_write_chunk_args, chunks)
+        try:
+            for done, rows in enumerate(results, start=1):
+                written += rows
+                if done % report_every == 0 and done < len(chunks):
+                    elapsed = max(time.monotonic() - started, 1e-6)
+                    self.stdout.write(f"{existing + written}/{target} requests ({written / elapsed:,.0f} rows/s)")
+        except BaseException:
+            if pool is not None:
+                pool.terminate()
+            raise
+        else:
+            if pool is not None:
+                pool.close()
+        finally:
+            if pool is not None:
+                pool.join()
+        self.report("requests", written, started)
+        return written
+
+    def report(self, label, rows, started):
+        elapsed = max(time.monotonic() - started, 1e-6)
+        self.stdout.write(f"Created {rows} {label} in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
@@ -0,0 +1,37 @@
+"""
+Dump the client tables (Client, RequestType, ClientRequest, status history, rollups) into a
+directory with binary COPY, for `restore_data` to reload later. See main/snapshots.py.
+
+Usage:
+    python manage.py seed_generic_data --clients 100000 --requests 10000000
+    python manage.py snapshot_data snapshots/10m
+    python manage.py snapshot_data snapshots/10m --overwrite   ← replace an existing snapshot
+"""
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from main.snapshots import MANIFEST, write_snapshot
+
+
+class Command(BaseCommand):
+    help = "Snapshot the client tables to a directory using binary COPY."
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", help="Directory to write the snapshot into (created if missing).")
+        parser.add_argument("--overwrite", action="store_true", help="Replace a snapshot already in the directory.")
+
+    def handle(self, *args, **options):
+        directory = options["directory"]
+        if os.path.exists(os.path.join(directory, MANIFEST)) and not options["overwrite"]:
+            raise CommandError(f"{directory} already holds a snapshot; pass --overwrite to replace it.")
+
+        started = time.monotonic()
+        manifest = write_snapshot(directory)
+        for entry in manifest["tables"]:
+            self.stdout.write(
+                f"{entry['table']}: {entry['rows']} rows, {entry['bytes'] / 2**20:.1f} MiB in {entry['seconds']:.1f}s"
+            )
+        rows = sum(entry["rows"] for entry in manifest["tables"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Snapshot of {rows} rows written to {directory} in {time.monotonic() - started:.1f}s.")
+        )
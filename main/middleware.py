@@ -0,0 +1,91 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+from .routers import RequestState, request_state
+
+# WhiteNoise's middleware is sync-only. Under ASGI that makes Django run it in a worker
+# thread and hop back to the event loop for the rest of the stack on every request,
+# static or not. This subclass is also async-capable: static files are still served by
+# WhiteNoise (in a thread, since it opens files), everything else awaits the next
+# middleware directly. Under WSGI it behaves exactly like WhiteNoiseMiddleware.
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+# Sets up primary/replica routing state for each request (see main/routers.py). Requests
+# with an unsafe method or the pin cookie start out reading from the primary; a request that
+# writes sets the cookie so the same client keeps reading from the primary for
+# REPLICA_PIN_SECONDS, long enough for the replicas to catch up.
+
+REPLICA_PIN_COOKIE = 'pin_primary'
+
+
+class ReplicaPinningMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        state = self.request_state(request)
+        token = request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_state.reset(token)
+        return self.set_pin_cookie(state, response)
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+        state = self.request_state(request)
+        token = request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_state.reset(token)
+        return self.set_pin_cookie(state, response)
+
+    def request_state(self, request):
+        return RequestState(
+            pinned=request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'),
+            sticky=REPLICA_PIN_COOKIE in request.COOKIES,
+        )
+
+    def set_pin_cookie(self, state, response):
+        if state.wrote:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite='Lax'
+            )
+        return response
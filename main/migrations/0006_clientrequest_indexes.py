@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:11
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction; building the indexes
+    # concurrently keeps the table writable while they are created on large databases
+    atomic = False
+
+    dependencies = [
+        ('main', '0005_alter_clientrequest_status'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='clientrequest',
+            index=models.Index(fields=['-created_at'], name='clientreq_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clientrequest',
+            index=models.Index(fields=['status', '-created_at'], name='clientreq_status_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clientrequest',
+            index=models.Index(fields=['client', '-created_at'], name='clientreq_client_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clientrequest',
+            index=models.Index(fields=['updated_at'], name='clientreq_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='clientrequest',
+            index=models.Index(condition=models.Q(('status', 'Completed'), _negated=True), fields=['-created_at'], name='clientreq_open_created_idx'),
+        ),
+    ]
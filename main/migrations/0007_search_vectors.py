@@ -0,0 +1,69 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:14
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Triggers keep the tsvector columns current for every write path, including
+# bulk updates and COPY, which never call save(). ClientRequest only recomputes
+# when the description changes so status actions don't pay for it.
+SEARCH_VECTOR_TRIGGERS = """
+CREATE FUNCTION main_client_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.email, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.company_url, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER main_client_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, email, company_url ON main_client
+    FOR EACH ROW EXECUTE FUNCTION main_client_search_vector_update();
+
+CREATE FUNCTION main_clientrequest_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := to_tsvector('english', coalesce(NEW.description, ''));
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER main_clientrequest_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF description ON main_clientrequest
+    FOR EACH ROW EXECUTE FUNCTION main_clientrequest_search_vector_update();
+
+-- Backfill existing rows through the triggers
+UPDATE main_client SET name = name;
+UPDATE main_clientrequest SET description = description;
+"""
+
+DROP_SEARCH_VECTOR_TRIGGERS = """
+DROP TRIGGER IF EXISTS main_clientrequest_search_vector_trigger ON main_clientrequest;
+DROP FUNCTION IF EXISTS main_clientrequest_search_vector_update();
+DROP TRIGGER IF EXISTS main_client_search_vector_trigger ON main_client;
+DROP FUNCTION IF EXISTS main_client_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_clientrequest_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='client',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='clientrequest',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_TRIGGERS, DROP_SEARCH_VECTOR_TRIGGERS),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:14
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # GIN indexes on large tables take a while to build; build them concurrently
+    # so the tables stay writable (requires running outside a transaction)
+    atomic = False
+
+    dependencies = [
+        ('main', '0007_search_vectors'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='client_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='client_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['email'], name='client_email_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='client',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['contact_number'], name='client_phone_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        AddIndexConcurrently(
+            model_name='clientrequest',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='clientreq_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='requesttype',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='requesttype_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Statement-level triggers with transition tables: one grouped upsert per INSERT/UPDATE/DELETE
+# statement rather than one per row, so a bulk status action touching 10k requests writes
+# a handful of rollup rows. Updates only write keys whose count actually changed.
+ROLLUP_TRIGGERS = """
+CREATE FUNCTION main_clientrequest_rollup_insert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO main_clientrequestrollup (day, status, request_type_id, request_count)
+    SELECT (created_at AT TIME ZONE 'UTC')::date, coalesce(status, ''), request_type_id, count(*)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, status, request_type_id)
+    DO UPDATE SET request_count = main_clientrequestrollup.request_count + EXCLUDED.request_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION main_clientrequest_rollup_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO main_clientrequestrollup (day, status, request_type_id, request_count)
+    SELECT (created_at AT TIME ZONE 'UTC')::date, coalesce(status, ''), request_type_id, -count(*)
+    FROM old_rows
+    GROUP BY 1, 2, 3
+    ON CONFLICT (day, status, request_type_id)
+    DO UPDATE SET request_count = main_clientrequestrollup.request_count + EXCLUDED.request_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION main_clientrequest_rollup_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO main_clientrequestrollup (day, status, request_type_id, request_count)
+    SELECT day, status, request_type_id, sum(delta)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, coalesce(status, '') AS status,
+               request_type_id, -1 AS delta
+        FROM old_rows
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, coalesce(status, ''), request_type_id, 1
+        FROM new_rows
+    ) AS changes
+    GROUP BY 1, 2, 3
+    HAVING sum(delta) <> 0
+    ON CONFLICT (day, status, request_type_id)
+    DO UPDATE SET request_count = main_clientrequestrollup.request_count + EXCLUDED.request_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER main_clientrequest_rollup_insert_trigger
+    AFTER INSERT ON main_clientrequest REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION main_clientrequest_rollup_insert();
+
+CREATE TRIGGER main_clientrequest_rollup_delete_trigger
+    AFTER DELETE ON main_clientrequest REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION main_clientrequest_rollup_delete();
+
+CREATE TRIGGER main_clientrequest_rollup_update_trigger
+    AFTER UPDATE ON main_clientrequest REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION main_clientrequest_rollup_update();
+
+-- Backfill from existing requests
+INSERT INTO main_clientrequestrollup (day, status, request_type_id, request_count)
+SELECT (created_at AT TIME ZONE 'UTC')::date, coalesce(status, ''), request_type_id, count(*)
+FROM main_clientrequest
+GROUP BY 1, 2, 3;
+"""
+
+DROP_ROLLUP_TRIGGERS = """
+DROP TRIGGER IF EXISTS main_clientrequest_rollup_update_trigger ON main_clientrequest;
+DROP TRIGGER IF EXISTS main_clientrequest_rollup_delete_trigger ON main_clientrequest;
+DROP TRIGGER IF EXISTS main_clientrequest_rollup_insert_trigger ON main_clientrequest;
+DROP FUNCTION IF EXISTS main_clientrequest_rollup_update();
+DROP FUNCTION IF EXISTS main_clientrequest_rollup_delete();
+DROP FUNCTION IF EXISTS main_clientrequest_rollup_insert();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientRequestRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('status', models.CharField(blank=True, max_length=20)),
+                ('request_count', models.IntegerField(default=0)),
+                ('request_type', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, to='main.requesttype')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='clientrequestrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'status', 'request_type'), name='clientrequestrollup_key'),
+        ),
+        migrations.RunSQL(ROLLUP_TRIGGERS, DROP_ROLLUP_TRIGGERS),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:23
+
+from django.conf import settings
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('main', '0010_request_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientRequestStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(choices=[('Pending', 'Pending'), ('In Progress', 'In Progress'), ('Completed', 'Completed')], max_length=20, null=True)),
+                ('to_status', models.CharField(choices=[('Pending', 'Pending'), ('In Progress', 'In Progress'), ('Completed', 'Completed')], max_length=20, null=True)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('client_request', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='main.clientrequest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['client_request', 'changed_at'], name='statusevent_request_idx'), django.contrib.postgres.indexes.BrinIndex(fields=['changed_at'], name='statusevent_changed_brin')],
+            },
+        ),
+    ]
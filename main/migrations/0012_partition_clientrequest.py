@@ -0,0 +1,116 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Rebuilds main_clientrequest as a table range-partitioned by month on created_at.
+#
+# PostgreSQL can't turn an existing table into a partitioned one, so the rows are copied
+# into a new partitioned table inside the migration's transaction (writes to ClientRequest
+# are blocked until it commits; plan a maintenance window on large databases). Indexes,
+# foreign keys and triggers are read from the catalog before the swap and recreated with
+# the same names, so migrations 0006-0009 and the Meta.indexes state stay accurate.
+#
+# Partitioning constraints this migration accepts:
+# - the primary key becomes (id, created_at): unique constraints on a partitioned table
+#   must contain the partition key. `id` is still unique because it comes from one sequence.
+# - no foreign key can reference main_clientrequest(id) any more, so
+#   ClientRequestStatusEvent.client_request becomes db_constraint=False (Django's
+#   on_delete=CASCADE still deletes the events).
+# - the id column uses a plain sequence: identity columns on partitioned tables need
+#   PostgreSQL 17+.
+# - future index migrations on ClientRequest can't use AddIndexConcurrently.
+REBUILD_TABLE = """
+DO $$
+DECLARE
+    index_defs text[];
+    constraint_defs text[];
+    trigger_defs text[];
+    statement text;
+    month timestamp;
+    last_month timestamp;
+BEGIN
+    -- Indexes of a partitioned table are reported as ON ONLY, which wouldn't cascade to partitions
+    SELECT coalesce(array_agg(replace(indexdef, ' ON ONLY ', ' ON ')), '{{}}') INTO index_defs
+    FROM pg_indexes
+    WHERE schemaname = current_schema() AND tablename = 'main_clientrequest'
+      AND indexname <> 'main_clientrequest_pkey';
+
+    SELECT coalesce(array_agg(format('ALTER TABLE main_clientrequest ADD CONSTRAINT %I %s', conname, pg_get_constraintdef(oid))), '{{}}')
+    INTO constraint_defs
+    FROM pg_constraint
+    WHERE conrelid = 'main_clientrequest'::regclass AND contype = 'f';
+
+    SELECT coalesce(array_agg(pg_get_triggerdef(oid)), '{{}}') INTO trigger_defs
+    FROM pg_trigger
+    WHERE tgrelid = 'main_clientrequest'::regclass AND NOT tgisinternal;
+
+    ALTER TABLE main_clientrequest RENAME TO main_clientrequest_old;
+    ALTER TABLE main_clientrequest_old RENAME CONSTRAINT main_clientrequest_pkey TO main_clientrequest_old_pkey;
+
+    -- INCLUDING DEFAULTS leaves out the identity, which the new sequence replaces
+    CREATE TABLE main_clientrequest (LIKE main_clientrequest_old INCLUDING DEFAULTS) {partition_by};
+    CREATE SEQUENCE main_clientrequest_new_id_seq;
+    PERFORM setval('main_clientrequest_new_id_seq', coalesce((SELECT max(id) FROM main_clientrequest_old), 0) + 1, false);
+    ALTER TABLE main_clientrequest ALTER COLUMN id SET DEFAULT nextval('main_clientrequest_new_id_seq');
+
+{create_partitions}
+
+    -- No triggers exist on the new table yet, so the copy doesn't touch rollups or search vectors
+    INSERT INTO main_clientrequest SELECT * FROM main_clientrequest_old;
+    DROP TABLE main_clientrequest_old;
+    ALTER SEQUENCE main_clientrequest_new_id_seq RENAME TO main_clientrequest_id_seq;
+    ALTER SEQUENCE main_clientrequest_id_seq OWNED BY main_clientrequest.id;
+
+    ALTER TABLE main_clientrequest ADD CONSTRAINT main_clientrequest_pkey PRIMARY KEY ({primary_key});
+    FOREACH statement IN ARRAY index_defs || constraint_defs || trigger_defs LOOP
+        EXECUTE statement;
+    END LOOP;
+END
+$$;
+"""
+
+# One partition per UTC month from the oldest request through three months ahead, plus a
+# default partition for anything outside them. `manage.py manage_partitions` keeps
+# creating months ahead and retires old ones.
+CREATE_MONTHLY_PARTITIONS = """
+    month := date_trunc('month', coalesce((SELECT min(created_at) FROM main_clientrequest_old), now()) AT TIME ZONE 'UTC');
+    last_month := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months';
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF main_clientrequest FOR VALUES FROM (%L) TO (%L)',
+            'main_clientrequest_p' || to_char(month, 'YYYYMM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+    CREATE TABLE main_clientrequest_default PARTITION OF main_clientrequest DEFAULT;
+"""
+
+PARTITION_TABLE = REBUILD_TABLE.format(
+    partition_by='PARTITION BY RANGE (created_at)',
+    create_partitions=CREATE_MONTHLY_PARTITIONS,
+    primary_key='id, created_at',
+)
+
+UNPARTITION_TABLE = REBUILD_TABLE.format(
+    partition_by='',
+    create_partitions='',
+    primary_key='id',
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_clientrequest_status_events'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='clientrequeststatusevent',
+            name='client_request',
+            field=models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='main.clientrequest'),
+        ),
+        migrations.RunSQL(PARTITION_TABLE, UNPARTITION_TABLE),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 14:33
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    # Built concurrently so main_client stays writable (requires running outside a transaction)
+    atomic = False
+
+    dependencies = [
+        ('main', '0012_partition_clientrequest'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='client',
+            index=models.Index(django.db.models.functions.comparison.Collate(django.db.models.functions.text.Lower('name'), 'C'), name='client_name_prefix_idx'),
+        ),
+    ]
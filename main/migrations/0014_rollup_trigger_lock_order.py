@@ -0,0 +1,72 @@
+from django.db import migrations
+
+
+# Rollup triggers from 0009 with their upserts sorted by key.
+#
+# Each statement-level upsert locks the rollup rows it touches as it inserts them. Without
+# an ORDER BY the grouped rows come out in whatever order the aggregate produced, so two
+# concurrent statements touching overlapping keys could lock them in opposite orders and
+# deadlock (admin status actions, saves, imports and parallel seeding all write concurrently).
+# Sorting by (day, status, request_type_id) makes every statement lock keys in one order.
+ROLLUP_FUNCTIONS = """
+CREATE OR REPLACE FUNCTION main_clientrequest_rollup_insert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO main_clientrequestrollup (day, status, request_type_id, request_count)
+    SELECT (created_at AT TIME ZONE 'UTC')::date, coalesce(status, ''), request_type_id, count(*)
+    FROM new_rows
+    GROUP BY 1, 2, 3
+    {order_by}
+    ON CONFLICT (day, status, request_type_id)
+    DO UPDATE SET request_count = main_clientrequestrollup.request_count + EXCLUDED.request_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION main_clientrequest_rollup_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO main_clientrequestrollup (day, status, request_type_id, request_count)
+    SELECT (created_at AT TIME ZONE 'UTC')::date, coalesce(status, ''), request_type_id, -count(*)
+    FROM old_rows
+    GROUP BY 1, 2, 3
+    {order_by}
+    ON CONFLICT (day, status, request_type_id)
+    DO UPDATE SET request_count = main_clientrequestrollup.request_count + EXCLUDED.request_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION main_clientrequest_rollup_update() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO main_clientrequestrollup (day, status, request_type_id, request_count)
+    SELECT day, status, request_type_id, sum(delta)
+    FROM (
+        SELECT (created_at AT TIME ZONE 'UTC')::date AS day, coalesce(status, '') AS status,
+               request_type_id, -1 AS delta
+        FROM old_rows
+        UNION ALL
+        SELECT (created_at AT TIME ZONE 'UTC')::date, coalesce(status, ''), request_type_id, 1
+        FROM new_rows
+    ) AS changes
+    GROUP BY 1, 2, 3
+    HAVING sum(delta) <> 0
+    {order_by}
+    ON CONFLICT (day, status, request_type_id)
+    DO UPDATE SET request_count = main_clientrequestrollup.request_count + EXCLUDED.request_count;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0013_client_name_prefix_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            ROLLUP_FUNCTIONS.format(order_by='ORDER BY 1, 2, 3'),
+            ROLLUP_FUNCTIONS.format(order_by=''),
+        ),
+    ]
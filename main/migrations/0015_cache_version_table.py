@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Table for the database cache that holds cache version tokens when no shared cache
+    # backend is configured (CACHE_URL unset, see settings.CACHES['versions']). Same layout
+    # as `manage.py createcachetable`, created here so every deploy has it after migrate.
+
+    dependencies = [
+        ('main', '0014_rollup_trigger_lock_order'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                'CREATE TABLE IF NOT EXISTS main_cache_version ('
+                'cache_key varchar(255) NOT NULL PRIMARY KEY, '
+                'value text NOT NULL, '
+                'expires timestamp with time zone NOT NULL)',
+                'CREATE INDEX IF NOT EXISTS main_cache_version_expires ON main_cache_version (expires)',
+            ],
+            reverse_sql='DROP TABLE IF EXISTS main_cache_version',
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 15:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0015_cache_version_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeedChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(max_length=32)),
+                ('chunk', models.IntegerField()),
+                ('rows', models.IntegerField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='seedchunk',
+            constraint=models.UniqueConstraint(fields=('dataset', 'chunk'), name='seedchunk_key'),
+        ),
+    ]
@@ -1,6 +1,13 @@
-from django.db import models
+from django.conf import settings
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models, transaction
+from django.db.models.functions import Collate, Lower
 from django.utils import timezone
 
+# Marks a ClientRequest whose status wasn't loaded from the database (new or deferred)
+_STATUS_NOT_LOADED = object()
+
 
 # Define the Client model to store client information
 class Client(models.Model):
@@ -10,6 +17,22 @@ class Client(models.Model):
     company_url = models.URLField(blank=True, null=True) # Optional company website URL
     created_at = models.DateTimeField(default=timezone.now) # Timestamp when client was created
     is_active = models.BooleanField(default=True) # Flag to indicate if client is active
+    # Full-text search document (name, email, company URL); kept current by a database trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        # GIN full-text index plus trigram indexes so admin searches on name, email
+        # and phone are served by an index instead of ILIKE '%term%' table scans
+        indexes = [
+            GinIndex(fields=['search_vector'], name='client_search_vector_idx'),
+            GinIndex(fields=['name'], name='client_name_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['email'], name='client_email_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['contact_number'], name='client_phone_trgm_idx', opclasses=['gin_trgm_ops']),
+            # Case-insensitive name prefix lookups for the admin autocomplete, in name order
+            # (main/search.py: autocomplete_clients). The "C" collation lets the btree serve
+            # both LIKE 'prefix%' and the ORDER BY, so a page is read straight off the index.
+            models.Index(Collate(Lower('name'), 'C'), name='client_name_prefix_idx'),
+        ]
 
     def __str__(self):
         # String representation for easy identification in admin or logs
@@ -20,9 +43,35 @@ class RequestType(models.Model):
     name = models.CharField(max_length=255) # Name of the request type
     description = models.TextField(blank=True, null=True) # Optional detailed description
 
+    class Meta:
+        # Trigram index for fuzzy request type searches from the ClientRequest admin
+        indexes = [
+            GinIndex(fields=['name'], name='requesttype_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
+
     def __str__(self):
         return f'{self.id} | {self.name}'
 
+# Custom QuerySet for ClientRequest so list and detail pages can load related rows up front
+class ClientRequestQuerySet(models.QuerySet):
+    # Join the client and request type in the same query; __str__ and the admin
+    # columns read both names, so without this every row costs two extra queries
+    def with_related(self):
+        return self.select_related('client', 'request_type')
+
+    # Requests still being worked on; matches the partial index condition exactly
+    # so PostgreSQL can use clientreq_open_created_idx for it
+    def open(self):
+        return self.exclude(status='Completed')
+
+    # Bulk status change that keeps the status history: one INSERT ... SELECT records
+    # the transitions, one UPDATE applies them, in the same transaction
+    def set_status(self, status, changed_by=None):
+        now = timezone.now()
+        with transaction.atomic(using=self.db):
+            ClientRequestStatusEvent.objects.record_bulk_transition(self, status, now, changed_by)
+            return self.update(status=status, updated_at=now)
+
 # Define the ClientRequest model representing a request made by a client
 class ClientRequest(models.Model):
     # Status choices for tracking progress of the request
@@ -38,6 +87,159 @@ class ClientRequest(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, null=True) # Current status of the request
     created_at = models.DateTimeField(default=timezone.now) # Timestamp when request was created
     updated_at = models.DateTimeField(auto_now=True) # Timestamp when request was last updated
+    # Full-text search document for the description; kept current by a database trigger
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = ClientRequestQuerySet.as_manager()
+
+    # The table is range-partitioned by month on created_at (migration 0012, see main/partitions.py),
+    # so queries filtered on created_at only read the matching months.
+    class Meta:
+        # Indexes follow the admin's query shapes: status filter + newest first,
+        # a client's requests newest first, recently updated, and the open-work queue
+        indexes = [
+            models.Index(fields=['-created_at'], name='clientreq_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='clientreq_status_created_idx'),
+            models.Index(fields=['client', '-created_at'], name='clientreq_client_created_idx'),
+            models.Index(fields=['updated_at'], name='clientreq_updated_idx'),
+            models.Index(
+                fields=['-created_at'],
+                name='clientreq_open_created_idx',
+                condition=~models.Q(status='Completed'),
+            ),
+            GinIndex(fields=['search_vector'], name='clientreq_search_vector_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.id} | {self.client.name} | {self.request_type.name} | {self.status} | {self.updated_at}'
+
+    # Remember the status as loaded so save() can tell whether it changed
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status', _STATUS_NOT_LOADED)
+        return instance
+
+    # Saving an existing request with a new status also appends a ClientRequestStatusEvent.
+    # Pass changed_by to attribute the change to a user (the admin does this).
+    def save(self, *args, changed_by=None, **kwargs):
+        previous = getattr(self, '_loaded_status', _STATUS_NOT_LOADED)
+        update_fields = kwargs.get('update_fields')
+        status_changed = (
+            previous is not _STATUS_NOT_LOADED
+            and previous != self.status
+            and (update_fields is None or 'status' in update_fields)
+        )
+        if not status_changed:
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic(using=kwargs.get('using') or self._state.db):
+                super().save(*args, **kwargs)
+                ClientRequestStatusEvent.objects.create(
+                    client_request=self,
+                    from_status=previous,
+                    to_status=self.status,
+                    changed_at=self.updated_at,
+                    changed_by=changed_by,
+                )
+        self._loaded_status = self.status
+
+# Daily request counts per (day, status, request type) for the admin dashboard.
+# Rows are maintained by statement-level database triggers on ClientRequest, so every
+# write path (save, delete, queryset.update() in admin actions, bulk_create, COPY)
+# keeps them current; `manage.py rebuild_rollups` backfills and repairs drift.
+class ClientRequestRollup(models.Model):
+    day = models.DateField() # UTC date of the request's created_at
+    status = models.CharField(max_length=20, blank=True) # Request status; '' for requests without one
+    # No database constraint: deleting a RequestType cascades through ClientRequest,
+    # whose triggers zero these rows rather than this table blocking the delete
+    request_type = models.ForeignKey(RequestType, on_delete=models.DO_NOTHING, db_constraint=False)
+    request_count = models.IntegerField(default=0) # Number of requests with this day/status/type
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'status', 'request_type'], name='clientrequestrollup_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.day} | {self.status} | {self.request_type_id} | {self.request_count}'
+
+
+# Progress of a resumable `manage.py import_requests` run. Updated in the same
+# transaction as each imported batch, so a resumed run skips exactly the source
+# records that were committed.
+class RequestImportCheckpoint(models.Model):
+    name = models.CharField(max_length=255, unique=True) # Job name; defaults to the source file's absolute path
+    rows_committed = models.BigIntegerField(default=0) # Source records processed (imported or rejected)
+    updated_at = models.DateTimeField(auto_now=True) # Time of the last committed batch
+
+    def __str__(self):
+        return f'{self.name} | {self.rows_committed}'
+
+
+# Request chunks written by `manage.py seed_generic_data`. Each is recorded in the same
+# transaction as its rows, so a rerun refills exactly the chunks that are missing or short,
+# whatever order parallel workers committed them in.
+class SeedChunk(models.Model):
+    dataset = models.CharField(max_length=32) # Digest of what shapes the rows: seed, client and request type ids, window
+    chunk = models.IntegerField() # Chunk number
+    rows = models.IntegerField() # Leading rows of the chunk written so far
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dataset', 'chunk'], name='seedchunk_key'),
+        ]
+
+    def __str__(self):
+        return f'{self.dataset} | {self.chunk} | {self.rows}'
+
+
+# Custom QuerySet for status events, including the set-based writer used by bulk status changes
+class ClientRequestStatusEventQuerySet(models.QuerySet):
+    # Append one event per request in `requests` whose status differs from `to_status`,
+    # as a single INSERT ... SELECT. The selected rows are locked (FOR UPDATE) so the
+    # recorded from_status can't go stale before the caller's UPDATE in the same transaction.
+    def record_bulk_transition(self, requests, to_status, changed_at, changed_by=None):
+        selection = (
+            requests.exclude(status=to_status)
+            .order_by()
+            .select_for_update(of=('self',))
+            .values_list('pk', 'status')
+        )
+        select_sql, select_params = selection.query.sql_with_params()
+        table = self.model._meta.db_table
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (client_request_id, from_status, to_status, changed_at, changed_by_id) '
+                f'SELECT selected.id, selected.status, %s, %s, %s FROM ({select_sql}) AS selected',
+                [to_status, changed_at, changed_by.pk if changed_by else None, *select_params],
+            )
+            return cursor.rowcount
+
+
+# Append-only history of ClientRequest status transitions. Rows are only ever inserted:
+# by ClientRequest.save() for single changes and by ClientRequestQuerySet.set_status()
+# (the admin status actions) for bulk changes.
+class ClientRequestStatusEvent(models.Model):
+    # The composite index below starts with client_request, so the FK's own index is redundant.
+    # No database constraint: ClientRequest is partitioned (migration 0012) and its primary key
+    # is (id, created_at), so nothing can reference id alone. CASCADE is applied by Django.
+    client_request = models.ForeignKey(ClientRequest, on_delete=models.CASCADE, related_name='status_events', db_index=False, db_constraint=False)
+    from_status = models.CharField(max_length=20, choices=ClientRequest.STATUS_CHOICES, null=True) # Status before the change
+    to_status = models.CharField(max_length=20, choices=ClientRequest.STATUS_CHOICES, null=True) # Status after the change
+    changed_at = models.DateTimeField(default=timezone.now) # When the transition happened
+    # Who made the change, when it came through the admin
+    changed_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    objects = ClientRequestStatusEventQuerySet.as_manager()
+
+    class Meta:
+        # "History of request X" reads the composite btree; "all transitions in window Y"
+        # uses a BRIN index, which stays tiny because rows arrive in changed_at order
+        indexes = [
+            models.Index(fields=['client_request', 'changed_at'], name='statusevent_request_idx'),
+            BrinIndex(fields=['changed_at'], name='statusevent_changed_brin'),
+        ]
 
     def __str__(self):
-        return f'{self.id} | {self.client.name} | {self.request_type.name} | {self.status} | {self.updated_at}'
\ No newline at end of file
+        return f'{self.client_request_id} | {self.from_status} -> {self.to_status} | {self.changed_at}'
@@ -0,0 +1,299 @@
+import json
+from datetime import datetime
+from django.core.paginator import InvalidPage, Paginator
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR
+from django.db import connection
+from django.db.models import Q
+from django.forms.models import BaseInlineFormSet
+from django.urls import NoReverseMatch, reverse
+from django.utils.functional import cached_property
+from .search import RankedSearchChangeList
+
+# Large-table changelist mode for the custom admin site.
+#
+# Once a table's estimated size passes CustomAdminSite.large_table_threshold:
+# - row counts come from PostgreSQL statistics (pg_class.reltuples, or the planner's
+#   estimate for filtered lists) instead of COUNT(*) over the whole result
+# - the default newest-first ordering pages by a (created_at, id) cursor, so page 5,000
+#   costs the same index range scan as page 1 instead of OFFSET 500000
+# Other orderings (column sorts, ranked search) keep offset pagination with estimated counts.
+
+AFTER_VAR = 'after'    # cursor of the last row on the previous page (older rows)
+BEFORE_VAR = 'before'  # cursor of the first row on the next page (newer rows)
+
+# The ordering ChangeList produces for ordering = ('-created_at',) once it adds its pk tie-breaker
+KEYSET_ORDERING = ['-created_at', '-pk']
+
+
+def estimated_row_count(model):
+    # Row estimate from the last ANALYZE/autovacuum; -1 (never analysed) is treated as unknown.
+    # Partitioned tables (ClientRequest) keep no estimate of their own, so their partitions are summed.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT coalesce('
+            '(SELECT sum(greatest(c.reltuples, 0)) FROM pg_partition_tree(%s::regclass) t '
+            'JOIN pg_class c ON c.oid = t.relid WHERE t.isleaf), '
+            '(SELECT greatest(reltuples, 0) FROM pg_class WHERE oid = %s::regclass))::bigint',
+            [model._meta.db_table] * 2,
+        )
+        row = cursor.fetchone()
+    return row[0] or 0
+
+
+def estimated_count(queryset):
+    # Unfiltered querysets use the table statistics, filtered ones the planner's row estimate
+    if not queryset.query.where:
+        return estimated_row_count(queryset.model)
+    plan = json.loads(queryset.order_by().explain(format='json'))[0]['Plan']
+    return int(plan['Plan Rows'])
+
+
+def encode_cursor(obj):
+    return f'{obj.created_at.isoformat()}_{obj.pk}'
+
+
+def decode_cursor(value):
+    # Returns (created_at, pk); malformed cursors are reported like any bad changelist parameter
+    try:
+        created_at, pk = value.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(pk)
+    except (AttributeError, ValueError):
+        raise IncorrectLookupParameters(f'Invalid cursor: {value}')
+
+
+class EstimatedCountPaginator(Paginator):
+    # Offset paginator whose count is an estimate, so pages past the estimate must still load
+    @cached_property
+    def count(self):
+        return estimated_count(self.object_list)
+
+    def validate_number(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise InvalidPage('That page number is not an integer')
+        if number < 1:
+            raise InvalidPage('That page number is less than 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom:bottom + self.per_page], number, self)
+
+
+class KeysetChangeList(RankedSearchChangeList):
+    def get_queryset(self, request, *args, **kwargs):
+        # Cursor parameters are not field lookups: take them out of self.params before the
+        # filters see them, which also keeps them out of every filter/sort link on the page
+        self.after = self.params.pop(AFTER_VAR, None)
+        self.before = self.params.pop(BEFORE_VAR, None)
+        return super().get_queryset(request, *args, **kwargs)
+
+    def get_results(self, request):
+        self.estimated_total = estimated_row_count(self.model)
+        self.large_table = self.estimated_total >= self.model_admin.admin_site.large_table_threshold
+        self.keyset = (
+            self.large_table
+            and not self.show_all
+            # ChangeList repeats the ModelAdmin ordering, so compare without duplicates
+            and list(dict.fromkeys(self.queryset.query.order_by)) == KEYSET_ORDERING
+        )
+        self.next_page_url = self.previous_page_url = None
+
+        if not self.large_table:
+            return super().get_results(request)
+
+        # Shared large-table settings: no exact counts, no "show all"
+        self.show_full_result_count = False
+        self.full_result_count = None
+        self.show_admin_actions = True
+        self.can_show_all = False
+        self.paginator = EstimatedCountPaginator(self.queryset, self.list_per_page)
+        self.result_count = self.paginator.count
+
+        if self.keyset:
+            self._get_keyset_results()
+        else:
+            self._get_offset_results()
+
+    def _get_offset_results(self):
+        # The estimate can be off either way, so links follow the rows actually returned
+        try:
+            self.result_list = self.paginator.page(self.page_num).object_list
+        except InvalidPage:
+            raise IncorrectLookupParameters
+        has_next = len(self.result_list) == self.list_per_page
+        self.multi_page = has_next or self.page_num > 1
+        if has_next:
+            self.next_page_url = self.get_query_string({PAGE_VAR: self.page_num + 1})
+        if self.page_num > 1:
+            self.previous_page_url = self.get_query_string({PAGE_VAR: self.page_num - 1})
+
+    def _get_keyset_results(self):
+        per_page = self.list_per_page
+        queryset = self.queryset
+
+        if self.before:
+            # Newer rows: walk the index upwards from the cursor, then flip back to newest-first
+            created_at, pk = decode_cursor(self.before)
+            queryset = queryset.filter(
+                Q(created_at__gte=created_at), Q(created_at__gt=created_at) | Q(pk__gt=pk)
+            )
+            rows = list(queryset.order_by('created_at', 'pk')[:per_page + 1])
+            has_newer = len(rows) > per_page
+            rows = rows[:per_page][::-1]
+            has_older = True
+        else:
+            if self.after:
+                created_at, pk = decode_cursor(self.after)
+                # The plain created_at bound gives the index a range to start from;
+                # the OR only breaks ties between rows sharing the cursor's timestamp
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at), Q(created_at__lt=created_at) | Q(pk__lt=pk)
+                )
+            # Fetch one extra row to learn whether an older page exists without counting
+            rows = list(queryset[:per_page + 1])
+            has_older = len(rows) > per_page
+            rows = rows[:per_page]
+            has_newer = bool(self.after)
+
+        self.result_list = rows
+        self.multi_page = has_older or has_newer
+        if rows and has_older:
+            self.next_page_url = self.get_query_string({AFTER_VAR: encode_cursor(rows[-1])})
+        if rows and has_newer:
+            self.previous_page_url = self.get_query_string({BEFORE_VAR: encode_cursor(rows[0])})
+
+
+class KeysetPaginationMixin:
+    # ModelAdmin mixin enabling the large-table changelist mode
+    change_list_template = 'admin/keyset_change_list.html'
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+# Paginated inlines: a change page shows the newest `per_page` related rows instead of
+# the whole relation, with an "Older" link carrying a (created_at, id) cursor like the
+# large-table changelist and a link to the changelist filtered to the parent object.
+#
+# Saving edits exactly the rows the page showed: a bound formset reloads them by the ids
+# it submitted, so a request added in the meantime can't shift rows between forms.
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    # Set per request by PaginatedInlineMixin.get_formset
+    request = None
+    per_page = 20
+    shared_choice_fields = ()
+    changelist_url = None
+
+    @property
+    def cursor_var(self):
+        return f'{self.prefix}-{AFTER_VAR}'
+
+    def get_queryset(self):
+        # A list rather than a QuerySet: formsets and InlineAdminFormSet only take its
+        # length, index it and iterate it
+        if not hasattr(self, '_page'):
+            queryset = super().get_queryset().order_by(*KEYSET_ORDERING)
+            if self.is_bound:
+                self._page = list(queryset.filter(pk__in=self._submitted_pks()))
+                self.has_older = False
+            else:
+                self._page = self._newest_rows(queryset)
+            # Every row belongs to the parent object; sharing it keeps __str__ (shown on each
+            # row) from loading it again per row
+            for row in self._page:
+                setattr(row, self.fk.name, self.instance)
+        return self._page
+
+    def _submitted_pks(self):
+        try:
+            count = int(self.data.get(f'{self.prefix}-INITIAL_FORMS', 0))
+        except ValueError:
+            count = 0
+        pk_name = self.model._meta.pk.name
+        values = (self.data.get(f'{self.prefix}-{i}-{pk_name}', '') for i in range(count))
+        return [value for value in values if value.isdigit()]
+
+    def _newest_rows(self, queryset):
+        cursor = self.request.GET.get(self.cursor_var) if self.request is not None else None
+        self.cursor = None
+        if cursor:
+            try:
+                created_at, pk = decode_cursor(cursor)
+            except IncorrectLookupParameters:
+                pass  # a mangled link shows the newest rows
+            else:
+                self.cursor = cursor
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at), Q(created_at__lt=created_at) | Q(pk__lt=pk)
+                )
+        # One extra row tells whether an older page exists without counting
+        rows = list(queryset[:self.per_page + 1])
+        self.has_older = len(rows) > self.per_page
+        return rows[:self.per_page]
+
+    def page_url(self, cursor):
+        params = self.request.GET.copy()
+        params.pop(self.cursor_var, None)
+        if cursor:
+            params[self.cursor_var] = cursor
+        return f'?{params.urlencode()}'
+
+    @property
+    def older_url(self):
+        page = self.get_queryset()
+        return self.page_url(encode_cursor(page[-1])) if self.has_older and page else None
+
+    @property
+    def newest_url(self):
+        return self.page_url(None) if getattr(self, 'cursor', None) else None
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        # Select choices are read once per formset instead of once per form
+        for name in self.shared_choice_fields:
+            field = form.fields.get(name)
+            if field is None:
+                continue
+            if name not in self._shared_choices:
+                # Iterated rather than list()ed, which would COUNT the choices first
+                self._shared_choices[name] = [choice for choice in field.choices]
+            field.choices = self._shared_choices[name]
+            # The admin wraps the <select> in RelatedFieldWidgetWrapper, which renders its inner widget
+            if hasattr(field.widget, 'widget'):
+                field.widget.widget.choices = self._shared_choices[name]
+
+    @cached_property
+    def _shared_choices(self):
+        return {}
+
+
+class PaginatedInlineMixin:
+    # InlineModelAdmin mixin for PaginatedInlineFormSet. The inline's model needs
+    # created_at and an integer pk (the keyset cursor).
+    formset = PaginatedInlineFormSet
+    template = 'admin/edit_inline/paginated_tabular.html'
+    per_page = 20
+    # ForeignKey/choice fields whose <select> options are built once and shared by every form
+    shared_choice_fields = ()
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.request = request
+        formset.per_page = self.per_page
+        formset.shared_choice_fields = self.shared_choice_fields
+        formset.changelist_url = None
+        if obj is not None and obj.pk is not None:
+            opts = self.model._meta
+            try:
+                url = reverse(f'{self.admin_site.name}:{opts.app_label}_{opts.model_name}_changelist')
+            except NoReverseMatch:
+                pass
+            else:
+                fk = formset.fk
+                formset.changelist_url = f'{url}?{fk.name}__{fk.target_field.name}__exact={obj.pk}'
+        return formset
@@ -0,0 +1,126 @@
+import re
+from collections import namedtuple
+from datetime import timezone as dt_timezone
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import ClientRequest, ClientRequestRollup, ClientRequestStatusEvent
+
+# Monthly range partitions of ClientRequest on created_at (see migration 0012).
+#
+# Each UTC month lives in its own table, main_clientrequest_pYYYYMM, so admin lists filtered
+# by date only scan the months they cover and retiring a month is a DETACH (or DROP) instead
+# of a multi-million row DELETE. Rows outside every month land in main_clientrequest_default;
+# creating the missing month later moves them out of it. `manage.py manage_partitions` runs
+# these helpers and is meant to be scheduled (e.g. daily) so future months always exist.
+
+TABLE = ClientRequest._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+# Months created ahead of the current one
+MONTHS_AHEAD = 3
+
+# `start`/`end` are None for the default partition; `rows` is the planner's estimate
+Partition = namedtuple('Partition', ['name', 'start', 'end', 'rows'])
+
+_RANGE_BOUNDS = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+def month_start(value):
+    # First instant of value's month in UTC
+    return value.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def list_partitions():
+    # Attached partitions, oldest month first and the default partition last
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), greatest(c.reltuples, 0)::bigint '
+            'FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = %s::regclass',
+            [TABLE],
+        )
+        rows = cursor.fetchall()
+    partitions = []
+    for name, bounds, estimate in rows:
+        match = _RANGE_BOUNDS.search(bounds)
+        start, end = (parse_datetime(match[1]), parse_datetime(match[2])) if match else (None, None)
+        partitions.append(Partition(name, start, end, estimate))
+    return sorted(partitions, key=lambda p: (p.start is None, p.start))
+
+
+def default_partition_has_rows():
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION})')
+        return cursor.fetchone()[0]
+
+
+def missing_months(months_ahead=MONTHS_AHEAD, start=None, now=None):
+    # Months from `start` (default: the current month) through `months_ahead` ahead with no partition
+    current = month_start(now or timezone.now())
+    existing = {p.start for p in list_partitions() if p.start is not None}
+    month = month_start(start) if start else current
+    months = []
+    while month <= add_months(current, months_ahead):
+        if month not in existing:
+            months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+@transaction.atomic
+def create_partition(month):
+    # Create the partition for `month`, moving any of its rows out of the default partition.
+    # Returns the number of rows moved.
+    name = partition_name(month)
+    bounds = [month, add_months(month, 1)]
+    in_range = 'created_at >= %s AND created_at < %s'
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})', bounds)
+        if not cursor.fetchone()[0]:
+            cursor.execute(f'CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)', bounds)
+            return 0
+        # PostgreSQL refuses a new partition while the default holds rows for its range, so
+        # detach the default, move the rows across, and reattach it. The rows go straight
+        # into the partitions, which bypasses the parent's statement triggers: rollups
+        # already count them.
+        cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}')
+        cursor.execute(f'CREATE TABLE {name} PARTITION OF {TABLE} FOR VALUES FROM (%s) TO (%s)', bounds)
+        cursor.execute(f'INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_range}', bounds)
+        moved = cursor.rowcount
+        cursor.execute(f'DELETE FROM {DEFAULT_PARTITION} WHERE {in_range}', bounds)
+        cursor.execute(f'ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT')
+    return moved
+
+
+def expired_partitions(retain_months, now=None):
+    # Monthly partitions that end before the oldest of the last `retain_months` months
+    cutoff = add_months(month_start(now or timezone.now()), -retain_months)
+    return [p for p in list_partitions() if p.end is not None and p.end <= cutoff]
+
+
+@transaction.atomic
+def retire_partition(partition, drop=False):
+    # Detach a monthly partition (its table is kept as an archive) or drop it outright.
+    # Neither fires the delete triggers, so the month's rollups are removed here; rollup
+    # days are UTC dates, the same boundaries the partition uses.
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {partition.name}')
+        ClientRequestRollup.objects.filter(day__gte=partition.start.date(), day__lt=partition.end.date()).delete()
+        if drop:
+            cursor.execute(
+                f'DELETE FROM {ClientRequestStatusEvent._meta.db_table} '
+                f'WHERE client_request_id IN (SELECT id FROM {partition.name})'
+            )
+            # Deferred foreign key checks queued in this transaction would block the DROP
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+            cursor.execute(f'DROP TABLE {partition.name}')
@@ -0,0 +1,93 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from .cache import bump_cache_version, cache_versions
+
+# Cross-request permission cache for the admin.
+#
+# ModelBackend only caches a user's permissions on the user object, so every admin request
+# re-runs the auth_permission joins for user and group permissions. CachedPermissionBackend
+# keeps the resolved set in the cache under a versioned key:
+# - each user has a version, bumped when their groups, user permissions or superuser/active
+#   flags change
+# - a global version is bumped when anything that can affect many users changes (a group's
+#   permissions or members, deleting a group, adding or deleting a Permission)
+# Old keys are never deleted, they just stop being read and expire after the timeout.
+
+GLOBAL_VERSION = 'perms'
+
+
+def _cache():
+    return caches[settings.PERMISSION_CACHE_ALIAS]
+
+
+def permission_version(user):
+    # Combined global + per-user version token; anything derived from a user's permissions
+    # can be cached under it and is invalidated whenever they change. Kept on the user object
+    # for the rest of the request, like ModelBackend's _perm_cache, so the permission check
+    # and the admin fragments read the versions once.
+    if not hasattr(user, '_perm_version'):
+        user._perm_version = '.'.join(cache_versions(GLOBAL_VERSION, f'perms:{user.pk}'))
+    return user._perm_version
+
+
+def bump_user_permissions(user_id):
+    bump_cache_version(f'perms:{user_id}')
+
+
+def bump_all_permissions():
+    bump_cache_version(GLOBAL_VERSION)
+
+
+class CachedPermissionBackend(ModelBackend):
+    # ModelBackend whose resolved permission set is shared across requests (and workers,
+    # with a shared cache backend)
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            key = f'perms:{user_obj.pk}:{permission_version(user_obj)}'
+            perms = _cache().get(key)
+            if perms is None:
+                perms = super().get_all_permissions(user_obj)
+                _cache().set(key, perms, settings.PERMISSION_CACHE_TIMEOUT)
+            user_obj._perm_cache = perms
+        return user_obj._perm_cache
+
+
+User = get_user_model()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def permissions_m2m_changed(sender, instance, action, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # user.groups / user.user_permissions only affect that user; changes made from the
+    # group or permission side (group.permissions, group.user_set, ...) may affect many
+    if isinstance(instance, User):
+        bump_user_permissions(instance.pk)
+    else:
+        bump_all_permissions()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only touch last_login (and password, when the hash is upgraded on login), which
+    # don't change permissions
+    if created or (update_fields is not None and set(update_fields) <= {'last_login', 'password'}):
+        return
+    bump_user_permissions(instance.pk)
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def permission_objects_changed(sender, **kwargs):
+    # Deleting a group or permission cascades through the m2m tables without m2m_changed
+    bump_all_permissions()
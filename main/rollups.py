@@ -0,0 +1,85 @@
+from datetime import timedelta, timezone as dt_timezone
+from django.db import connection, transaction
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from .models import ClientRequest, ClientRequestRollup
+
+# Dashboard rollups of ClientRequest counts by (day, status, request type).
+#
+# The rollup table is kept current by triggers (see migration 0009); this module
+# reads it for the admin dashboard and recomputes it from ClientRequest for
+# `manage.py rebuild_rollups`.
+
+# Number of days shown in the dashboard's "requests per day" table
+DASHBOARD_DAYS = 14
+
+# Cache key of the dashboard's request overview (dashboard_summary), in ADMIN_FRAGMENT_CACHE_ALIAS
+DASHBOARD_CACHE_KEY = 'admin:request-overview'
+
+
+def expected_rollups():
+    # Recompute every rollup key straight from ClientRequest: {(day, status, type_id): count}
+    rows = (
+        ClientRequest.objects
+        .annotate(day=TruncDate('created_at', tzinfo=dt_timezone.utc), status_key=Coalesce('status', Value('')))
+        .values_list('day', 'status_key', 'request_type_id')
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+    return {(day, status, type_id): total for day, status, type_id, total in rows}
+
+
+def stored_rollups():
+    rows = ClientRequestRollup.objects.exclude(request_count=0).values_list(
+        'day', 'status', 'request_type_id', 'request_count'
+    )
+    return {(day, status, type_id): total for day, status, type_id, total in rows}
+
+
+def rollup_drift():
+    # Keys whose stored count differs from the recomputed one: {key: (stored, expected)}
+    expected = expected_rollups()
+    stored = stored_rollups()
+    return {
+        key: (stored.get(key, 0), expected.get(key, 0))
+        for key in expected.keys() | stored.keys()
+        if stored.get(key, 0) != expected.get(key, 0)
+    }
+
+
+@transaction.atomic
+def rebuild_rollups():
+    # SHARE mode blocks ClientRequest writes (but not reads) until the rebuild commits,
+    # so no trigger update can land between the recount and the swap
+    with connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {ClientRequest._meta.db_table} IN SHARE MODE')
+    ClientRequestRollup.objects.all().delete()
+    rollups = ClientRequestRollup.objects.bulk_create(
+        ClientRequestRollup(day=day, status=status, request_type_id=type_id, request_count=total)
+        for (day, status, type_id), total in expected_rollups().items()
+    )
+    return len(rollups)
+
+
+def dashboard_summary(days=DASHBOARD_DAYS):
+    # Three grouped reads over the rollup table; cost depends on days x statuses x types,
+    # never on the number of ClientRequest rows
+    rollups = ClientRequestRollup.objects.exclude(request_count=0)
+    status_order = [value for value, _ in ClientRequest.STATUS_CHOICES] + ['']
+    by_status = sorted(
+        rollups.values('status').annotate(total=Sum('request_count')).order_by(),
+        key=lambda row: status_order.index(row['status']) if row['status'] in status_order else len(status_order),
+    )
+    by_type = (
+        rollups.values('request_type__name').annotate(total=Sum('request_count')).order_by('-total')[:10]
+    )
+    since = timezone.now().date() - timedelta(days=days - 1)
+    by_day = rollups.filter(day__gte=since).values('day').annotate(total=Sum('request_count')).order_by('-day')
+    return {
+        'total': sum(row['total'] for row in by_status),
+        'by_status': by_status,
+        'by_type': list(by_type),
+        'by_day': list(by_day),
+        'days': days,
+    }
@@ -0,0 +1,74 @@
+import random
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Primary/replica routing, enabled when DATABASE_REPLICA_URLS configures replica aliases
+# (settings.DATABASE_REPLICAS).
+#
+# Reads go to a random replica only while serving a request (ReplicaPinningMiddleware in
+# main/middleware.py sets the request state), and only until something pins the request to
+# the primary:
+#   - a write: the rest of the request reads its own writes from the primary
+#   - an unsafe method (POST, ...) or the pin cookie, which a writing request sets so the
+#     follow-up requests (the redirect after an admin save) don't race replication lag
+# A POST known to only read (a view-only admin action such as an export) can hand its
+# reads back to the replicas with allow_replica_reads(), unless the cookie pinned it.
+# Everything else reads from the primary too: management commands, reads inside
+# transaction.atomic(), the auth/session/contenttypes tables, whose rows feed caches
+# shared by every user (permission and session caches) and must never be stale, and
+# database cache tables ('django_cache', e.g. the cache version tokens without CACHE_URL),
+# which are read back right after being written. Cache writes don't pin the request: they
+# store derived data, not rows the client needs to read back from the primary.
+
+PRIMARY_ONLY_APPS = {'auth', 'sessions', 'contenttypes', 'django_cache'}
+
+
+class RequestState:
+    def __init__(self, pinned=False, sticky=False):
+        # sticky: pinned by the cookie, i.e. a recent write by the same client
+        self.pinned = pinned or sticky
+        self.sticky = sticky
+        self.wrote = False
+
+
+# The current request's RequestState; a mutable object, so writes made in sync_to_async
+# threads (which run in a copy of the context) still pin the whole request
+request_state = ContextVar('replica_request_state', default=None)
+
+
+def replica_for_read():
+    state = request_state.get()
+    if state is None or state.pinned or not settings.DATABASE_REPLICAS:
+        return None
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return None
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def allow_replica_reads():
+    # Unpin a request pinned only by its method
+    state = request_state.get()
+    if state is not None and not state.sticky and not state.wrote:
+        state.pinned = False
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return replica_for_read() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = request_state.get()
+        if state is not None and model._meta.app_label != 'django_cache':
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in aliases and obj2._state.db in aliases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,109 @@
+from django.contrib.admin.views.main import ChangeList, ORDER_VAR
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import CharField, F, FloatField, Q, Value
+from django.db.models.functions import Coalesce, Collate, Greatest, Lower
+from django.db.models.lookups import IContains
+from .models import Client, RequestType
+
+# PostgreSQL search backend for the custom admin site.
+#
+# Full-text matches come from the trigger-maintained search_vector columns (GIN indexed),
+# substring and fuzzy name/email/phone matches from pg_trgm GIN indexes, so neither falls
+# back to table scans. Every result is annotated with `search_rank` and the
+# changelist orders by it unless the user picked a column to sort on.
+
+# Text search configuration; must match the one used by the search_vector triggers
+SEARCH_CONFIG = 'english'
+
+
+def _search_query(term):
+    # websearch syntax accepts whatever users type ("quoted phrases", -exclusions, or)
+    return SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+
+
+def _rank(expression):
+    # NULL ranks would sort first in a descending order, so treat them as 0
+    return Coalesce(expression, Value(0.0), output_field=FloatField())
+
+
+@CharField.register_lookup
+class ILikeContains(IContains):
+    # Case-insensitive substring match as `col ILIKE '%term%'`. Django's icontains compiles to
+    # UPPER(col::text) LIKE UPPER(...), an expression the gin_trgm_ops indexes on the plain
+    # columns can't serve; ILIKE on the column itself can.
+    lookup_name = 'ilike_contains'
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs_sql} ILIKE {rhs_sql}', [*lhs_params, *rhs_params]
+
+
+def _fuzzy_name_match(term, field='name'):
+    # Substring or misspelt-word match; both operators are served by the gin_trgm_ops index
+    return Q(**{f'{field}__ilike_contains': term}) | Q(**{f'{field}__trigram_word_similar': term})
+
+
+def search_clients(queryset, term):
+    query = _search_query(term)
+    return queryset.filter(
+        Q(search_vector=query)
+        | _fuzzy_name_match(term)
+        | Q(email__ilike_contains=term)
+        | Q(contact_number__ilike_contains=term)
+    ).annotate(
+        search_rank=_rank(SearchRank(F('search_vector'), query)) + _rank(TrigramWordSimilarity(term, 'name'))
+    )
+
+
+def autocomplete_clients(queryset, term, include_inactive=False):
+    # Clients whose name starts with `term` (case-insensitively), in name order. Both the
+    # filter and the ordering use client_name_prefix_idx's expression, so a page of results
+    # is a short index range scan whatever the table size.
+    name_key = Collate(Lower('name'), 'C')
+    if not include_inactive:
+        queryset = queryset.filter(is_active=True)
+    queryset = queryset.alias(name_key=name_key)
+    if term:
+        queryset = queryset.filter(name_key__startswith=term.lower())
+    return queryset.order_by('name_key', 'pk')
+
+
+def search_client_requests(queryset, term):
+    query = _search_query(term)
+    # Resolve matching clients and request types through their own trigram indexes first,
+    # then look the requests up by foreign key
+    clients = Client.objects.filter(_fuzzy_name_match(term)).values('pk')
+    request_types = RequestType.objects.filter(_fuzzy_name_match(term)).values('pk')
+    return queryset.filter(
+        Q(search_vector=query) | Q(client__in=clients) | Q(request_type__in=request_types)
+    ).annotate(
+        search_rank=_rank(SearchRank(F('search_vector'), query)) + Greatest(
+            _rank(TrigramWordSimilarity(term, 'client__name')),
+            _rank(TrigramWordSimilarity(term, 'request_type__name')),
+        )
+    )
+
+
+class RankedSearchChangeList(ChangeList):
+    # Put the best matches first while a search is active, unless a column sort was chosen
+    def get_ordering(self, request, queryset):
+        ordering = super().get_ordering(request, queryset)
+        if self.query and ORDER_VAR not in self.params and 'search_rank' in queryset.query.annotations:
+            return ['-search_rank', *ordering]
+        return ordering
+
+
+class RankedSearchMixin:
+    # ModelAdmin mixin: set `search_backend` to one of the search functions above
+    search_backend = None
+
+    def get_changelist(self, request, **kwargs):
+        return RankedSearchChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        # Filters are plain joins/subqueries on single-valued relations, so no duplicates
+        return self.search_backend(queryset, search_term), False
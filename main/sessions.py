@@ -0,0 +1,47 @@
+import time
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.signals import request_finished
+from django.dispatch import receiver
+from django.utils import timezone
+
+# Expired-session sweeper for the database-backed session engines.
+#
+# Django never deletes expired django_session rows on its own; `clearsessions` has to be
+# scheduled. Instead, after a response has been sent, a worker checks whether
+# SESSION_SWEEP_INTERVAL has passed and, if it wins a lock in the shared cache (so one
+# worker sweeps per interval, not all of them), deletes up to SESSION_SWEEP_BATCH expired
+# rows. A backlog is worked off a batch per interval rather than in one long DELETE.
+# Cache-only sessions expire with their cache entries and are never swept.
+
+DB_SESSION_ENGINES = {
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+SWEEP_LOCK_KEY = 'sessions:sweep-lock'
+
+# Per-worker monotonic time of the next sweep attempt
+_next_sweep = 0.0
+
+
+def sweep_expired_sessions(batch_size=None):
+    # Delete one batch of expired sessions; returns how many rows went
+    batch_size = batch_size or settings.SESSION_SWEEP_BATCH
+    expired = Session.objects.filter(expire_date__lt=timezone.now()).values('pk')[:batch_size]
+    deleted, _ = Session.objects.filter(pk__in=expired).delete()
+    return deleted
+
+
+@receiver(request_finished)
+def sweep_sessions_after_request(sender, **kwargs):
+    global _next_sweep
+    if settings.SESSION_ENGINE not in DB_SESSION_ENGINES or not settings.SESSION_SWEEP_INTERVAL:
+        return
+    now = time.monotonic()
+    if now < _next_sweep:
+        return
+    _next_sweep = now + settings.SESSION_SWEEP_INTERVAL
+    if caches[settings.SESSION_CACHE_ALIAS].add(SWEEP_LOCK_KEY, True, settings.SESSION_SWEEP_INTERVAL):
+        sweep_expired_sessions()
@@ -0,0 +1,149 @@
+import json
+import os
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .autocomplete import autocomplete_version
+from .cache import bump_cache_version
+from .facets import facets_changed
+from .models import Client, ClientRequest, ClientRequestRollup, ClientRequestStatusEvent, RequestType, SeedChunk
+from .partitions import create_partition, list_partitions
+from .rollups import DASHBOARD_CACHE_KEY
+
+# Bulk reset of the client data: TRUNCATE for wiping, and binary COPY snapshots so a
+# benchmark database can be put back to a seeded state in seconds instead of re-seeding.
+#
+# A snapshot is a directory holding one PostgreSQL binary COPY file per table plus a
+# manifest.json with each table's columns and row count and the ClientRequest months
+# that had partitions. Binary COPY is only portable between identical column types, so a
+# snapshot can only be restored into the schema version (migrations) it was taken from.
+#
+# Users aren't part of snapshots: foreign keys to them (ClientRequestStatusEvent.changed_by)
+# are left out and restore as NULL.
+
+SNAPSHOT_FORMAT = 1
+MANIFEST = 'manifest.json'
+
+# Tables in load order (referenced tables first). SeedChunk records which seed_generic_data
+# chunks the requests hold, so it's wiped and restored along with them.
+DATA_MODELS = [Client, RequestType, ClientRequest, ClientRequestStatusEvent, ClientRequestRollup, SeedChunk]
+
+
+def data_replaced():
+    # Drop the admin caches derived from the client tables: facet counts, client autocomplete
+    # and the dashboard overview. Saves and deletes do this through signals (main/facets.py,
+    # main/autocomplete.py); TRUNCATE and COPY don't send any.
+    for model in (Client, ClientRequest):
+        facets_changed(model)
+    bump_cache_version(autocomplete_version(Client))
+    caches[settings.ADMIN_FRAGMENT_CACHE_ALIAS].delete(DASHBOARD_CACHE_KEY)
+
+
+def truncate_data():
+    # Empty every DATA_MODELS table in one statement and restart their id sequences.
+    # Nothing is loaded into Python and no signals or delete triggers fire, which is why
+    # the rollups (normally kept by those triggers) are truncated alongside the requests,
+    # and the admin caches are dropped once the transaction commits.
+    tables = ', '.join(connection.ops.quote_name(model._meta.db_table) for model in DATA_MODELS)
+    with connection.cursor() as cursor:
+        # Deferred foreign key checks queued in this transaction would block the TRUNCATE
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        cursor.execute(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+    transaction.on_commit(data_replaced)
+
+
+def snapshot_columns(model):
+    # Concrete columns, minus foreign keys to tables outside the snapshot
+    return [
+        field.column for field in model._meta.concrete_fields
+        if not field.is_relation or field.related_model in DATA_MODELS
+    ]
+
+
+def write_snapshot(directory):
+    # Dump DATA_MODELS into `directory`; returns the manifest
+    os.makedirs(directory, exist_ok=True)
+    manifest = {'format': SNAPSHOT_FORMAT, 'created_at': timezone.now().isoformat(), 'tables': []}
+    # One REPEATABLE READ transaction, so the tables are dumped as of the same moment (when
+    # called inside another transaction, that transaction's isolation level applies)
+    repeatable_read = not connection.in_atomic_block
+    with transaction.atomic(), connection.cursor() as cursor:
+        if repeatable_read:
+            cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        manifest['months'] = [p.start.isoformat() for p in list_partitions() if p.start is not None]
+        for model in DATA_MODELS:
+            table, columns = model._meta.db_table, snapshot_columns(model)
+            started = time.monotonic()
+            with open(os.path.join(directory, f'{table}.copy'), 'wb') as output:
+                cursor.copy_expert(
+                    f"COPY (SELECT {', '.join(columns)} FROM {table}) TO STDOUT WITH (FORMAT binary)", output
+                )
+            manifest['tables'].append({
+                'table': table,
+                'columns': columns,
+                'rows': cursor.rowcount,
+                'bytes': os.path.getsize(os.path.join(directory, f'{table}.copy')),
+                'seconds': round(time.monotonic() - started, 3),
+            })
+    with open(os.path.join(directory, MANIFEST), 'w') as output:
+        json.dump(manifest, output, indent=2)
+    return manifest
+
+
+def read_manifest(directory):
+    # The snapshot's manifest, checked against the current schema. Raises ValueError.
+    try:
+        with open(os.path.join(directory, MANIFEST)) as source:
+            manifest = json.load(source)
+    except FileNotFoundError:
+        raise ValueError(f'{directory} has no {MANIFEST}; not a snapshot directory')
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')!r}")
+    expected = {model._meta.db_table: snapshot_columns(model) for model in DATA_MODELS}
+    found = {entry['table']: entry['columns'] for entry in manifest['tables']}
+    if found != expected:
+        changed = sorted(table for table in expected.keys() | found.keys() if expected.get(table) != found.get(table))
+        raise ValueError(
+            f"Snapshot columns don't match the current schema ({', '.join(changed)}); "
+            f"it was taken at another migration state"
+        )
+    return manifest
+
+
+@transaction.atomic
+def restore_snapshot(directory, manifest):
+    # Replace the DATA_MODELS tables with the snapshot in `directory`. All in one transaction:
+    # on any error the data (and the trigger state) is left as it was.
+    truncate_data()
+    existing = {p.start for p in list_partitions()}
+    for month in map(parse_datetime, manifest['months']):
+        if month not in existing:
+            create_partition(month)
+
+    # The snapshot already holds search vectors and rollups, so user triggers are switched
+    # off while loading (foreign key checks still run). Partitions are named explicitly
+    # because older PostgreSQL versions don't recurse DISABLE TRIGGER into them.
+    tables = [model._meta.db_table for model in DATA_MODELS]
+    tables += [p.name for p in list_partitions()]
+    with connection.cursor() as cursor:
+        for table in tables:
+            cursor.execute(f'ALTER TABLE {table} DISABLE TRIGGER USER')
+        for entry in manifest['tables']:
+            started = time.monotonic()
+            with open(os.path.join(directory, f"{entry['table']}.copy"), 'rb') as source:
+                cursor.copy_expert(
+                    f"COPY {entry['table']} ({', '.join(entry['columns'])}) FROM STDIN WITH (FORMAT binary)", source
+                )
+            entry['seconds'] = round(time.monotonic() - started, 3)
+        # Run the deferred foreign key checks now: ALTER TABLE refuses tables with pending ones
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        for table in tables:
+            cursor.execute(f'ALTER TABLE {table} ENABLE TRIGGER USER')
+        for sql in connection.ops.sequence_reset_sql(no_style(), DATA_MODELS):
+            cursor.execute(sql)
+        cursor.execute(f"ANALYZE {', '.join(tables[:len(DATA_MODELS)])}")
+    return manifest
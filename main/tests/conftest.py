@@ -0,0 +1,97 @@
+import pytest
+from contextlib import contextmanager
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+# Shared fixtures for the main test suite.
+#
+# assert_max_queries is the query-budget guard: wrap any request or code path in it
+# and the test fails if more than `budget` SQL queries run inside the block.
+# The captured queries are printed on failure so the offending N+1 is easy to spot.
+#
+# Tests run under the default settings (no CACHE_URL); cache_setup runs a test under
+# both cache configurations and shared_cache_settings under the CACHE_URL one only.
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # Caches outlive each test's database rollback, so every test starts with empty ones
+    # (database caches are rolled back with the test)
+    for cache in caches.all():
+        if not isinstance(cache, DatabaseCache):
+            cache.clear()
+
+
+def use_shared_cache(settings):
+    # The cache-backed sessions and versions a deployment with CACHE_URL gets. Tests run in
+    # one process, where the in-memory 'shared' stand-in really is shared.
+    settings.SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    settings.CACHE_VERSION_ALIAS = 'shared'
+
+
+@pytest.fixture
+def shared_cache_settings(settings):
+    use_shared_cache(settings)
+
+
+@pytest.fixture(params=['default', 'shared_cache'])
+def cache_setup(request, settings):
+    # Runs a test under both deployments: the default without CACHE_URL (db sessions,
+    # version tokens in main_cache_version) and one with a shared cache backend. Request
+    # it before any logged-in client so the login uses the session engine under test.
+    if request.param == 'shared_cache':
+        use_shared_cache(settings)
+    return request.param
+
+
+@pytest.fixture
+def warm_version_tokens(settings):
+    # Version tokens are created once per deployment, which costs a few queries per token
+    # with the database version cache. Visiting `urls` creates them; the other caches are
+    # emptied again, so the next visits measure a cold cache with existing tokens. Tokens
+    # in a shared cache backend cost no queries, so there's nothing to do with one.
+    def warm(client, *urls):
+        if not isinstance(caches[settings.CACHE_VERSION_ALIAS], DatabaseCache):
+            return
+        for url in urls:
+            client.get(url)
+        for cache in caches.all():
+            if not isinstance(cache, DatabaseCache):
+                cache.clear()
+    return warm
+
+
+@pytest.fixture(autouse=True)
+def disable_session_sweeper(settings):
+    # The sweeper's occasional DELETE would land in whichever test happens to trigger it
+    settings.SESSION_SWEEP_INTERVAL = 0
+
+
+@contextmanager
+def _assert_max_queries(budget, using=connection):
+    with CaptureQueriesContext(using) as context:
+        yield context
+    executed = len(context.captured_queries)
+    if executed > budget:
+        queries = '\n'.join(
+            f'{i}. {query["sql"]}' for i, query in enumerate(context.captured_queries, start=1)
+        )
+        pytest.fail(f'{executed} queries executed, budget was {budget}:\n{queries}')
+
+
+@pytest.fixture
+def assert_max_queries():
+    # Usage:
+    #     with assert_max_queries(10):
+    #         client.get(url)
+    return _assert_max_queries
+
+
+@pytest.fixture
+def superuser_client(client, django_user_model):
+    # Logged-in superuser so every custom_admin_site view is reachable
+    user = django_user_model.objects.create_superuser(username='budgetadmin', password='budgetpass123')
+    client.force_login(user)
+    return client
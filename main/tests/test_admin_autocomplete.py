@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from main.models import Client, ClientRequest, RequestType
+
+# Tests for the client and request type autocomplete on ClientRequest forms (main/autocomplete.py):
+# - the change form renders autocomplete widgets instead of listing every client
+# - lookups return active clients whose name starts with the term, in name order
+# - repeated lookups are served from the cache until a client is saved
+
+
+def lookup(admin_client, term='', **params):
+    response = admin_client.get(reverse('admin:autocomplete'), {
+        'app_label': 'main', 'model_name': 'clientrequest', 'field_name': 'client', 'term': term, **params,
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def names(data):
+    return [result['text'].split(' | ')[1] for result in data['results']]
+
+
+def client_queries(context):
+    return [query['sql'] for query in context.captured_queries if 'FROM "main_client"' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_change_form_uses_autocomplete_widgets(admin_client):
+    request_type = RequestType.objects.create(name='Autocomplete Type')
+    Client.objects.bulk_create(Client(name=f'Unlisted {n}') for n in range(30))
+    chosen = Client.objects.create(name='Chosen Client')
+    request = ClientRequest.objects.create(client=chosen, request_type=request_type, status='Pending')
+
+    response = admin_client.get(reverse('admin:main_clientrequest_change', args=[request.pk]))
+
+    content = response.content.decode()
+    assert content.count('admin-autocomplete') >= 2
+    assert 'Chosen Client' in content
+    assert 'Unlisted' not in content
+
+
+@pytest.mark.django_db
+def test_lookup_matches_active_name_prefixes(admin_client):
+    Client.objects.bulk_create([
+        Client(name='acme Labs'), Client(name='Acme Corp'), Client(name='ACME Retired', is_active=False),
+        Client(name='Not Acme'), Client(name='Beta'),
+    ])
+
+    assert names(lookup(admin_client, 'acme')) == ['Acme Corp', 'acme Labs']
+    assert names(lookup(admin_client, 'ACME', inactive='1')) == ['Acme Corp', 'acme Labs', 'ACME Retired']
+    assert names(lookup(admin_client, '100%')) == []
+
+    Client.objects.bulk_create(Client(name=f'Paged {n:02}') for n in range(25))
+    first, second = lookup(admin_client, 'paged'), lookup(admin_client, 'paged', page='2')
+    assert first['pagination']['more'] and not second['pagination']['more']
+    assert names(first) + names(second) == [f'Paged {n:02}' for n in range(25)]
+
+    # Request types go through Django's default lookup (RequestTypeAdmin.search_fields)
+    RequestType.objects.create(name='Installation')
+    types = lookup(admin_client, 'installation', field_name='request_type')
+    assert names(types) == ['Installation']
+
+
+@pytest.mark.django_db
+def test_lookups_are_cached_until_a_client_changes(admin_client):
+    Client.objects.create(name='Cached Client')
+
+    with CaptureQueriesContext(connection) as context:
+        assert names(lookup(admin_client, 'cach')) == ['Cached Client']
+    assert len(client_queries(context)) == 1
+    with CaptureQueriesContext(connection) as context:
+        assert names(lookup(admin_client, 'CACH')) == ['Cached Client']
+    assert client_queries(context) == []
+
+    Client.objects.create(name='Cached Again')
+    assert names(lookup(admin_client, 'cach')) == ['Cached Again', 'Cached Client']
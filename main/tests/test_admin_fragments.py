@@ -0,0 +1,66 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from main.management.commands.create_limited_user_group import create_limited_users_permission_group
+
+# Tests for the per-user admin fragment cache (main/fragments.py):
+# - a warm index page only loads the session user (and the cache versions, without CACHE_URL)
+# - new admin log entries and permission changes show up on the next render
+
+
+def index_queries(client):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(reverse('admin:index'))
+    assert response.status_code == 200
+    return response, [q['sql'] for q in context.captured_queries]
+
+
+@pytest.mark.django_db
+def test_warm_index_is_close_to_zero_query(cache_setup, superuser_client):
+    index_queries(superuser_client)
+
+    _, queries = index_queries(superuser_client)
+
+    if cache_setup == 'shared_cache':
+        assert len(queries) <= 1, queries
+    else:
+        # The session and user, then one read each for the permission and admin log versions
+        assert len(queries) <= 4, queries
+        assert all('main_cache_version' in sql for sql in queries[2:]), queries
+    assert not any('django_admin_log' in sql or 'auth_permission' in sql for sql in queries)
+
+
+@pytest.mark.django_db
+def test_new_log_entry_refreshes_recent_actions(superuser_client):
+    response, _ = index_queries(superuser_client)
+    assert 'Fragment Client' not in response.content.decode()
+
+    superuser_client.post(reverse('admin:main_client_add'), {
+        'name': 'Fragment Client',
+        'email': 'fragment@example.com',
+        'is_active': 'on',
+        'clientrequest_set-TOTAL_FORMS': 0,
+        'clientrequest_set-INITIAL_FORMS': 0,
+    })
+
+    response, _ = index_queries(superuser_client)
+    assert 'Fragment Client' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_permission_change_refreshes_app_list(client, django_user_model):
+    user = django_user_model.objects.create_user(username='fragments', password='secure123', is_staff=True)
+    user.groups.add(create_limited_users_permission_group())
+    client.force_login(user)
+    client_changelist = reverse('admin:main_client_changelist')
+
+    response, _ = index_queries(client)
+    assert client_changelist in response.content.decode()
+
+    group = Group.objects.get(name='LimitedUsers')
+    group.permissions.remove(*group.permissions.filter(content_type__model='client'))
+
+    response, _ = index_queries(client)
+    assert client_changelist not in response.content.decode()
@@ -0,0 +1,102 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from main.admin import custom_admin_site
+from main.models import Client, RequestType, ClientRequest
+
+# Query-budget tests for the custom admin site.
+# The number of queries a page runs must not depend on how many rows it shows,
+# and no custom_admin_site view may exceed ADMIN_VIEW_QUERY_BUDGET, with or without
+# a shared cache (cache_setup in conftest.py).
+
+ADMIN_VIEW_QUERY_BUDGET = 15
+
+
+def create_client_requests(count):
+    # Give every request its own client and request type so a missing
+    # select_related shows up as one extra query per row
+    for i in range(count):
+        ClientRequest.objects.create(
+            client=Client.objects.create(name=f'Budget Client {i}'),
+            request_type=RequestType.objects.create(name=f'Budget Type {i}'),
+            status='Pending',
+            description=f'Budget request {i}',
+        )
+
+
+def count_queries(func):
+    with CaptureQueriesContext(connection) as context:
+        func()
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_client_request_changelist_queries_do_not_grow_with_rows(cache_setup, superuser_client, warm_version_tokens):
+    url = reverse('admin:main_clientrequest_changelist')
+    warm_version_tokens(superuser_client, url)
+
+    create_client_requests(3)
+    small_page = count_queries(lambda: superuser_client.get(url))
+
+    create_client_requests(30)
+    large_page = count_queries(lambda: superuser_client.get(url))
+
+    assert small_page == large_page
+
+
+@pytest.mark.django_db
+def test_client_request_change_view_within_budget(cache_setup, superuser_client, assert_max_queries, warm_version_tokens):
+    create_client_requests(1)
+    obj = ClientRequest.objects.get()
+    url = reverse('admin:main_clientrequest_change', args=[obj.pk])
+    warm_version_tokens(superuser_client, url)
+
+    with assert_max_queries(ADMIN_VIEW_QUERY_BUDGET):
+        response = superuser_client.get(url)
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('action', ['mark_as_completed', 'delete_selected'])
+def test_client_request_actions_do_not_grow_with_rows(cache_setup, superuser_client, action, warm_version_tokens):
+    url = reverse('admin:main_clientrequest_changelist')
+    warm_version_tokens(superuser_client, url)
+
+    def run_action():
+        selected = list(ClientRequest.objects.values_list('pk', flat=True))
+        # delete_selected renders a confirmation page listing every object
+        response = superuser_client.post(url, {'action': action, '_selected_action': selected})
+        assert response.status_code in (200, 302)
+
+    create_client_requests(3)
+    small_batch = count_queries(run_action)
+
+    ClientRequest.objects.all().delete()
+    create_client_requests(30)
+    large_batch = count_queries(run_action)
+
+    assert small_batch == large_batch
+
+
+@pytest.mark.django_db
+def test_every_admin_view_within_budget(cache_setup, superuser_client, assert_max_queries, warm_version_tokens):
+    # Any view registered on custom_admin_site counts, so new ModelAdmins are covered automatically
+    create_client_requests(5)
+
+    urls = []
+    for model, model_admin in custom_admin_site._registry.items():
+        info = (model._meta.app_label, model._meta.model_name)
+        urls += [
+            reverse('admin:%s_%s_changelist' % info),
+            reverse('admin:%s_%s_add' % info),
+        ]
+        obj = model._default_manager.first()
+        if obj is not None:
+            urls.append(reverse('admin:%s_%s_change' % info, args=[obj.pk]))
+    warm_version_tokens(superuser_client, *urls)
+
+    for url in urls:
+        with assert_max_queries(ADMIN_VIEW_QUERY_BUDGET):
+            response = superuser_client.get(url)
+        assert response.status_code == 200, url
@@ -0,0 +1,80 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from main.models import Client, RequestType, ClientRequest
+from main.search import search_clients, search_client_requests
+
+# Tests for the PostgreSQL search backend behind the admin search boxes:
+# - search_vector columns are maintained by triggers (including bulk updates)
+# - fuzzy (misspelt) names, email and phone substrings match through trigram lookups
+# - request descriptions are searchable and results are ranked
+# - substring matches are served by the trigram indexes rather than table scans
+
+@pytest.fixture
+def search_data():
+    vet = Client.objects.create(name='VetPartners', email='contact@vetpartners.co.uk', contact_number='07999123456')
+    dcc = Client.objects.create(name='DCC Propane', email='dcc@site.com', contact_number='07899999')
+    seo = RequestType.objects.create(name='SEO Tech Check')
+    plugins = RequestType.objects.create(name='Plugin Updates')
+    ClientRequest.objects.create(client=vet, request_type=seo, status='Pending', description='Audit the sitemap and robots file')
+    ClientRequest.objects.create(client=dcc, request_type=plugins, status='Pending', description='Update the booking plugin')
+    return {'vet': vet, 'dcc': dcc}
+
+
+@pytest.mark.django_db
+def test_search_vector_maintained_by_trigger(search_data):
+    # queryset.update() skips save(), the trigger still refreshes the document
+    ClientRequest.objects.filter(client=search_data['dcc']).update(description='Migrate the newsletter')
+
+    results = search_client_requests(ClientRequest.objects.all(), 'newsletter')
+    assert [r.client.name for r in results] == ['DCC Propane']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('term', ['VetPartners', 'vetpartner', 'VetPartnrs', 'contact@vetpartners', '123456'])
+def test_client_search_matches_fuzzy_name_email_and_phone(search_data, term):
+    results = list(search_clients(Client.objects.all(), term))
+    assert results[0] == search_data['vet']
+
+
+@pytest.mark.django_db
+def test_client_request_search_matches_description_and_related_names(search_data):
+    by_description = search_client_requests(ClientRequest.objects.all(), 'sitemap')
+    by_type = search_client_requests(ClientRequest.objects.all(), 'plugin updates')
+    by_client = search_client_requests(ClientRequest.objects.all(), 'Propane')
+
+    assert [r.client.name for r in by_description] == ['VetPartners']
+    assert [r.client.name for r in by_type] == ['DCC Propane']
+    assert [r.client.name for r in by_client] == ['DCC Propane']
+
+
+@pytest.mark.django_db
+def test_admin_changelist_orders_search_results_by_rank(admin_client, search_data):
+    Client.objects.create(name='Vet Supplies', email='orders@vetsupplies.com')
+
+    response = admin_client.get(reverse('admin:main_client_changelist'), {'q': 'VetPartners'})
+
+    assert response.status_code == 200
+    results = list(response.context['cl'].result_list)
+    assert results[0] == search_data['vet']
+
+
+@pytest.mark.django_db
+def test_substring_matches_use_trigram_indexes(search_data):
+    # With seq scans priced out, any lookup the trigram indexes can't serve shows up as a Seq Scan
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')
+    clients = search_clients(Client.objects.all(), 'vetpart').explain()
+    requests = search_client_requests(ClientRequest.objects.all(), 'plugin').explain()
+
+    assert 'Seq Scan' not in clients
+    assert 'Seq Scan on main_client ' not in requests and 'Seq Scan on main_requesttype' not in requests
+    for index in ('client_name_trgm_idx', 'client_email_trgm_idx', 'client_phone_trgm_idx'):
+        assert index in clients
+    assert 'client_name_trgm_idx' in requests and 'requesttype_name_trgm_idx' in requests
+
+
+@pytest.mark.django_db
+def test_substring_search_escapes_wildcards(search_data):
+    assert list(search_clients(Client.objects.all(), '%')) == []
+    assert list(search_clients(Client.objects.all(), '0789_999')) == []
@@ -0,0 +1,69 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from main.views import AccountDisabledView, CustomLoginView, HomeView, RegisterView
+
+# Tests for the async public views, driven through Django's ASGI handler (AsyncClient)
+# the way uvicorn workers serve them.
+
+
+def asgi(method, *args, **kwargs):
+    # Run an AsyncClient request from a sync test
+    async def request():
+        return await method(*args, **kwargs)
+    return async_to_sync(request)()
+
+
+@pytest.mark.parametrize('view', [HomeView, CustomLoginView, RegisterView, AccountDisabledView])
+def test_public_views_are_async(view):
+    assert iscoroutinefunction(view.as_view())
+
+
+@pytest.mark.django_db
+def test_home_renders_over_asgi(async_client):
+    response = asgi(async_client.get, reverse('home'))
+
+    assert response.status_code == 200
+    assert b"<h1>Welcome to the CRMS!" in response.content
+
+
+@pytest.mark.django_db
+def test_login_over_asgi(async_client):
+    User.objects.create_user(username='asyncstaff', password='asyncpass123', is_staff=True)
+
+    response = asgi(
+        async_client.post, reverse('login'), {'username': 'asyncstaff', 'password': 'asyncpass123'}
+    )
+
+    assert response.status_code == 302
+    assert response.url == reverse('custom_admin:index')
+    assert 'no-cache' in response['Cache-Control']
+    # The session now belongs to the user, so the login page redirects
+    assert asgi(async_client.get, reverse('login')).status_code == 302
+
+
+@pytest.mark.django_db
+def test_register_over_asgi(async_client):
+    response = asgi(async_client.post, reverse('register'), {
+        'username': 'asyncuser',
+        'email': 'asyncuser@example.com',
+        'password': 'strongpassword123',
+        'password_confirm': 'strongpassword123',
+    })
+
+    assert response.status_code == 200
+    user = User.objects.get(username='asyncuser')
+    assert user.is_staff and user.check_password('strongpassword123')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_concurrency_command(live_server):
+    out = StringIO()
+    call_command(
+        'benchmark_concurrency', f'{live_server.url}/login/', '--requests', '10', '--concurrency', '5', stdout=out
+    )
+
+    assert '10 ok, 0 failed' in out.getvalue()
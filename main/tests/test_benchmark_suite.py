@@ -0,0 +1,57 @@
+import json
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from main.management.commands.benchmark_suite import PATHS, compare, parse_size
+from main.models import ClientRequest
+
+# Tests for the benchmark suite (benchmark_suite):
+# - every path is measured on a seeded fixture, which is snapshotted and reused
+# - results are written as JSON and regressions against a baseline fail the run
+
+
+def test_parse_size_and_compare():
+    assert [parse_size(value) for value in ('10k', '1M', '2500')] == [10000, 1000000, 2500]
+    with pytest.raises(CommandError):
+        parse_size('lots')
+
+    baseline = {'100': {'changelist': {'p95': 100, 'queries': 5}, 'login': {'p95': 2, 'queries': 9}}}
+    results = {'100': {
+        'changelist': {'p95': 124, 'queries': 6},
+        'login': {'p95': 6, 'queries': 9},  # 3x slower, but under --min-ms
+        'register': {'p95': 500, 'queries': 50},  # not in the baseline
+    }}
+    assert compare(results, baseline, threshold=0.25, min_ms=5) == ['100 rows, changelist: 5 -> 6 queries']
+    results['100']['changelist']['p95'] = 126
+    assert len(compare(results, baseline, threshold=0.25, min_ms=5)) == 2
+
+
+@pytest.mark.django_db
+def test_benchmark_suite_writes_results_and_checks_baseline(tmp_path):
+    options = {
+        'sizes': '300', 'requests': 2, 'warmup': 0, 'yes': True,
+        'fixtures_dir': str(tmp_path / 'fixtures'), 'output': str(tmp_path / 'results.json'),
+    }
+    out = StringIO()
+    call_command('benchmark_suite', stdout=out, **options)
+
+    assert '300 rows: fixture seeded' in out.getvalue()
+    assert ClientRequest.objects.count() == 300
+    report = json.loads((tmp_path / 'results.json').read_text())
+    assert set(report['results']['300']) == set(PATHS)
+    for result in report['results']['300'].values():
+        assert result['samples'] == 2 and result['p50'] <= result['p95'] <= result['max']
+    assert report['results']['300']['admin client change view (largest client)']['queries'] > 0
+
+    # Second run restores the snapshot and compares against the first
+    report['results']['300']['admin status action']['queries'] -= 1
+    (tmp_path / 'baseline.json').write_text(json.dumps(report))
+    out = StringIO()
+    with pytest.raises(CommandError, match='1 regressions'):
+        call_command(
+            'benchmark_suite', stdout=out, baseline=str(tmp_path / 'baseline.json'), threshold=100,
+            path=['admin status action'], **options,
+        )
+    assert '300 rows: fixture restored' in out.getvalue()
+    assert 'regression: 300 rows, admin status action' in out.getvalue()
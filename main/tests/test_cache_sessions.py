@@ -0,0 +1,116 @@
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.cache.backends.db import DatabaseCache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from main import sessions
+from mysite import settings as mysite_settings
+from main.cache import bump_cache_version, cache_versions
+from main.sessions import sweep_expired_sessions, sweep_sessions_after_request
+
+# Tests for the cache tier (main/cache.py) and session handling (main/sessions.py):
+# - the default cache reads through a local layer to the shared backend
+# - cached_db sessions keep django_session out of authenticated admin requests
+# - without CACHE_URL, sessions and cache versions stay in the database
+# - the sweeper deletes expired sessions in batches, once per interval
+
+
+def test_tiered_cache_reads_through_and_fills_local_layer():
+    default, local, shared = caches['default'], caches['local'], caches['shared']
+
+    shared.set('tier-key', 'shared value')
+    assert local.get('tier-key') is None
+    assert default.get('tier-key') == 'shared value'
+    assert local.get('tier-key') == 'shared value'
+
+    default.set('tier-key', 'new value')
+    assert shared.get('tier-key') == 'new value'
+    assert default.get_many(['tier-key', 'missing']) == {'tier-key': 'new value'}
+
+    default.delete('tier-key')
+    assert local.get('tier-key') is None and shared.get('tier-key') is None
+
+
+def test_tiered_cache_caps_local_copies():
+    default = caches['default']
+    assert default._local_timeout(None) == default.local_timeout
+    assert default._local_timeout(1) == 1
+
+
+@pytest.mark.django_db
+def test_cached_db_sessions_skip_the_session_table(shared_cache_settings, superuser_client, settings):
+    assert settings.SESSION_ENGINE == 'django.contrib.sessions.backends.cached_db'
+    superuser_client.get(reverse('admin:index'))
+
+    with CaptureQueriesContext(connection) as context:
+        assert superuser_client.get(reverse('admin:index')).status_code == 200
+    assert not any('django_session' in q['sql'] for q in context.captured_queries)
+
+
+def test_sessions_and_versions_stay_in_the_database_without_a_shared_cache():
+    # CACHE_URL is unset here, so 'shared' is a per-process stand-in
+    assert mysite_settings.SESSION_ENGINE == 'django.contrib.sessions.backends.db'
+    assert mysite_settings.CACHE_VERSION_ALIAS == 'versions'
+    assert isinstance(caches['versions'], DatabaseCache)
+
+
+@pytest.mark.django_db
+def test_cache_versions_are_shared_through_the_database(settings):
+    settings.CACHE_VERSION_ALIAS = 'versions'
+    version = cache_versions('shared-test')[0]
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM main_cache_version WHERE cache_key LIKE '%%version:shared-test'")
+        assert cursor.fetchone()[0] == 1
+
+    bump_cache_version('shared-test')
+    assert cache_versions('shared-test')[0] != version
+
+
+def create_sessions(count, expired):
+    expire_date = timezone.now() + (timedelta(days=-1) if expired else timedelta(days=1))
+    Session.objects.bulk_create(
+        Session(session_key=f'{"old" if expired else "new"}{i:037d}', session_data='', expire_date=expire_date)
+        for i in range(count)
+    )
+
+
+@pytest.mark.django_db
+def test_sweeper_deletes_expired_sessions_in_batches():
+    create_sessions(5, expired=True)
+    create_sessions(2, expired=False)
+
+    assert sweep_expired_sessions(batch_size=3) == 3
+    assert sweep_expired_sessions(batch_size=3) == 2
+    assert sweep_expired_sessions(batch_size=3) == 0
+    assert Session.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_sweeper_runs_once_per_interval(settings, monkeypatch):
+    settings.SESSION_SWEEP_INTERVAL = 600
+    monkeypatch.setattr(sessions, '_next_sweep', 0.0)
+    create_sessions(2, expired=True)
+
+    sweep_sessions_after_request(sender=None)
+    assert not Session.objects.exists()
+
+    # A second worker inside the same interval loses the shared lock
+    monkeypatch.setattr(sessions, '_next_sweep', 0.0)
+    create_sessions(1, expired=True)
+    sweep_sessions_after_request(sender=None)
+    assert Session.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_benchmark_admin_sessions_command():
+    out = StringIO()
+    call_command('benchmark_admin_sessions', '--requests', '2', '--store', 'db', '--store', 'cached_db', stdout=out)
+
+    assert 'cached_db: p50' in out.getvalue()
+    assert not Session.objects.exists()
@@ -0,0 +1,129 @@
+import threading
+import psycopg2
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from main.db.pooled.base import DatabaseWrapper
+from main.db.pooled.pool import ConnectionPool, PoolTimeout
+from main.models import Client, RequestType
+
+# Tests for the pooled PostgreSQL backend (main/db/pooled):
+# - the pool never opens more than max_size connections and times out when exhausted
+# - released connections are rolled back, and dead ones are replaced
+# - Django connections from many threads share the bounded pool
+# - server-side cursors are only read inside a transaction, as transaction poolers require
+
+
+@pytest.fixture
+def make_pool(db):
+    params = connection.get_connection_params()
+    pools = []
+
+    def make(**options):
+        pool = ConnectionPool(lambda: psycopg2.connect(**params), **options)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def backend_pid(conn):
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+def test_pool_is_bounded_and_reuses_released_connections(make_pool):
+    pool = make_pool(max_size=2, timeout=0.1)
+    first, second = pool.acquire(), pool.acquire()
+
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+
+    pid = backend_pid(first)
+    assert backend_pid(second) != pid
+    pool.release(first)
+    assert backend_pid(pool.acquire()) == pid
+    assert pool.stats() == {'size': 2, 'idle': 0, 'borrowed': 2}
+
+    pool.release(second)
+    assert pool.stats() == {'size': 2, 'idle': 1, 'borrowed': 1}
+
+
+def test_released_transactions_are_rolled_back_and_dead_connections_replaced(make_pool):
+    pool = make_pool(max_size=1, check_interval=0)
+    conn = pool.acquire()
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT 1')  # opens a transaction (autocommit is off)
+    pool.release(conn)
+    assert conn.info.transaction_status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    # The server ends the idle connection; the pre-ping notices and a new one is opened
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_terminate_backend(%s)', [backend_pid(conn)])
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert backend_pid(replacement)
+    assert pool.stats()['size'] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_threads_share_a_bounded_pool():
+    settings_dict = {**connection.settings_dict, 'ENGINE': 'main.db.pooled', 'CONN_MAX_AGE': 0}
+    settings_dict['OPTIONS'] = {**settings_dict['OPTIONS'], 'pool': {'max_size': 2, 'timeout': 5}}
+    pids = set()
+    lock = threading.Lock()
+
+    def request():
+        wrapper = DatabaseWrapper(settings_dict, alias='default')
+        for _ in range(5):
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                with lock:
+                    pids.add(cursor.fetchone()[0])
+            wrapper.close()
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    pool = DatabaseWrapper(settings_dict, alias='default').pool
+    assert len(pids) <= 2
+    assert pool.stats()['borrowed'] == 0
+    pool.close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_connections_command_reports_connection_counts():
+    out = StringIO()
+    call_command('benchmark_connections', threads=2, requests=2, stdout=out)
+
+    output = out.getvalue()
+    assert '4 requests' in output and 'statuses {200: 4}' in output
+    assert 'PostgreSQL connections: peak' in output
+
+
+@pytest.mark.django_db(transaction=True)
+def test_server_side_cursors_run_inside_transactions(tmp_path):
+    Client.objects.create(name='Cursor Client')
+    RequestType.objects.create(name='Cursor Type')
+    source = tmp_path / 'tickets.jsonl'
+    source.write_text('{"client": "Cursor Client", "request_type": "Cursor Type"}\n')
+    named = []
+
+    def record(execute, sql, params, many, context):
+        if context['cursor'].cursor.name is not None:
+            named.append((sql, connection.in_atomic_block))
+        return execute(sql, params, many)
+
+    with connection.execute_wrapper(record):
+        call_command('import_requests', str(source), stdout=StringIO())
+        call_command('export_data', 'clientrequests', '-o', str(tmp_path / 'out.csv'), stderr=StringIO())
+
+    assert len(named) >= 3  # clients, request types, exported rows
+    assert all(in_transaction for _, in_transaction in named)
@@ -0,0 +1,40 @@
+import pytest
+from django.core.management import call_command
+from io import StringIO
+from main.management.commands.explain_admin_queries import explain_queries
+from main.models import Client, RequestType, ClientRequest
+
+# Checks that the ClientRequest indexes match the admin's query shapes.
+# Sequential scans are disabled so the planner reports which index *can* serve
+# each query, regardless of how few rows the test database holds.
+
+@pytest.fixture
+def client_requests():
+    client = Client.objects.create(name='Explain Client')
+    request_type = RequestType.objects.create(name='Explain Type')
+    for status in ['Pending', 'In Progress', 'Completed']:
+        ClientRequest.objects.create(client=client, request_type=request_type, status=status)
+
+
+@pytest.mark.django_db
+def test_every_canonical_admin_query_uses_an_index(client_requests):
+    results = explain_queries(no_seqscan=True)
+
+    for label, summary in results.items():
+        assert not summary['seq_scan'], f"'{label}' fell back to a sequential scan"
+
+
+@pytest.mark.django_db
+def test_open_requests_use_partial_index(client_requests):
+    results = explain_queries(no_seqscan=True)
+
+    assert 'clientreq_open_created_idx' in results['open requests']['indexes']
+    assert 'clientreq_status_created_idx' in results['changelist filtered by status']['indexes']
+
+
+@pytest.mark.django_db
+def test_explain_admin_queries_command_reports(client_requests):
+    out = StringIO()
+    call_command('explain_admin_queries', '--no-seqscan', stdout=out)
+
+    assert 'queries use an index' in out.getvalue()
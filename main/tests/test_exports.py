@@ -0,0 +1,89 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.urls import reverse
+from main import exports
+from main.models import Client, RequestType, ClientRequest
+
+# Tests for the streaming exports:
+# - admin actions on ClientRequest and Client return StreamingHttpResponse downloads
+# - related names are joined in, gzip output decompresses to the same rows
+# - under ASGI the download is an async iterator, sent chunk by chunk rather than buffered
+# - export_data writes the same formats from the command line
+
+@pytest.fixture
+def export_data():
+    client = Client.objects.create(name='VetPartners', email='vet@example.com')
+    request_type = RequestType.objects.create(name='SEO Tech Check')
+    for i in range(3):
+        ClientRequest.objects.create(client=client, request_type=request_type, status='Pending', description=f'Export {i}')
+
+
+def post_action(admin_client, url, action, model):
+    return admin_client.post(url, {
+        'action': action,
+        '_selected_action': list(model.objects.values_list('pk', flat=True)),
+    })
+
+
+@pytest.mark.django_db
+def test_client_request_csv_export_action(admin_client, export_data):
+    response = post_action(admin_client, reverse('admin:main_clientrequest_changelist'), 'export_as_csv', ClientRequest)
+
+    assert response.streaming
+    assert 'attachment; filename="clientrequest-' in response['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+    assert len(rows) == 3
+    assert {row['client'] for row in rows} == {'VetPartners'}
+    assert {row['request_type'] for row in rows} == {'SEO Tech Check'}
+
+
+@pytest.mark.django_db
+def test_export_action_streams_asynchronously_over_asgi(async_client, admin_user, export_data, monkeypatch):
+    monkeypatch.setattr(exports, 'FLUSH_BYTES', 1)
+    async_client.force_login(admin_user)
+    url = reverse('admin:main_clientrequest_changelist')
+    selected = list(ClientRequest.objects.values_list('pk', flat=True))
+
+    async def export():
+        response = await async_client.post(url, {'action': 'export_as_csv', '_selected_action': selected})
+        return response, [chunk async for chunk in response.streaming_content]
+    response, chunks = async_to_sync(export)()
+
+    assert response.is_async
+    assert len(chunks) >= 4  # the header and each row are sent as they're encoded
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+    assert {row['description'] for row in rows} == {'Export 0', 'Export 1', 'Export 2'}
+
+
+@pytest.mark.django_db
+def test_client_jsonl_gzip_export_action(admin_client, export_data):
+    response = post_action(admin_client, reverse('admin:main_client_changelist'), 'export_as_jsonl_gz', Client)
+
+    assert response['Content-Type'] == 'application/gzip'
+    content = gzip.decompress(b''.join(response.streaming_content)).decode()
+    records = [json.loads(line) for line in content.splitlines()]
+    assert records == [{
+        'id': records[0]['id'],
+        'name': 'VetPartners',
+        'email': 'vet@example.com',
+        'contact_number': None,
+        'company_url': None,
+        'created_at': records[0]['created_at'],
+        'is_active': True,
+    }]
+
+
+@pytest.mark.django_db
+def test_export_data_command_filters_and_gzips(tmp_path, export_data):
+    ClientRequest.objects.filter(description='Export 0').update(status='Completed')
+    output = tmp_path / 'requests.csv.gz'
+
+    call_command('export_data', 'clientrequests', '--gzip', '-o', str(output), '--filter', 'status=Pending', stderr=io.StringIO())
+
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(output.read_bytes()).decode())))
+    assert sorted(row['description'] for row in rows) == ['Export 1', 'Export 2']
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from main.models import Client, ClientRequest, RequestType
+
+# Tests for the cached filter counts on the ClientRequest and Client changelists (main/facets.py):
+# - every option shows the rows it would list, under the search and the other filters
+# - each facet is one aggregate query, cached across paging, sorting and its own selection
+# - saves and the admin status actions invalidate the cached counts
+# - large-table changelists show planner estimates instead of counting
+
+
+def make_requests():
+    request_type = RequestType.objects.create(name='Facet Type')
+    printers = Client.objects.create(name='Printer Co')
+    scanners = Client.objects.create(name='Scanner Co', is_active=False)
+    statuses = ['Pending', 'Pending', 'In Progress', 'Completed', None]
+    for client in (printers, scanners):
+        for status in statuses:
+            ClientRequest.objects.create(client=client, request_type=request_type, status=status)
+
+
+def facets(response):
+    # {filter title: {option: count}} as rendered in the sidebar
+    return {
+        str(spec.title): {str(choice['display']): choice['count'] for choice in spec.facet_choices}
+        for spec in response.context['cl'].filter_specs
+    }
+
+
+def facet_queries(context):
+    return [query['sql'] for query in context.captured_queries if 'COUNT(' in query['sql'] and 'FILTER' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_counts_follow_search_and_other_filters(admin_client):
+    make_requests()
+    url = reverse('admin:main_clientrequest_changelist')
+
+    response = admin_client.get(url)
+    assert facets(response)['status'] == {'All': 10, 'Pending': 4, 'In Progress': 2, 'Completed': 2}
+    assert facets(response)['created at']['Today'] == 10
+    assert 'facet-count">(4)' in response.content.decode()
+
+    # A facet's own selection doesn't change its counts; the other facets follow it
+    response = admin_client.get(url, {'status__exact': 'Pending', 'q': 'Printer'})
+    assert facets(response)['status'] == {'All': 5, 'Pending': 2, 'In Progress': 1, 'Completed': 1}
+    assert facets(response)['created at']['Any date'] == 2
+
+    clients = admin_client.get(reverse('admin:main_client_changelist'))
+    assert facets(clients)['is active'] == {'All': 2, 'Yes': 1, 'No': 1}
+
+
+@pytest.mark.django_db
+def test_counts_are_cached_until_requests_change(admin_client):
+    make_requests()
+    url = reverse('admin:main_clientrequest_changelist')
+
+    with CaptureQueriesContext(connection) as context:
+        admin_client.get(url, {'status__exact': 'Pending', 'created_at__gte': '2000-01-01T00:00:00+00:00'}).content
+    assert len(facet_queries(context)) == 2
+    with CaptureQueriesContext(connection) as context:
+        admin_client.get(url, {'created_at__gte': '2000-01-01T00:00:00+00:00', 'status__exact': 'Completed', 'o': '3'}).content
+    # Only the date facet depends on the status selection
+    assert len(facet_queries(context)) == 1
+
+    pending = ClientRequest.objects.filter(status='Pending')
+    admin_client.post(url, {'action': 'mark_as_completed', '_selected_action': [r.pk for r in pending]})
+    assert facets(admin_client.get(url))['status']['Completed'] == 6
+
+    ClientRequest.objects.filter(status='Completed').first().delete()
+    assert facets(admin_client.get(url))['status']['Completed'] == 5
+
+
+@pytest.mark.django_db
+def test_large_tables_show_estimates(admin_client, settings, warm_version_tokens):
+    make_requests()
+    settings.ADMIN_LARGE_TABLE_THRESHOLD = 0
+    # Creating the database version tokens counts the cache table's rows
+    warm_version_tokens(admin_client, reverse('admin:main_clientrequest_changelist'))
+
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(reverse('admin:main_clientrequest_changelist'))
+        counts = facets(response)['status']
+    assert not any('COUNT(' in query['sql'].upper() for query in context.captured_queries)
+    assert set(counts) == {'All', 'Pending', 'In Progress', 'Completed'}
+    assert 'facet-count">(~' in response.content.decode()
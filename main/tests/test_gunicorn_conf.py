@@ -0,0 +1,73 @@
+import importlib
+import pytest
+from django.db import connection
+from django.template import engines
+
+# Tests for the production gunicorn profile (mysite/gunicorn_conf.py)
+
+
+def load_conf(monkeypatch, **env):
+    for name in ['SERVER_MODE', 'GUNICORN_WORKERS', 'WEB_CONCURRENCY', 'GUNICORN_THREADS', 'GUNICORN_TIMEOUT', 'DB_STATEMENT_TIMEOUT']:
+        monkeypatch.delenv(name, raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    from mysite import gunicorn_conf
+    return importlib.reload(gunicorn_conf)
+
+
+def test_worker_counts_follow_cpu_count_and_recycling_is_jittered(monkeypatch):
+    conf = load_conf(monkeypatch)
+
+    assert conf.workers == conf.available_cpus() * 2 + 1
+    assert conf.worker_class == 'gthread'
+    assert conf.threads == 4
+    assert conf.preload_app is True
+    assert conf.max_requests == 1000 and conf.max_requests_jitter == 100
+    # Statements are cancelled before gunicorn would kill the worker
+    assert int(conf.os.environ['DB_STATEMENT_TIMEOUT']) < conf.timeout * 1000
+
+
+@pytest.mark.parametrize('files, cpus', [
+    ({}, 8),
+    ({'cpu.max': 'max 100000'}, 8),
+    ({'cpu.max': '150000 100000'}, 2),
+    ({'cpu.max': '50000 100000'}, 1),
+    ({'cpu/cpu.cfs_quota_us': '300000', 'cpu/cpu.cfs_period_us': '100000'}, 3),
+    ({'cpu/cpu.cfs_quota_us': '-1', 'cpu/cpu.cfs_period_us': '100000'}, 8),
+])
+def test_available_cpus_follow_affinity_and_cgroup_quota(monkeypatch, tmp_path, files, cpus):
+    conf = load_conf(monkeypatch)
+    monkeypatch.setattr(conf.os, 'sched_getaffinity', lambda pid: set(range(8)))
+    for name, content in files.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(content + '\n')
+
+    assert conf.available_cpus(tmp_path) == cpus
+
+
+def test_environment_overrides_and_asgi_worker(monkeypatch):
+    conf = load_conf(monkeypatch, SERVER_MODE='asgi', GUNICORN_WORKERS='2', GUNICORN_TIMEOUT='60')
+
+    assert conf.workers == 2
+    assert conf.worker_class == 'uvicorn_worker.UvicornWorker'
+    assert conf.os.environ['DB_STATEMENT_TIMEOUT'] == '55000'
+
+    assert load_conf(monkeypatch, WEB_CONCURRENCY='3').workers == 3
+
+
+# Warm-up opens every configured database, replicas included
+@pytest.mark.django_db(databases='__all__')
+def test_warm_up_compiles_templates_and_closes_connections(monkeypatch):
+    conf = load_conf(monkeypatch)
+    # Closing the connection would break the test transaction, so only check it's called
+    closed = []
+    monkeypatch.setattr('django.db.connections.close_all', lambda: closed.append(True))
+
+    compiled = conf.warm_up()
+
+    assert compiled > 50  # the project's templates and the admin's
+    assert closed == [True]
+    assert connection.connection is not None
+    # The cached loader keeps the compiled templates for every worker forked afterwards
+    loader = engines['django'].engine.template_loaders[0]
+    assert 'admin/dashboard_index.html' in loader.get_template_cache
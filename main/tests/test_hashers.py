@@ -0,0 +1,68 @@
+import pytest
+from io import StringIO
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from main.hashers import TunedArgon2PasswordHasher
+
+# Tests for the tuned password hashers (main/hashers.py):
+# - new passwords use PASSWORD_HASHER with the configured costs
+# - logging in through CustomLoginView upgrades older hashes and costs
+# - benchmark_hashers reports hash times against the budget
+
+
+def login(client, username, password):
+    return client.post(reverse('login'), {'username': username, 'password': password})
+
+
+@pytest.mark.django_db
+def test_registration_uses_tuned_argon2(client):
+    client.post(reverse('register'), {
+        'username': 'argonuser',
+        'email': 'argon@example.com',
+        'password': 'strongpassword123',
+        'password_confirm': 'strongpassword123',
+    })
+
+    assert User.objects.get(username='argonuser').password.startswith('argon2$argon2id$v=19$m=19456,t=2,p=1$')
+
+
+@pytest.mark.django_db
+def test_login_upgrades_pbkdf2_hash(client):
+    User.objects.create(
+        username='legacy', password=make_password('legacypass123', hasher='pbkdf2_sha256'), is_staff=True
+    )
+
+    response = login(client, 'legacy', 'legacypass123')
+
+    assert response.status_code == 302
+    user = User.objects.get(username='legacy')
+    assert user.password.startswith('argon2$')
+    assert user.check_password('legacypass123')
+
+
+@pytest.mark.django_db
+def test_login_upgrades_hash_when_costs_change(client, monkeypatch):
+    User.objects.create_user(username='tuned', password='tunedpass123', is_staff=True)
+    monkeypatch.setattr(TunedArgon2PasswordHasher, 'time_cost', 3)
+
+    assert login(client, 'tuned', 'tunedpass123').status_code == 302
+    assert ',t=3,' in User.objects.get(username='tuned').password
+
+
+def test_benchmark_hashers_reports_candidates():
+    out = StringIO()
+    call_command(
+        'benchmark_hashers', algorithm=['pbkdf2'], candidate=['pbkdf2:iterations=1000'], rounds=1, budget_ms=200,
+        stdout=out,
+    )
+
+    output = out.getvalue()
+    assert 'iterations=600000: median' in output and '← current settings' in output
+    assert 'iterations=1000: median' in output
+    assert '(over budget)' in output  # 1,000,000 iterations
+
+    with pytest.raises(CommandError):
+        call_command('benchmark_hashers', candidate=['argon2:rounds=3'])
@@ -0,0 +1,118 @@
+import json
+import pytest
+from django.core.management import call_command
+from io import StringIO
+from main.management.commands.import_requests import Command
+from main.models import Client, RequestType, ClientRequest, RequestImportCheckpoint
+
+# Tests for `manage.py import_requests`:
+# - CSV and JSONL load through both COPY and bulk_create
+# - names resolve to existing rows, unknown names are rejected unless --create-missing
+# - --resume skips the records a previous run committed
+# - malformed JSONL lines and wrongly typed fields are rejected instead of aborting the import
+# - clients and request types created by a failed batch are rolled back with it
+
+CSV_SOURCE = (
+    "client,request_type,status,description,created_at\n"
+    "VetPartners,SEO Tech Check,Pending,Audit the sitemap,2023-01-05T10:00:00\n"
+    "VetPartners,SEO Tech Check,Completed,Fix redirects,2023-01-06T10:00:00\n"
+    "Unknown Ltd,SEO Tech Check,Pending,Should be rejected,\n"
+    "VetPartners,SEO Tech Check,Closed,Invalid status,\n"
+)
+
+
+@pytest.fixture
+def names():
+    Client.objects.create(name='VetPartners')
+    RequestType.objects.create(name='SEO Tech Check')
+
+
+def run_import(tmp_path, content, filename, *args, stderr=None):
+    source = tmp_path / filename
+    source.write_text(content)
+    out = StringIO()
+    call_command('import_requests', str(source), *args, stdout=out, stderr=stderr or StringIO())
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('method', ['copy', 'bulk'])
+def test_import_csv_rejects_unknown_names_and_statuses(tmp_path, names, method):
+    output = run_import(tmp_path, CSV_SOURCE, 'tickets.csv', '--method', method)
+
+    assert 'Imported 2 requests, rejected 2 records' in output
+    assert 'rows/s' in output
+    imported = ClientRequest.objects.order_by('created_at')
+    assert [r.description for r in imported] == ['Audit the sitemap', 'Fix redirects']
+    assert imported[0].created_at.isoformat() == '2023-01-05T10:00:00+00:00'
+    # The search trigger also runs for imported rows
+    assert ClientRequest.objects.filter(search_vector='sitemap').count() == 1
+
+
+@pytest.mark.django_db
+def test_import_jsonl_with_create_missing(tmp_path):
+    lines = [
+        {'client': 'New Client', 'request_type': 'Plugin Updates', 'status': 'In Progress'},
+        {'client': 'New Client', 'request_type': 'Plugin Updates', 'description': 'No status'},
+    ]
+    content = '\n'.join(json.dumps(line) for line in lines)
+    run_import(tmp_path, content, 'tickets.jsonl', '--create-missing')
+
+    assert Client.objects.filter(name='New Client').count() == 1
+    assert ClientRequest.objects.filter(client__name='New Client').count() == 2
+
+
+@pytest.mark.django_db
+def test_import_resume_skips_committed_records(tmp_path, names):
+    rows = ''.join(f'VetPartners,SEO Tech Check,Pending,Request {i},\n' for i in range(5))
+    content = 'client,request_type,status,description,created_at\n' + rows
+    source = tmp_path / 'tickets.csv'
+
+    run_import(tmp_path, content, 'tickets.csv', '--batch-size', '2')
+    # Simulate a run that stopped after the first batch
+    ClientRequest.objects.exclude(description__in=['Request 0', 'Request 1']).delete()
+    RequestImportCheckpoint.objects.filter(name=str(source)).update(rows_committed=2)
+
+    run_import(tmp_path, content, 'tickets.csv', '--batch-size', '2', '--resume')
+
+    descriptions = sorted(ClientRequest.objects.values_list('description', flat=True))
+    assert descriptions == [f'Request {i}' for i in range(5)]
+
+
+@pytest.mark.django_db
+def test_import_rejects_malformed_jsonl_records(tmp_path, names):
+    valid = {'client': 'VetPartners', 'request_type': 'SEO Tech Check'}
+    lines = [
+        json.dumps(valid),
+        '{"client": "VetPartners", ',
+        '',
+        json.dumps(['VetPartners', 'SEO Tech Check']),
+        json.dumps({**valid, 'created_at': 1700000000}),
+        json.dumps({**valid, 'created_at': '2023-02-30T10:00:00'}),
+        json.dumps({**valid, 'client': 42}),
+        json.dumps({**valid, 'description': 'Still imported'}),
+    ]
+    errors = StringIO()
+    output = run_import(tmp_path, '\n'.join(lines), 'tickets.jsonl', stderr=errors)
+
+    assert 'Imported 2 requests, rejected 5 records' in output
+    assert 'Record 2: rejected, line 2: invalid JSON' in errors.getvalue()
+    assert 'Record 3: rejected, line 4: expected a JSON object, got list' in errors.getvalue()
+    assert 'invalid timestamp 1700000000' in errors.getvalue()
+    assert "invalid timestamp '2023-02-30T10:00:00'" in errors.getvalue()
+    assert 'client must be a string, got 42' in errors.getvalue()
+
+
+@pytest.mark.django_db
+def test_failed_batch_rolls_back_created_names(tmp_path, monkeypatch):
+    def fail(self, rows):
+        raise RuntimeError('COPY failed')
+    monkeypatch.setattr(Command, 'copy_batch', fail)
+    content = json.dumps({'client': 'Orphan Client', 'request_type': 'Orphan Type'})
+
+    with pytest.raises(RuntimeError):
+        run_import(tmp_path, content, 'tickets.jsonl', '--create-missing')
+
+    assert not Client.objects.filter(name='Orphan Client').exists()
+    assert not RequestType.objects.filter(name='Orphan Type').exists()
+    assert RequestImportCheckpoint.objects.get().rows_committed == 0
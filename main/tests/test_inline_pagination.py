@@ -0,0 +1,100 @@
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from main.models import Client, RequestType, ClientRequest
+
+# Tests for the paginated ClientRequest inline on the Client change page (main/pagination.py):
+# - only the newest page of requests is rendered, older pages follow a cursor link
+# - the request type <select> options are queried once, whatever the number of rows
+# - saving edits the rows that were shown, and the page links to the filtered changelist
+
+PREFIX = 'clientrequest_set'
+
+
+def make_client(requests):
+    client = Client.objects.create(name='Inline Client')
+    types = [RequestType.objects.get_or_create(name=f'Inline Type {n}')[0] for n in range(3)]
+    now = timezone.now()
+    ClientRequest.objects.bulk_create(
+        ClientRequest(
+            client=client, request_type=types[i % 3], status='Pending',
+            description=f'Inline request {i}', created_at=now - timedelta(minutes=i // 2),
+        )
+        for i in range(requests)
+    )
+    return client
+
+
+def shown_requests(response):
+    return response.context['inline_admin_formsets'][0].formset.get_queryset()
+
+
+@pytest.mark.django_db
+def test_inline_pages_through_requests_by_cursor(admin_client):
+    client = make_client(45)
+    url = reverse('admin:main_client_change', args=[client.pk])
+    expected = list(ClientRequest.objects.order_by('-created_at', '-pk'))
+
+    seen, next_url = [], url
+    while next_url:
+        response = admin_client.get(next_url)
+        formset = response.context['inline_admin_formsets'][0].formset
+        seen += shown_requests(response)
+        next_url = formset.older_url and url + formset.older_url
+    assert [row.pk for row in seen] == [row.pk for row in expected]
+    assert len(shown_requests(admin_client.get(url))) == 20
+    # A mangled cursor falls back to the newest page
+    assert shown_requests(admin_client.get(url, {f'{PREFIX}-after': 'garbage'}))[0].pk == expected[0].pk
+
+
+@pytest.mark.django_db
+def test_inline_queries_do_not_grow_with_requests(cache_setup, admin_client, warm_version_tokens):
+    small, large = make_client(5), make_client(60)
+    warm_version_tokens(admin_client, reverse('admin:main_client_change', args=[small.pk]))
+
+    counts = []
+    for client in (small, large):
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(reverse('admin:main_client_change', args=[client.pk]))
+        assert response.status_code == 200
+        counts.append(len(context.captured_queries))
+        assert sum('FROM "main_requesttype"' in q['sql'] for q in context.captured_queries) == 1
+
+    assert counts[0] == counts[1]
+    assert response.content.count(b'Inline Type 2</option>') == 22  # 20 rows, the extra form and the empty form template
+
+    changelist_url = response.context['inline_admin_formsets'][0].formset.changelist_url
+    assert changelist_url == reverse('admin:main_clientrequest_changelist') + f'?client__id__exact={large.pk}'
+    assert changelist_url.encode() in response.content
+    assert admin_client.get(changelist_url).context['cl'].result_count == 60
+
+
+@pytest.mark.django_db
+def test_saving_an_older_page_edits_the_submitted_rows(admin_client):
+    client = make_client(30)
+    url = reverse('admin:main_client_change', args=[client.pk])
+    page = admin_client.get(url)
+    older = shown_requests(admin_client.get(url + page.context['inline_admin_formsets'][0].formset.older_url))
+    # A request added after the page was rendered doesn't shift the submitted rows
+    ClientRequest.objects.create(client=client, request_type=older[0].request_type, status='Pending')
+
+    data = {
+        'name': client.name, 'is_active': 'on',
+        f'{PREFIX}-TOTAL_FORMS': len(older), f'{PREFIX}-INITIAL_FORMS': len(older),
+        f'{PREFIX}-MIN_NUM_FORMS': 0, f'{PREFIX}-MAX_NUM_FORMS': 1000,
+    }
+    for i, row in enumerate(older):
+        data.update({
+            f'{PREFIX}-{i}-id': row.pk, f'{PREFIX}-{i}-client': client.pk,
+            f'{PREFIX}-{i}-request_type': row.request_type_id,
+            f'{PREFIX}-{i}-status': 'Completed' if i == 0 else row.status,
+            f'{PREFIX}-{i}-description': row.description,
+        })
+    response = admin_client.post(url, data)
+
+    assert response.status_code == 302
+    assert list(ClientRequest.objects.filter(status='Completed').values_list('pk', flat=True)) == [older[0].pk]
+    assert ClientRequest.objects.count() == 31
@@ -0,0 +1,98 @@
+import pytest
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from main.models import Client, RequestType, ClientRequest
+
+# Tests for the large-table changelist mode (main/pagination.py):
+# - below the threshold the changelist paginates and counts exactly as before
+# - above it the default ordering pages by (created_at, id) cursor with no COUNT(*)
+# - other orderings fall back to page numbers with estimated counts
+
+PER_PAGE = 100
+
+
+@pytest.fixture
+def many_requests():
+    client = Client.objects.create(name='Keyset Client')
+    request_type = RequestType.objects.create(name='Keyset Type')
+    now = timezone.now()
+    # Pairs of rows share a timestamp so the id tie-breaker is exercised
+    ClientRequest.objects.bulk_create(
+        ClientRequest(
+            client=client,
+            request_type=request_type,
+            status='Pending',
+            description=f'Keyset request {i}',
+            created_at=now - timedelta(minutes=i // 2),
+        )
+        for i in range(PER_PAGE + 30)
+    )
+    return list(ClientRequest.objects.order_by('-created_at', '-pk'))
+
+
+@pytest.fixture
+def large_table(settings):
+    settings.ADMIN_LARGE_TABLE_THRESHOLD = 0
+
+
+@pytest.mark.django_db
+def test_small_table_uses_standard_pagination(admin_client, many_requests):
+    response = admin_client.get(reverse('admin:main_clientrequest_changelist'))
+
+    cl = response.context['cl']
+    assert not cl.large_table
+    assert cl.result_count == len(many_requests)
+
+
+@pytest.mark.django_db
+def test_keyset_pages_walk_the_whole_table_without_counting(admin_client, many_requests, large_table, warm_version_tokens):
+    url = reverse('admin:main_clientrequest_changelist')
+    # Creating the database version tokens counts the cache table's rows
+    warm_version_tokens(admin_client, url)
+
+    with CaptureQueriesContext(connection) as context:
+        first = admin_client.get(url).context['cl']
+    assert first.keyset
+    assert not any('COUNT(' in query['sql'].upper() for query in context.captured_queries)
+    assert list(first.result_list) == many_requests[:PER_PAGE]
+
+    second = admin_client.get(url + first.next_page_url).context['cl']
+    assert list(second.result_list) == many_requests[PER_PAGE:]
+    assert second.next_page_url is None
+
+    back = admin_client.get(url + second.previous_page_url).context['cl']
+    assert list(back.result_list) == many_requests[:PER_PAGE]
+
+
+@pytest.mark.django_db
+def test_keyset_cursor_respects_filters(admin_client, many_requests, large_table):
+    url = reverse('admin:main_clientrequest_changelist')
+    ClientRequest.objects.filter(pk__in=[r.pk for r in many_requests[::2]]).update(status='Completed')
+
+    first = admin_client.get(url, {'status__exact': 'Completed'}).context['cl']
+    assert first.next_page_url is None
+    assert len(first.result_list) == len(many_requests[::2])
+    assert all(r.status == 'Completed' for r in first.result_list)
+
+
+@pytest.mark.django_db
+def test_other_orderings_fall_back_to_page_numbers(admin_client, many_requests, large_table):
+    url = reverse('admin:main_clientrequest_changelist')
+
+    # o=1 sorts by the id column
+    first = admin_client.get(url, {'o': '1'}).context['cl']
+    assert not first.keyset
+    second = admin_client.get(url + first.next_page_url).context['cl']
+    assert second.page_num == 2
+    assert len(second.result_list) == len(many_requests) - PER_PAGE
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_redirects_with_error_flag(admin_client, many_requests, large_table):
+    response = admin_client.get(reverse('admin:main_clientrequest_changelist'), {'after': 'garbage'})
+
+    assert response.status_code == 302
+    assert 'e=1' in response.url
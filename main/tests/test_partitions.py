@@ -0,0 +1,108 @@
+import pytest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from main.management.commands.explain_admin_queries import explain_queries
+from main.models import Client, RequestType, ClientRequest, ClientRequestStatusEvent
+from main.partitions import (
+    DEFAULT_PARTITION, add_months, create_partition, expired_partitions, list_partitions,
+    month_start, partition_name, retire_partition,
+)
+from main.rollups import rollup_drift
+
+# Tests for the monthly ClientRequest partitions (migration 0012, main/partitions.py):
+# - rows land in their month's partition and date filters prune the others
+# - creating a month moves its rows out of the default partition
+# - retiring a month keeps the rollups and status history consistent
+
+# Older than any partition the migration creates, so rows for it start in the default partition
+OLD_MONTH = datetime(2001, 3, 1, tzinfo=dt_timezone.utc)
+
+
+def partition_of(request):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT tableoid::regclass::text FROM {ClientRequest._meta.db_table} WHERE id = %s', [request.pk]
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def client_and_type():
+    return Client.objects.create(name='Partition Client'), RequestType.objects.create(name='Partition Type')
+
+
+@pytest.fixture
+def old_request(client_and_type):
+    client, request_type = client_and_type
+    return ClientRequest.objects.create(
+        client=client, request_type=request_type, status='Pending', created_at=OLD_MONTH + timedelta(days=14)
+    )
+
+
+@pytest.mark.django_db
+def test_new_requests_land_in_their_month(client_and_type):
+    client, request_type = client_and_type
+    request = ClientRequest.objects.create(client=client, request_type=request_type, status='Pending')
+
+    assert partition_of(request) == partition_name(month_start(timezone.now()))
+
+
+@pytest.mark.django_db
+def test_created_at_filters_prune_partitions(client_and_type):
+    results = explain_queries(no_seqscan=True)
+
+    assert len(results['changelist filtered by created_at (past 7 days)']['partitions']) <= 2
+    assert len(results['changelist (default ordering)']['partitions']) == len(list_partitions())
+
+
+@pytest.mark.django_db
+def test_create_partition_moves_rows_out_of_default(old_request):
+    assert partition_of(old_request) == DEFAULT_PARTITION
+
+    moved = create_partition(OLD_MONTH)
+
+    assert moved == 1
+    assert partition_of(old_request) == partition_name(OLD_MONTH)
+    assert ClientRequest.objects.get(pk=old_request.pk).status == 'Pending'
+    assert rollup_drift() == {}
+
+
+@pytest.mark.django_db
+def test_dropping_a_partition_removes_its_rollups_and_history(old_request, client_and_type):
+    client, request_type = client_and_type
+    current = ClientRequest.objects.create(client=client, request_type=request_type, status='Pending')
+    old_request.status = 'Completed'
+    old_request.save()
+    create_partition(OLD_MONTH)
+
+    expired = [p for p in expired_partitions(retain_months=12) if p.name == partition_name(OLD_MONTH)]
+    retire_partition(expired[0], drop=True)
+
+    assert list(ClientRequest.objects.all()) == [current]
+    assert not ClientRequestStatusEvent.objects.filter(client_request_id=old_request.pk).exists()
+    assert rollup_drift() == {}
+    assert partition_name(OLD_MONTH) not in {p.name for p in list_partitions()}
+
+
+@pytest.mark.django_db
+def test_manage_partitions_command_creates_months_ahead():
+    out = StringIO()
+    call_command('manage_partitions', '--ahead', '5', stdout=out)
+
+    names = {p.name for p in list_partitions()}
+    assert partition_name(add_months(month_start(timezone.now()), 5)) in names
+    assert 'Created' in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_manage_partitions_dry_run_changes_nothing(old_request):
+    before = list_partitions()
+    out = StringIO()
+    call_command('manage_partitions', '--backfill-from', '2001-03', '--dry-run', stdout=out)
+
+    assert list_partitions() == before
+    assert f'Would create {partition_name(OLD_MONTH)}' in out.getvalue()
+    assert 'outside every monthly partition' in out.getvalue()
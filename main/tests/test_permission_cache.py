@@ -0,0 +1,91 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from main.management.commands.create_limited_user_group import create_limited_users_permission_group
+
+# Tests for the cross-request permission cache (main/permissions.py):
+# - a warm cache serves admin pages without touching auth_permission, with or without CACHE_URL
+# - group membership, group permissions and user permissions invalidate it
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+
+
+@pytest.fixture
+def limited_user(django_user_model):
+    user = django_user_model.objects.create_user(username='cached', password='secure123', is_staff=True)
+    user.groups.add(create_limited_users_permission_group())
+    return user
+
+
+def admin_page_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        assert client.get(url).status_code == 200
+    permission_queries = [q for q in context.captured_queries if 'auth_permission' in q['sql']]
+    return len(context.captured_queries), len(permission_queries)
+
+
+@pytest.mark.django_db
+def test_cached_permissions_save_queries(cache_setup, client, limited_user, settings):
+    urls = [reverse('admin:index'), reverse('admin:main_client_changelist')]
+
+    settings.AUTHENTICATION_BACKENDS = [MODEL_BACKEND]
+    client.force_login(limited_user)
+    uncached = [admin_page_queries(client, url) for url in urls]
+
+    settings.AUTHENTICATION_BACKENDS = ['main.permissions.CachedPermissionBackend']
+    client.force_login(limited_user)
+    for url in urls:
+        admin_page_queries(client, url)  # warm the cache
+    cached = [admin_page_queries(client, url) for url in urls]
+
+    for (before, before_perms), (after, after_perms) in zip(uncached, cached):
+        assert before_perms > 0
+        assert after_perms == 0
+        # At least the permission lookups are saved on every page
+        assert after <= before - before_perms
+
+
+@pytest.mark.django_db
+def test_group_permission_change_invalidates_cache(client, limited_user):
+    client.force_login(limited_user)
+    url = reverse('admin:main_client_changelist')
+    assert client.get(url).status_code == 200
+
+    group = Group.objects.get(name='LimitedUsers')
+    group.permissions.remove(*group.permissions.filter(codename__in=['view_client', 'change_client']))
+
+    assert client.get(url).status_code == 403
+
+
+@pytest.mark.django_db
+def test_group_membership_change_invalidates_cache(client, limited_user):
+    client.force_login(limited_user)
+    url = reverse('admin:main_client_changelist')
+    assert client.get(url).status_code == 200
+
+    limited_user.groups.clear()
+    assert client.get(url).status_code == 403
+
+    Group.objects.get(name='LimitedUsers').user_set.add(limited_user)
+    assert client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_user_permission_and_group_delete_invalidate_cache(client, django_user_model):
+    user = django_user_model.objects.create_user(username='direct', password='secure123', is_staff=True)
+    client.force_login(user)
+    url = reverse('admin:main_requesttype_changelist')
+    assert client.get(url).status_code == 403
+
+    user.user_permissions.add(Permission.objects.get(codename='view_requesttype'))
+    assert client.get(url).status_code == 200
+
+    user.user_permissions.clear()
+    group = create_limited_users_permission_group()
+    group.user_set.add(user)
+    assert client.get(url).status_code == 200
+
+    group.delete()
+    assert client.get(url).status_code == 403
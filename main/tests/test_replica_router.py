@@ -0,0 +1,153 @@
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.contrib.auth.models import User
+from django.db import connections
+from django.http import HttpResponse
+from main import admin as main_admin
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from main.middleware import REPLICA_PIN_COOKIE, ReplicaPinningMiddleware
+from main.models import Client, ClientRequest, RequestType
+from main.routers import PrimaryReplicaRouter, RequestState, request_state
+
+# Tests for primary/replica routing (main/routers.py and ReplicaPinningMiddleware):
+# - request reads go to a replica until the request writes, then to the primary
+# - writing requests set a cookie that pins the client's next requests to the primary
+# - view-only admin actions (exports) read from a replica although they're POSTs
+# - database cache tables (the version tokens without CACHE_URL) are read from the primary
+#
+# The last two tests need a real replica alias; run it against two local databases with e.g.
+#     DATABASE_REPLICA_URLS=postgres://postgres@localhost:5432/postgres pytest main/tests/test_replica_router.py
+
+router = PrimaryReplicaRouter()
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica1']
+
+
+def test_reads_use_a_replica_until_the_request_writes(replicas):
+    assert router.db_for_read(Client) == 'default'  # no request: management commands etc.
+
+    token = request_state.set(RequestState())
+    try:
+        assert router.db_for_read(Client) == 'replica1'
+        assert router.db_for_read(User) == 'default'  # feeds the shared permission cache
+
+        assert router.db_for_write(Client) == 'default'
+        assert router.db_for_read(Client) == 'default'
+    finally:
+        request_state.reset(token)
+
+
+def test_database_caches_stay_on_the_primary(replicas):
+    # Cache version tokens without CACHE_URL (settings.CACHES['versions']) are read right
+    # after cache_versions() adds them, so a lagging replica would return None
+    entry = caches['versions'].cache_model_class
+    token = request_state.set(RequestState())
+    try:
+        assert router.db_for_read(entry) == 'default'
+        assert router.db_for_write(entry) == 'default'
+        # Storing a token isn't a write the client has to read back
+        assert router.db_for_read(Client) == 'replica1'
+        assert not request_state.get().wrote
+    finally:
+        request_state.reset(token)
+
+
+def test_middleware_pins_unsafe_methods_and_sets_cookie_after_writes(replicas):
+    seen = {}
+
+    def view(request):
+        seen['read'] = router.db_for_read(Client)
+        if request.GET.get('write'):
+            router.db_for_write(Client)
+        return HttpResponse()
+
+    middleware = ReplicaPinningMiddleware(view)
+    factory = RequestFactory()
+
+    response = middleware(factory.get('/'))
+    assert seen['read'] == 'replica1' and REPLICA_PIN_COOKIE not in response.cookies
+
+    response = middleware(factory.get('/', {'write': 1}))
+    assert response.cookies[REPLICA_PIN_COOKIE]['max-age'] == settings.REPLICA_PIN_SECONDS
+
+    middleware(factory.post('/'))
+    assert seen['read'] == 'default'
+
+    pinned = factory.get('/')
+    pinned.COOKIES[REPLICA_PIN_COOKIE] = '1'
+    middleware(pinned)
+    assert seen['read'] == 'default'
+    assert request_state.get() is None
+
+
+# Transactional: reads inside the test's atomic block would always go to the primary
+@pytest.mark.django_db(transaction=True)
+def test_export_actions_read_from_a_replica(replicas, settings, superuser_client, monkeypatch):
+    settings.DATABASE_ROUTERS = ['main.routers.PrimaryReplicaRouter']
+    exported_from = []
+
+    def export(queryset, fmt, compress=False, request=None):
+        exported_from.append(queryset.db)
+        return HttpResponse()
+    monkeypatch.setattr(main_admin, 'streaming_export_response', export)
+    client = Client.objects.create(name='Export Client')
+    request_type = RequestType.objects.create(name='Export Type')
+    ClientRequest.objects.create(client=client, request_type=request_type, status='Pending')
+
+    def post_action(action):
+        return superuser_client.post(reverse('custom_admin:main_clientrequest_changelist'), {
+            'action': action, '_selected_action': list(ClientRequest.objects.values_list('pk', flat=True)),
+        })
+
+    post_action('export_as_csv')
+    assert exported_from == ['replica1']
+
+    # A recent write by the same client keeps even read-only actions on the primary
+    superuser_client.cookies[REPLICA_PIN_COOKIE] = '1'
+    post_action('export_as_csv')
+    assert exported_from[-1] == 'default'
+
+
+@pytest.mark.skipif(not settings.DATABASE_REPLICAS, reason='needs DATABASE_REPLICA_URLS')
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_admin_export_action_streams_from_replica(superuser_client):
+    client = Client.objects.create(name='Replica Export')
+    replica = connections[settings.DATABASE_REPLICAS[0]]
+
+    with CaptureQueriesContext(replica) as context:
+        response = superuser_client.post(reverse('custom_admin:main_client_changelist'), {
+            'action': 'export_as_csv', '_selected_action': [client.pk],
+        })
+        assert b'Replica Export' in b''.join(response.streaming_content)
+    assert any('main_client' in query['sql'] for query in context.captured_queries)
+
+
+@pytest.mark.skipif(not settings.DATABASE_REPLICAS, reason='needs DATABASE_REPLICA_URLS')
+@pytest.mark.django_db(transaction=True, databases='__all__')
+def test_admin_changelist_reads_from_replica_until_a_save(superuser_client):
+    replica = connections[settings.DATABASE_REPLICAS[0]]
+    changelist = reverse('custom_admin:main_client_changelist')
+
+    with CaptureQueriesContext(replica) as context:
+        assert superuser_client.get(changelist).status_code == 200
+    assert any('main_client' in query['sql'] for query in context.captured_queries)
+
+    response = superuser_client.post(reverse('custom_admin:main_client_add'), {
+        'name': 'Replica Client',
+        'email': 'replica@example.com',
+        'is_active': 'on',
+        'clientrequest_set-TOTAL_FORMS': 0,
+        'clientrequest_set-INITIAL_FORMS': 0,
+    })
+    assert response.status_code == 302 and REPLICA_PIN_COOKIE in response.cookies
+
+    # The redirect target reads the new row from the primary, whatever the replica lag
+    with CaptureQueriesContext(replica) as context:
+        assert 'Replica Client' in superuser_client.get(changelist).content.decode()
+    assert context.captured_queries == []
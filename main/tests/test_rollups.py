@@ -0,0 +1,126 @@
+import random
+import threading
+import pytest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection, transaction
+from django.urls import reverse
+from main.models import Client, RequestType, ClientRequest, ClientRequestRollup
+from main.rollups import rollup_drift, stored_rollups
+
+# Tests for the ClientRequest dashboard rollups:
+# - every write path (create, save, delete, bulk_create, admin status action) keeps them exact
+# - rebuild_rollups repairs drift and --check reports it
+# - the admin dashboard renders from the rollup table
+# - concurrent writes touching overlapping rollup keys don't deadlock
+
+@pytest.fixture
+def request_data():
+    client = Client.objects.create(name='Rollup Client')
+    seo = RequestType.objects.create(name='SEO Tech Check')
+    plugins = RequestType.objects.create(name='Plugin Updates')
+    requests = [
+        ClientRequest.objects.create(client=client, request_type=seo, status='Pending'),
+        ClientRequest.objects.create(client=client, request_type=seo, status='Pending'),
+        ClientRequest.objects.create(client=client, request_type=plugins, status='In Progress'),
+    ]
+    return {'client': client, 'seo': seo, 'plugins': plugins, 'requests': requests}
+
+
+def totals_by_status():
+    totals = {}
+    for (_, status, _), count in stored_rollups().items():
+        totals[status] = totals.get(status, 0) + count
+    return totals
+
+
+@pytest.mark.django_db
+def test_rollups_follow_every_write_path(request_data):
+    assert totals_by_status() == {'Pending': 2, 'In Progress': 1}
+
+    # save() moving a request to another status
+    obj = request_data['requests'][0]
+    obj.status = 'Completed'
+    obj.save()
+    assert totals_by_status() == {'Pending': 1, 'In Progress': 1, 'Completed': 1}
+
+    # queryset.update(), as used by the admin status actions
+    ClientRequest.objects.filter(status='Pending').update(status='Completed')
+    assert totals_by_status() == {'In Progress': 1, 'Completed': 2}
+
+    # bulk_create and delete
+    ClientRequest.objects.bulk_create(
+        ClientRequest(client=request_data['client'], request_type=request_data['seo'], status=None)
+        for _ in range(3)
+    )
+    ClientRequest.objects.filter(status='In Progress').delete()
+    assert totals_by_status() == {'Completed': 2, '': 3}
+    assert rollup_drift() == {}
+
+
+@pytest.mark.django_db
+def test_admin_status_action_updates_rollups(admin_client, request_data):
+    selected = [r.pk for r in request_data['requests']]
+    admin_client.post(
+        reverse('admin:main_clientrequest_changelist'),
+        {'action': 'mark_as_completed', '_selected_action': selected},
+    )
+
+    assert totals_by_status() == {'Completed': 3}
+
+
+@pytest.mark.django_db
+def test_rebuild_rollups_repairs_drift(request_data):
+    ClientRequestRollup.objects.update(request_count=99)
+
+    with pytest.raises(CommandError):
+        call_command('rebuild_rollups', '--check')
+
+    call_command('rebuild_rollups')
+    assert rollup_drift() == {}
+    assert totals_by_status() == {'Pending': 2, 'In Progress': 1}
+
+
+@pytest.mark.django_db
+def test_dashboard_renders_overview_from_rollups(admin_client, request_data):
+    response = admin_client.get(reverse('admin:index'))
+
+    overview = response.context['request_overview']
+    assert overview['total'] == 3
+    assert [row['status'] for row in overview['by_status']] == ['Pending', 'In Progress']
+    assert b'request-overview' in response.content
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_inserts_lock_rollups_in_key_order():
+    client = Client.objects.create(name='Concurrent Client')
+    types = [RequestType.objects.create(name=f'Concurrent Type {n}') for n in range(5)]
+    keys = [(day, request_type) for day in range(10) for request_type in types]
+    start = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+    errors = []
+
+    def write(seed):
+        # Each transaction touches a random, overlapping subset of the rollup keys
+        rng = random.Random(seed)
+        try:
+            for _ in range(20):
+                with transaction.atomic():
+                    ClientRequest.objects.bulk_create(
+                        ClientRequest(client=client, request_type=request_type, status='Pending',
+                                      created_at=start + timedelta(days=day))
+                        for day, request_type in rng.sample(keys, 25)
+                    )
+        except OperationalError as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=write, args=(seed,)) for seed in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert rollup_drift() == {}
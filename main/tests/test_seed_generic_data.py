@@ -0,0 +1,130 @@
+import pytest
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from main.management.commands import seed_generic_data
+from main.management.commands.seed_generic_data import RequestGenerator
+from main.models import Client, ClientRequest, ClientRequestRollup, RequestType, SeedChunk
+
+# Tests for the synthetic data generator (seed_generic_data):
+# - the same seed produces the same rows, and re-runs top up instead of duplicating
+# - re-runs refill exactly the chunks a failed run left out, whatever order they committed in
+# - parallel workers write exactly the rows a single process would
+# - status, created_at, request type and description follow their distributions
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Several chunks per run without generating tens of thousands of rows
+    monkeypatch.setattr(seed_generic_data, 'CHUNK_SIZE', 100)
+
+
+def seed(**options):
+    out = StringIO()
+    call_command('seed_generic_data', '--until=2026-06-01', stdout=out, **options)
+    return out.getvalue()
+
+
+def seeded_requests():
+    return list(
+        ClientRequest.objects.order_by('pk').values_list(
+            'client__email', 'request_type__name', 'status', 'description', 'created_at', 'updated_at'
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_seed_is_deterministic_and_tops_up(small_chunks):
+    seed(clients=20, requests=0)
+    seed(clients=30, requests=250)
+    assert seed(clients=30, requests=250).count('Created') == 0
+    seed(clients=30, requests=420)
+
+    assert Client.objects.filter(email__endswith='@seed.example.com').count() == 30
+    assert RequestType.objects.count() == 10
+    topped_up = seeded_requests()
+    assert len(topped_up) == 420
+    assert sum(row.request_count for row in ClientRequestRollup.objects.all()) == 420
+
+    # One run to the final counts writes the same requests as the two runs above
+    ClientRequest.objects.all().delete()
+    Client.objects.all().delete()
+    seed(clients=30, requests=420)
+    assert seeded_requests() == topped_up
+
+    ClientRequest.objects.all().delete()
+    seed(clients=30, requests=420, seed=7)
+    assert seeded_requests() != topped_up
+
+
+@pytest.mark.django_db
+def test_rerun_refills_only_the_missing_chunks(small_chunks):
+    seed(clients=10, requests=500)
+    complete = sorted(seeded_requests(), key=repr)
+
+    # As if a parallel run had failed after committing chunks 0, 2, 3 and 4 but not 1
+    ClientRequest.objects.filter(pk__in=ClientRequest.objects.order_by('pk').values('pk')[100:200]).delete()
+    SeedChunk.objects.filter(chunk=1).delete()
+    # Requests added to seed clients by hand aren't mistaken for seeded ones
+    client = Client.objects.filter(email__endswith='@seed.example.com').first()
+    manual = ClientRequest.objects.create(client=client, request_type=RequestType.objects.first(), description='By hand')
+
+    assert 'Created 100 requests' in seed(clients=10, requests=500)
+    assert sorted(seeded_requests(), key=repr) == sorted(complete + [
+        ClientRequest.objects.filter(pk=manual.pk).values_list(
+            'client__email', 'request_type__name', 'status', 'description', 'created_at', 'updated_at'
+        ).get()
+    ], key=repr)
+
+    # Rows deleted without their records can't be told apart from written ones
+    ClientRequest.objects.exclude(pk=manual.pk).delete()
+    with pytest.raises(CommandError, match='deleted without their SeedChunk records'):
+        seed(clients=10, requests=500)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_workers_write_the_same_rows(small_chunks):
+    seed(clients=10, requests=500)
+    serial = sorted(seeded_requests(), key=repr)
+    ClientRequest.objects.all().delete()
+    SeedChunk.objects.all().delete()
+
+    output = seed(clients=10, requests=500, workers=3)
+
+    assert 'Created 500 requests' in output
+    assert sorted(seeded_requests(), key=repr) == serial
+
+
+@pytest.mark.django_db
+def test_workers_need_autocommit():
+    with pytest.raises(CommandError):
+        seed(workers=2)
+
+
+def test_generated_distributions():
+    start, end = datetime(2025, 6, 1, tzinfo=dt_timezone.utc), datetime(2026, 6, 1, tzinfo=dt_timezone.utc)
+    generator = RequestGenerator(1, list(range(100)), list(range(10)), start, end)
+    rows = generator.rows(0, 0, 5000)
+
+    assert generator.rows(0, 4000, 5000) == rows[4000:]
+    clients = Counter(row[0] for row in rows)
+    assert clients[0] > 10 * clients[99]
+    types = Counter(row[1] for row in rows)
+    assert types[0] > types[4] > types[9]
+
+    old = [row[2] for row in rows if (end - row[4]).days > 30]
+    recent = [row[2] for row in rows if (end - row[4]).days < 2]
+    assert old.count('Completed') / len(old) > 0.9
+    assert recent.count('Completed') / len(recent) < 0.5
+    assert all(start <= created_at < end and created_at <= updated_at <= end for *_, created_at, updated_at in rows)
+
+    weekdays = Counter(row[4].weekday() for row in rows)
+    assert weekdays[2] > 2 * weekdays[6]
+    first_half = sum(row[4] < datetime(2025, 12, 1, tzinfo=dt_timezone.utc) for row in rows)
+    assert first_half < len(rows) / 2
+
+    lengths = [len(row[3].split()) for row in rows if row[3]]
+    assert min(lengths) == 3 and max(lengths) > 100
+    assert 0.02 < sum(row[3] is None for row in rows) / len(rows) < 0.08
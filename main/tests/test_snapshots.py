@@ -0,0 +1,119 @@
+import json
+import pytest
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from main.models import Client, ClientRequest, ClientRequestRollup, ClientRequestStatusEvent, RequestType
+from main.rollups import rollup_drift
+
+# Tests for bulk resets of the client data (main/snapshots.py):
+# - wipe_data --fast truncates the client tables, keeps superusers and restarts ids
+# - snapshot_data/restore_data round-trip rows, search vectors and rollups
+# - snapshots from another schema are refused
+# - wiping and restoring refresh the admin's cached counts, suggestions and dashboard
+
+
+def make_requests(count=3):
+    client = Client.objects.create(name='Snapshot Client', email='snap@example.com')
+    request_type = RequestType.objects.create(name='Snapshot Type')
+    return [
+        ClientRequest.objects.create(
+            client=client, request_type=request_type, status='Pending', description=f'printer broken {n}'
+        )
+        for n in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_fast_wipe_keeps_superusers():
+    User.objects.create_superuser(username='keeper', password='keeperpass123')
+    User.objects.create_user(username='goner', password='gonerpass123')
+    request = make_requests()[0]
+    request.status = 'Completed'
+    request.save()
+    assert ClientRequestStatusEvent.objects.exists()
+
+    out = StringIO()
+    call_command('wipe_data', yes=True, fast=True, stdout=out)
+
+    assert 'deleted 1 Users' in out.getvalue()
+    assert list(User.objects.values_list('username', flat=True)) == ['keeper']
+    for model in (Client, RequestType, ClientRequest, ClientRequestRollup, ClientRequestStatusEvent):
+        assert not model.objects.exists()
+    assert make_requests(1)[0].pk == 1
+
+
+@pytest.mark.django_db
+def test_snapshot_restore_round_trip(tmp_path):
+    user = User.objects.create_superuser(username='snapadmin', password='snapadminpass123')
+    requests = make_requests()
+    requests[0].status = 'Completed'
+    requests[0].save(changed_by=user)
+    before = list(ClientRequest.objects.order_by('pk').values_list('pk', 'client__name', 'status', 'created_at', 'search_vector'))
+    rollups = sorted(ClientRequestRollup.objects.values_list('day', 'status', 'request_count'))
+
+    out = StringIO()
+    call_command('snapshot_data', str(tmp_path), stdout=out)
+    assert 'Snapshot of 8 rows' in out.getvalue()  # 1 client, 1 type, 3 requests, 1 event, 2 rollups
+    with pytest.raises(CommandError):
+        call_command('snapshot_data', str(tmp_path))
+
+    ClientRequest.objects.all().delete()
+    Client.objects.create(name='Added later')
+
+    call_command('restore_data', str(tmp_path), yes=True, stdout=out)
+
+    assert list(ClientRequest.objects.order_by('pk').values_list('pk', 'client__name', 'status', 'created_at', 'search_vector')) == before
+    assert sorted(ClientRequestRollup.objects.values_list('day', 'status', 'request_count')) == rollups
+    assert rollup_drift() == {}
+    assert ClientRequestStatusEvent.objects.get().changed_by is None
+    # Triggers are back on and sequences continue after the restored ids
+    added = make_requests(1)[0]
+    assert added.pk > before[-1][0]
+    assert rollup_drift() == {}
+
+
+@pytest.mark.django_db
+def test_restore_refuses_other_schema(tmp_path):
+    call_command('snapshot_data', str(tmp_path), stdout=StringIO())
+    manifest_path = tmp_path / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text())
+    manifest['tables'][0]['columns'].append('removed_column')
+    manifest_path.write_text(json.dumps(manifest))
+
+    with pytest.raises(CommandError, match='main_client'):
+        call_command('restore_data', str(tmp_path), yes=True)
+    with pytest.raises(CommandError, match='not a snapshot'):
+        call_command('restore_data', str(tmp_path / 'missing'), yes=True)
+
+
+def admin_views(admin_client):
+    # What the admin shows from its caches: dashboard total, status facet total, client suggestions
+    overview = admin_client.get(reverse('admin:index')).context['request_overview']
+    changelist = admin_client.get(reverse('admin:main_clientrequest_changelist')).context['cl']
+    status = next(spec for spec in changelist.filter_specs if spec.field_path == 'status')
+    suggestions = admin_client.get(reverse('admin:autocomplete'), {
+        'app_label': 'main', 'model_name': 'clientrequest', 'field_name': 'client', 'term': 'snap',
+    }).json()['results']
+    return overview['total'], status.facet_choices[0]['count'], len(suggestions)
+
+
+@pytest.mark.django_db
+def test_wipe_and_restore_refresh_admin_caches(admin_client, tmp_path, django_capture_on_commit_callbacks):
+    make_requests()
+    call_command('snapshot_data', str(tmp_path), stdout=StringIO())
+    assert admin_views(admin_client) == (3, 3, 1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('wipe_data', yes=True, fast=True, stdout=StringIO())
+    assert admin_views(admin_client) == (0, 0, 0)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('restore_data', str(tmp_path), yes=True, stdout=StringIO())
+    assert admin_views(admin_client) == (3, 3, 1)
+
+    call_command('wipe_data', yes=True, stdout=StringIO())
+    assert admin_views(admin_client) == (0, 0, 0)
+
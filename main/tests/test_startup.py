@@ -0,0 +1,25 @@
+import subprocess
+import sys
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+
+# Tests for cold-start work: importing settings has no side effects, and
+# benchmark_startup times a server from launch to its first 200
+
+
+def test_settings_import_prints_nothing():
+    result = subprocess.run(
+        [sys.executable, '-c', 'import mysite.settings'], capture_output=True, text=True, check=True,
+        cwd=settings.BASE_DIR,
+    )
+    assert result.stdout == ''
+
+
+def test_benchmark_startup_times_first_ok_response():
+    out = StringIO()
+    server = f'sh -c "{sys.executable} -m http.server $PORT --bind 127.0.0.1"'
+    call_command('benchmark_startup', server=server, runs=1, timeout=20, stdout=out)
+
+    assert 'run 1: first 200 after' in out.getvalue()
+    assert 'over 1 run(s)' in out.getvalue()
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from main.models import Client, RequestType, ClientRequest, ClientRequestStatusEvent
+
+# Tests for the append-only ClientRequest status history:
+# - save() records a transition only when the status actually changes
+# - bulk admin status actions record every changed row with a fixed number of queries
+# - admin edits (change form and Client inline) are attributed to the user
+
+@pytest.fixture
+def request_data():
+    client = Client.objects.create(name='History Client')
+    request_type = RequestType.objects.create(name='History Type')
+    return client, request_type
+
+
+def create_requests(request_data, count, status='Pending'):
+    client, request_type = request_data
+    return [
+        ClientRequest.objects.create(client=client, request_type=request_type, status=status)
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_save_records_status_transitions_only(request_data):
+    obj = create_requests(request_data, 1)[0]
+    assert not ClientRequestStatusEvent.objects.exists()  # creation is not a transition
+
+    obj.description = 'No status change'
+    obj.save()
+    assert not ClientRequestStatusEvent.objects.exists()
+
+    obj.status = 'In Progress'
+    obj.save()
+    obj = ClientRequest.objects.get(pk=obj.pk)
+    obj.status = 'Completed'
+    obj.save()
+
+    history = obj.status_events.order_by('changed_at', 'pk').values_list('from_status', 'to_status')
+    assert list(history) == [('Pending', 'In Progress'), ('In Progress', 'Completed')]
+
+
+@pytest.mark.django_db
+def test_bulk_status_action_records_changed_rows_in_fixed_queries(admin_client, admin_user, request_data):
+    url = reverse('admin:main_clientrequest_changelist')
+
+    def mark_completed(count):
+        ClientRequest.objects.all().delete()
+        create_requests(request_data, count)
+        create_requests(request_data, 2, status='Completed')  # unchanged, so no event
+        selected = list(ClientRequest.objects.values_list('pk', flat=True))
+        with CaptureQueriesContext(connection) as context:
+            admin_client.post(url, {'action': 'mark_as_completed', '_selected_action': selected})
+        return len(context.captured_queries)
+
+    assert mark_completed(3) == mark_completed(30)
+
+    events = ClientRequestStatusEvent.objects.all()
+    assert events.count() == 30
+    assert set(events.values_list('from_status', 'to_status', 'changed_by')) == {('Pending', 'Completed', admin_user.pk)}
+
+
+@pytest.mark.django_db
+def test_admin_change_form_attributes_transition(admin_client, admin_user, request_data):
+    obj = create_requests(request_data, 1)[0]
+    response = admin_client.post(reverse('admin:main_clientrequest_change', args=[obj.pk]), {
+        'client': obj.client_id,
+        'request_type': obj.request_type_id,
+        'status': 'In Progress',
+        'description': '',
+    })
+
+    assert response.status_code == 302
+    event = ClientRequestStatusEvent.objects.get()
+    assert (event.from_status, event.to_status, event.changed_by) == ('Pending', 'In Progress', admin_user)
@@ -0,0 +1,91 @@
+import pytest
+from asgiref.sync import async_to_sync
+from io import StringIO
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+from main.throttling import Rate, parse_rate, take_token
+
+# Tests for login/registration throttling (main/throttling.py):
+# - token buckets allow a burst, then refill at the configured rate
+# - over-limit attempts get a 429 before any password is hashed
+# - the IP and username buckets are independent
+
+
+@pytest.fixture
+def count_hashing(monkeypatch):
+    # Counts password hashes, the CPU cost throttling exists to avoid
+    hasher = type(get_hasher())
+    calls = []
+    original = hasher.encode
+    monkeypatch.setattr(hasher, 'encode', lambda self, *args, **kwargs: calls.append(1) or original(self, *args, **kwargs))
+    return calls
+
+
+def test_token_bucket_allows_burst_then_refills():
+    rate = parse_rate('3/60')
+    assert rate == Rate(3, 60.0)
+    take = async_to_sync(take_token)
+
+    assert [take('test', 'client', rate, now=1000) for _ in range(3)] == [0, 0, 0]
+    assert take('test', 'client', rate, now=1000) == pytest.approx(20)
+    # Rejected attempts don't push the wait further out
+    assert take('test', 'client', rate, now=1000) == pytest.approx(20)
+    # One token back every 60/3 seconds
+    assert take('test', 'client', rate, now=1020) == 0
+    assert take('test', 'client', rate, now=1020) > 0
+    assert take('test', 'other client', rate, now=1020) == 0
+
+
+@pytest.mark.django_db
+def test_login_flood_is_rejected_before_hashing(client, settings, count_hashing):
+    settings.THROTTLE_RATES = {**settings.THROTTLE_RATES, 'login-ip': '2/60', 'login-username': ''}
+    url = reverse('login')
+
+    statuses = [client.post(url, {'username': f'victim{n}', 'password': 'wrong'}).status_code for n in range(5)]
+
+    assert statuses == [200, 200, 429, 429, 429]
+    assert len(count_hashing) == 2
+    response = client.post(url, {'username': 'victim', 'password': 'wrong'})
+    assert 0 < int(response['Retry-After']) <= 30
+    assert response['Content-Type'] == 'text/plain'
+
+
+@pytest.mark.django_db
+def test_username_bucket_applies_across_ips(client, settings):
+    settings.THROTTLE_RATES = {**settings.THROTTLE_RATES, 'login-username': '2/60'}
+    User.objects.create_user(username='target', password='correct-horse-battery', is_staff=True)
+    url = reverse('login')
+
+    statuses = [
+        client.post(url, {'username': 'Target', 'password': 'wrong'}, REMOTE_ADDR=f'10.0.0.{n}').status_code
+        for n in range(3)
+    ]
+    assert statuses == [200, 200, 429]
+    # Other usernames from the same addresses are unaffected
+    assert client.post(url, {'username': 'someone', 'password': 'wrong'}, REMOTE_ADDR='10.0.0.1').status_code == 200
+
+
+@pytest.mark.django_db
+def test_registration_is_throttled_per_ip(client, settings, count_hashing):
+    settings.THROTTLE_RATES = {**settings.THROTTLE_RATES, 'register-ip': '1/600'}
+    url = reverse('register')
+    data = {'email': 'new@example.com', 'password': 'strongpassword123', 'password_confirm': 'strongpassword123'}
+
+    assert client.post(url, {**data, 'username': 'newuser1'}).status_code == 200
+    assert client.post(url, {**data, 'username': 'newuser2'}).status_code == 429
+    assert list(User.objects.values_list('username', flat=True)) == ['newuser1']
+    assert len(count_hashing) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_login_flood_command(live_server, settings):
+    settings.THROTTLE_RATES = {**settings.THROTTLE_RATES, 'login-ip': '1/60'}
+    out = StringIO()
+    call_command('benchmark_login_flood', live_server.url, admin_requests=3, flood_concurrency=2, stdout=out)
+
+    output = out.getvalue()
+    assert 'admin before flood: p50' in output and 'admin during flood: p50' in output
+    assert '429:' in output
+    assert not User.objects.filter(username='benchmark-login-flood').exists()
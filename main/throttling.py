@@ -0,0 +1,94 @@
+import hashlib
+import math
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+# Token-bucket throttling for the login and registration forms, checked before the form is
+# validated so that over-limit attempts never reach password hashing.
+#
+# Rates are "<burst>/<seconds>" (settings.THROTTLE_RATES): a client may make <burst> attempts
+# at once, and regains one every <seconds>/<burst> seconds. Buckets are kept as GCRA
+# "theoretical arrival times" in milliseconds, one integer per bucket in the shared cache,
+# advanced with the cache's atomic incr() so that concurrent attempts on one bucket can't
+# all read the same state and slip through together.
+
+Rate = namedtuple('Rate', 'burst period')
+
+
+def parse_rate(rate):
+    # '5/60' -> Rate(5, 60.0); empty values disable the bucket
+    if not rate:
+        return None
+    burst, period = rate.split('/')
+    return Rate(int(burst), float(period))
+
+
+def client_ip(request):
+    # With THROTTLE_PROXY_COUNT proxies in front of the app, the client is the address the
+    # outermost of them saw; X-Forwarded-For entries before that are client-controlled
+    if settings.THROTTLE_PROXY_COUNT:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= settings.THROTTLE_PROXY_COUNT:
+            return forwarded[-settings.THROTTLE_PROXY_COUNT]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def bucket_key(scope, ident):
+    # Hashed, so any username makes a valid memcached key
+    return f'throttle:{scope}:' + hashlib.sha256(ident.encode()).hexdigest()[:32]
+
+
+async def take_token(scope, ident, rate, now=None):
+    # Returns 0 if the attempt is allowed, otherwise the seconds until it would be
+    cache = caches[settings.THROTTLE_CACHE_ALIAS]
+    now = int((time.time() if now is None else now) * 1000)
+    key = bucket_key(scope, ident)
+    interval, period = int(rate.period * 1000 / rate.burst), int(rate.period * 1000)
+    # The entry may expire while its arrival time is still ahead, refilling the bucket up to
+    # a period early: at worst one extra burst per period
+    timeout = math.ceil(rate.period) + 1
+    if await cache.aadd(key, now + interval, timeout):
+        return 0
+    try:
+        arrival = await cache.aincr(key, interval)
+    except ValueError:
+        # Expired between add() and incr(): a full bucket
+        await cache.aset(key, now + interval, timeout)
+        return 0
+    if arrival - interval < now:
+        # The bucket had refilled; restart it from now
+        await cache.aset(key, now + interval, timeout)
+        return 0
+    if arrival - now > period:
+        # Over the limit: give the token back so rejected attempts don't push the wait further
+        await cache.adecr(key, interval)
+        return (arrival - now - period) / 1000
+    return 0
+
+
+async def throttle(request, action):
+    # Takes a token from the IP and username buckets for `action` ('login' or 'register');
+    # returns a 429 response when either is empty, otherwise None
+    username = request.POST.get('username', '').strip().lower()
+    buckets = [('ip', client_ip(request)), ('username', username)]
+    for kind, ident in buckets:
+        rate = parse_rate(settings.THROTTLE_RATES.get(f'{action}-{kind}'))
+        if rate is None or not ident:
+            continue
+        wait = await take_token(f'{action}-{kind}', ident, rate)
+        if wait:
+            return too_many_requests(wait)
+    return None
+
+
+def too_many_requests(wait):
+    # Plain text and no template: rejected attempts should cost next to nothing
+    retry_after = math.ceil(wait)
+    response = HttpResponse(
+        f'Too many attempts. Try again in {retry_after} seconds.\n', status=429, content_type='text/plain'
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
@@ -1,78 +1,129 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.urls import reverse_lazy
 from django.views.generic import FormView, TemplateView
 from django.contrib import messages
-from django.contrib.auth.views import LoginView, LogoutView
+from django.contrib.auth.forms import AuthenticationForm
+from django.contrib.auth.views import LogoutView
+from django.http import HttpResponseRedirect
 from django.shortcuts import redirect
+from django.utils.cache import add_never_cache_headers
 from .forms import UserRegistrationForm
-from django.contrib.auth import logout
+from .throttling import throttle
+from django.contrib.auth import login, logout
+
+# The public pages are async views: under ASGI (SERVER_MODE=asgi in entrypoint.sh) a worker
+# serves many of them concurrently while they wait on the database. They also work
+# unchanged under WSGI, where Django runs them in an event loop per request.
+#
+# Django 4.2 has no async API for sessions or authentication, so request.user, login()
+# and logout() run through sync_to_async. Password hashing and form validation do too,
+# which keeps that CPU work off the event loop. Database writes use the async ORM.
+
+
+async def user_is_authenticated(request):
+    # Without a session cookie there is nobody to load, which spares anonymous visitors a
+    # thread hop; otherwise request.user is loaded lazily from the session, a sync-only operation
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        return False
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+# Logged in users should never see the public pages: send them to the admin dashboard
+class AnonymousOnlyMixin:
+    async def dispatch(self, request, *args, **kwargs):
+        if await user_is_authenticated(request):
+            return redirect(reverse_lazy('custom_admin:index'))
+        return await super().dispatch(request, *args, **kwargs)
 
 
 # Home view
-class HomeView(TemplateView):
+class HomeView(AnonymousOnlyMixin, TemplateView):
     template_name = 'home.html'
-    
-    # Logged in users should never see the home page
-    def dispatch(self, request, *args, **kwargs):
-        if request.user.is_authenticated:
-            return redirect(reverse_lazy('custom_admin:index'))
-        return super().dispatch(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data(**kwargs))
+
+
+# Async form handling shared by the registration and login views
+class AsyncFormView(AnonymousOnlyMixin, FormView):
+    # Throttled action ('login' or 'register', see main/throttling.py), checked before the
+    # form is validated and a password hashed
+    throttle_action = None
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        if self.throttle_action:
+            rejected = await throttle(request, self.throttle_action)
+            if rejected is not None:
+                return rejected
+        form = self.get_form()
+        # Validation can query the database (unique username, authenticate())
+        if await sync_to_async(form.is_valid)():
+            return await self.form_valid(form)
+        return self.form_invalid(form)
+
+    async def put(self, *args, **kwargs):
+        return await self.post(*args, **kwargs)
+
 
 # # Registration form view
-class RegisterView(FormView):
+class RegisterView(AsyncFormView):
     template_name = 'register.html'
     form_class = UserRegistrationForm
-    
-    # Logged in users should never see the register page
-    def dispatch(self, request, *args, **kwargs):
-        if request.user.is_authenticated:
-            return redirect(reverse_lazy('custom_admin:index'))
-        return super().dispatch(request, *args, **kwargs)
-    
-    def form_valid(self, form):
-        form.save()
+    throttle_action = 'register'
+
+    async def form_valid(self, form):
+        await form.asave()
         messages.success(self.request, "You have successfully Registered.")
         # Return the same page with an empty form
         return self.render_to_response(self.get_context_data(form=self.form_class()))
-    
-    
+
+
 # Custom login view
-class CustomLoginView(LoginView):
+class CustomLoginView(AsyncFormView):
     template_name = 'login.html'
-    
+    form_class = AuthenticationForm
+    throttle_action = 'login'
+
+    # Like Django's LoginView: never cached, and passwords are hidden from error reports
+    async def dispatch(self, request, *args, **kwargs):
+        request.sensitive_post_parameters = '__ALL__'
+        response = await super().dispatch(request, *args, **kwargs)
+        add_never_cache_headers(response)
+        return response
+
+    def get_form_kwargs(self):
+        return {**super().get_form_kwargs(), 'request': self.request}
+
     # Check if the user is_staff after a successful login
     # If not, call logout and redirect to account disabled
-    def form_valid(self, form):
+    async def form_valid(self, form):
         user = form.get_user()
         if not user.is_staff:
             # Log the user out immediately
-            logout(self.request)
+            await sync_to_async(logout)(self.request)
             # Redirect to an account disabled or info page
             return redirect(reverse_lazy('account_disabled'))
         messages.success(self.request, "You have successfully logged in.")
-        return super().form_valid(form)
-    
-    # Logged in users should never see the login page
-    def dispatch(self, request, *args, **kwargs):
-        if request.user.is_authenticated:
-            # Redirect all logged-in users to the Django admin dashboard
-            return redirect(reverse_lazy('custom_admin:index'))
-        return super().dispatch(request, *args, **kwargs)
+        await sync_to_async(login)(self.request, user)
+        return HttpResponseRedirect(self.get_success_url())
 
     def get_success_url(self):
         # After successful login, send all users to Django admin dashboard
         return reverse_lazy('custom_admin:index')
-    
+
 # Custom logout view
 class CustomLogoutView(LogoutView):
     next_page = '/'
-    
-    
-class AccountDisabledView(TemplateView):
+
+
+class AccountDisabledView(AnonymousOnlyMixin, TemplateView):
     template_name = 'account-disabled.html'
-    
-    def dispatch(self, request, *args, **kwargs):
-        # If the user is already logged‑in, send them to the admin index
-        if request.user.is_authenticated:
-            return redirect(reverse_lazy('custom_admin:index'))   # use 'admin:index' if you kept the default site
-        # Otherwise show the "account disabled" page
-        return super().dispatch(request, *args, **kwargs)
\ No newline at end of file
+
+    # Users who are already logged in are sent to the admin index by AnonymousOnlyMixin;
+    # everyone else sees the "account disabled" page
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(self.get_context_data(**kwargs))
@@ -0,0 +1,125 @@
+"""
+Gunicorn settings for production, used by entrypoint.sh:
+
+    gunicorn mysite.wsgi:application -c python:mysite.gunicorn_conf
+    SERVER_MODE=asgi gunicorn mysite.asgi:application -c python:mysite.gunicorn_conf
+
+Every value can be overridden from the environment (GUNICORN_WORKERS or WEB_CONCURRENCY,
+GUNICORN_THREADS, GUNICORN_TIMEOUT, ...) without editing this file.
+"""
+import logging
+import math
+import os
+from pathlib import Path
+
+logger = logging.getLogger('gunicorn.error')
+
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+
+# Workers and threads
+# The usual 2 x CPU + 1 processes; each gthread worker serves several requests at once
+# while they wait on PostgreSQL. Under ASGI a uvicorn worker multiplexes requests on its
+# event loop instead, and the thread count is ignored.
+# CPUs are the ones this process may run on, capped by a container's cgroup CPU quota:
+# the host's CPU count would start far more workers (each with its own Argon2 hashing
+# memory and database connections) than a container is allowed to run. WEB_CONCURRENCY
+# is the platform convention (Render, Heroku) for setting the worker count directly.
+CGROUP_ROOT = Path('/sys/fs/cgroup')
+
+
+def cgroup_cpu_quota(root=CGROUP_ROOT):
+    # CPUs allowed by the cgroup v2 (cpu.max) or v1 (cpu.cfs_quota_us) quota; None if unlimited
+    try:
+        quota, period = (root / 'cpu.max').read_text().split()
+    except (OSError, ValueError):
+        try:
+            quota = (root / 'cpu' / 'cpu.cfs_quota_us').read_text().strip()
+            period = (root / 'cpu' / 'cpu.cfs_period_us').read_text().strip()
+        except OSError:
+            return None
+    if quota in ('max', '-1'):
+        return None
+    return int(quota) / int(period)
+
+
+def available_cpus(root=CGROUP_ROOT):
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    quota = cgroup_cpu_quota(root)
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(cpus, 1)
+
+
+cpu_count = available_cpus()
+workers = int(os.getenv('GUNICORN_WORKERS') or os.getenv('WEB_CONCURRENCY') or cpu_count * 2 + 1)
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'uvicorn_worker.UvicornWorker' if SERVER_MODE == 'asgi' else 'gthread'
+
+# Timeouts
+# The slowest admin pages (changelist exports, EXPLAIN-heavy dashboards) finish well under
+# 30 s against our database. PostgreSQL cancels a statement a few seconds before gunicorn
+# would kill the worker, so a runaway query fails the request with an error instead of
+# taking the whole worker, and its other threads' requests, down with it.
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+os.environ.setdefault('DB_STATEMENT_TIMEOUT', str(max(timeout - 5, 1) * 1000))
+
+# Worker recycling
+# Each worker is replaced after roughly max_requests requests to contain slow memory
+# growth; the jitter staggers restarts so workers don't all recycle at the same moment.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+# Load Django once in the master and fork workers from it: they share its memory
+# copy-on-write and start serving immediately, including workers replaced by recycling
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+
+
+def warm_up():
+    # Does the first-request work once, in the master, so that every forked worker inherits
+    # it. Returns the number of templates compiled.
+    from django.apps import apps
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connections
+    from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+    from django.urls import get_resolver
+
+    # Importing the URLconf imports main.admin and every other registered ModelAdmin
+    get_resolver().url_patterns
+
+    # With the cached template loader, compiled templates stay in memory for reuse
+    compiled = 0
+    for engine in engines.all():
+        for directory in map(Path, engine.template_dirs):
+            for path in sorted(directory.rglob('*.html')):
+                try:
+                    engine.get_template(path.relative_to(directory).as_posix())
+                except (TemplateDoesNotExist, TemplateSyntaxError):
+                    continue
+                compiled += 1
+
+    # Open each database connection once, failing at boot rather than on the first request,
+    # and fill the per-process ContentType cache the admin reads on every page
+    for connection in connections.all():
+        connection.ensure_connection()
+    ContentType.objects.get_for_models(*apps.get_models())
+
+    # Workers must not share the master's sockets: each opens its own connections. The
+    # pooled backend (main/db/pooled) keeps released connections open, so its pool is emptied.
+    connections.close_all()
+    for connection in connections.all():
+        if hasattr(connection, 'close_pool'):
+            connection.close_pool()
+    return compiled
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before the first worker is forked
+    compiled = warm_up()
+    logger.info("Warmed up: %d templates compiled, database connections checked", compiled)
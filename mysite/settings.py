@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,6 +46,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # full-text and trigram search for the admin
     'main.apps.MainConfig',
 ]
 
@@ -53,7 +55,8 @@ if os.environ.get('DJANGO_ENV') != 'production':
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',  # for static files
+    'main.middleware.AsyncWhiteNoiseMiddleware',  # for static files (WhiteNoise, async-capable for ASGI)
+    'main.middleware.ReplicaPinningMiddleware',  # read replica routing, a no-op without DATABASE_REPLICA_URLS
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware', 
@@ -85,10 +88,153 @@ WSGI_APPLICATION = 'mysite.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-print("DATABASE_URL:", os.environ.get("DATABASE_URL"))
+# 'wsgi' (gunicorn sync workers) or 'asgi' (gunicorn with uvicorn workers), see entrypoint.sh
+SERVER_MODE = os.getenv('SERVER_MODE', 'wsgi')
+
+# Under ASGI each request's sync code runs in a fresh thread with its own connection, so
+# persistent connections would pile up; connections are closed after every request instead
 DATABASES = {
-    'default': dj_database_url.config(conn_max_age=600, engine="django.db.backends.postgresql")
+    'default': dj_database_url.config(
+        conn_max_age=0 if SERVER_MODE == 'asgi' else 600, engine="django.db.backends.postgresql"
+    )
+}
+
+# Set to True when DATABASE_URL points at PgBouncer (or another pooler) in transaction
+# mode. Such poolers reject startup parameters, so the statement timeout below has to be
+# set on the database role instead (ALTER ROLE ... SET statement_timeout = ...).
+# Server-side cursors stay enabled so exports keep streaming, which means every
+# QuerySet.iterator() must run inside transaction.atomic(): outside one the cursor outlives
+# its transaction and the pooler may send the next FETCH to another server connection.
+DB_TRANSACTION_POOLER = os.getenv('DB_TRANSACTION_POOLER', 'False') == 'True'
+
+# Per-statement limit in milliseconds, set by mysite/gunicorn_conf.py to stay under the
+# worker timeout; unset (no limit) for management commands and the development server
+if os.getenv('DB_STATEMENT_TIMEOUT') and not DB_TRANSACTION_POOLER:
+    DATABASES['default'].setdefault('OPTIONS', {})['options'] = f"-c statement_timeout={os.getenv('DB_STATEMENT_TIMEOUT')}"
+
+# Connection pooling (opt-in): with DB_POOL_SIZE > 0 each process borrows connections from a
+# pool of at most that many (main/db/pooled) and returns them when a request finishes, so
+# PostgreSQL sees workers x DB_POOL_SIZE connections whatever the thread count. Requests
+# wait up to DB_POOL_TIMEOUT seconds for a free connection; connections idle for longer than
+# DB_POOL_CHECK_INTERVAL seconds are pinged before reuse.
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 0))
+if DB_POOL_SIZE:
+    DATABASES['default']['ENGINE'] = 'main.db.pooled'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'max_size': DB_POOL_SIZE,
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'check_interval': float(os.getenv('DB_POOL_CHECK_INTERVAL', 30)),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 3600)),
+    }
+
+# Read replicas (optional): DATABASE_REPLICA_URLS is a comma-separated list of URLs in the
+# DATABASE_URL format, each becoming an alias (replica1, replica2, ...) with the primary's
+# engine and options. main.routers.PrimaryReplicaRouter then sends request reads there;
+# see main/routers.py for what stays on the primary. In tests the replicas mirror the
+# test database.
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.getenv('DATABASE_REPLICA_URLS', '').split(',')), start=1):
+    replica = dj_database_url.parse(url.strip(), conn_max_age=DATABASES['default']['CONN_MAX_AGE'])
+    DATABASES[f'replica{number}'] = {
+        **replica,
+        'ENGINE': DATABASES['default']['ENGINE'],
+        'OPTIONS': {**DATABASES['default'].get('OPTIONS', {}), **replica.get('OPTIONS', {})},
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['main.routers.PrimaryReplicaRouter'] if DATABASE_REPLICAS else []
+
+# Seconds a client keeps reading from the primary after one of its requests wrote to it
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+
+# Caches
+# 'shared' is the cross-worker backend chosen by CACHE_URL:
+#   redis://host:6379/0         Redis (needs the redis package)
+#   pymemcache://host:11211     memcached (needs pymemcache)
+#   db://cache_table            a PostgreSQL table (run `manage.py createcachetable` first)
+#   unset                       a per-process in-memory stand-in for development and tests
+# 'local' is a per-worker in-memory layer and 'default' reads through it to 'shared'
+# (main/cache.py). Data that must be consistent across workers uses 'shared' directly,
+# except cache versions and sessions, which fall back to the database without CACHE_URL.
+CACHE_URL = os.getenv('CACHE_URL', '')
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    SHARED_CACHE = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}
+elif CACHE_URL.startswith('pymemcache://'):
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': CACHE_URL.removeprefix('pymemcache://'),
+    }
+elif CACHE_URL.startswith('db://'):
+    SHARED_CACHE = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': CACHE_URL.removeprefix('db://'),
+    }
+else:
+    SHARED_CACHE = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'shared'}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'main.cache.TieredCache',
+        'OPTIONS': {
+            'LOCAL': 'local',
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': int(os.getenv('CACHE_LOCAL_TIMEOUT', '10')),
+        },
+    },
+    'local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'local',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'shared': SHARED_CACHE,
+}
+
+# Where cache version tokens live (main/cache.py); must be consistent across workers, so
+# without CACHE_URL they're kept in the main_cache_version table (migration 0015) rather
+# than the per-process stand-in, where a bump would only reach the worker that made it
+if CACHE_URL:
+    CACHE_VERSION_ALIAS = 'shared'
+else:
+    CACHES['versions'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'main_cache_version',
+    }
+    CACHE_VERSION_ALIAS = 'versions'
+
+# Login and registration throttling (main/throttling.py): token buckets per client IP and
+# per username, as "<burst>/<seconds>"; an empty value turns a bucket off. They live in
+# the shared cache, which needs a real backend (CACHE_URL) to hold across workers.
+THROTTLE_RATES = {
+    'login-ip': os.getenv('THROTTLE_LOGIN_IP', '10/60'),
+    'login-username': os.getenv('THROTTLE_LOGIN_USERNAME', '5/60'),
+    'register-ip': os.getenv('THROTTLE_REGISTER_IP', '5/600'),
+    'register-username': os.getenv('THROTTLE_REGISTER_USERNAME', '3/600'),
 }
+THROTTLE_CACHE_ALIAS = 'shared'
+# Number of reverse proxies in front of the app that append to X-Forwarded-For (Render's
+# load balancer counts as one); 0 uses REMOTE_ADDR
+THROTTLE_PROXY_COUNT = int(os.getenv('THROTTLE_PROXY_COUNT', '0'))
+
+# Sessions: SESSION_STORE is one of
+#   cached_db  reads from the shared cache, writes through to django_session
+#   cache      shared cache only
+#   db         Django's default, one django_session read per request
+# It defaults to cached_db with CACHE_URL and to db without: with the per-process stand-in
+# a logout only evicts the session from one worker's cache, and the others keep accepting
+# it. Outside DEBUG the cache-backed stores are refused without CACHE_URL for that reason.
+SESSION_STORE = os.getenv('SESSION_STORE', 'cached_db' if CACHE_URL else 'db')
+if SESSION_STORE in ('cache', 'cached_db') and not CACHE_URL and not DEBUG:
+    raise ImproperlyConfigured(f"SESSION_STORE={SESSION_STORE} needs a shared cache; set CACHE_URL or use 'db'")
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_STORE}'
+SESSION_CACHE_ALIAS = 'shared'
+
+# Expired django_session rows are deleted in batches after responses (main/sessions.py),
+# at most once per interval across all workers; 0 disables the sweeper
+SESSION_SWEEP_INTERVAL = int(os.getenv('SESSION_SWEEP_INTERVAL', '600'))
+SESSION_SWEEP_BATCH = int(os.getenv('SESSION_SWEEP_BATCH', '1000'))
 
 
 # Password validation
@@ -109,6 +255,34 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PASSWORD_HASHER picks the algorithm for new hashes: argon2 (default, needs argon2-cffi),
+# scrypt or pbkdf2. The others stay listed so existing hashes verify, and are upgraded to
+# the preferred algorithm and costs on the user's next login (main/hashers.py).
+# Costs: Argon2 memory in KiB (19 MiB, t=2, p=1 is OWASP's baseline), scrypt N/r/p,
+# PBKDF2 iterations (Django's default). Use `manage.py benchmark_hashers` to fit them to
+# the login latency budget on the production hardware.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'argon2')
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '19456'))
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '1'))
+SCRYPT_WORK_FACTOR = int(os.getenv('SCRYPT_WORK_FACTOR', str(2**14)))
+SCRYPT_BLOCK_SIZE = int(os.getenv('SCRYPT_BLOCK_SIZE', '8'))
+SCRYPT_PARALLELISM = int(os.getenv('SCRYPT_PARALLELISM', '1'))
+PBKDF2_ITERATIONS = int(os.getenv('PBKDF2_ITERATIONS', '600000'))
+
+TUNED_HASHERS = {
+    'argon2': 'main.hashers.TunedArgon2PasswordHasher',
+    'scrypt': 'main.hashers.TunedScryptPasswordHasher',
+    'pbkdf2': 'main.hashers.TunedPBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [
+    TUNED_HASHERS[PASSWORD_HASHER],
+    *(hasher for name, hasher in TUNED_HASHERS.items() if name != PASSWORD_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -138,6 +312,11 @@ LOGGING = {
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
+#
+# collectstatic runs once, while the Docker image is built: files are stored under
+# content-hashed names with gzip and, with the brotli package installed, Brotli copies
+# next to them. WhiteNoise serves the hashed names with a far-future, immutable
+# Cache-Control header and picks the precompressed copy the browser accepts.
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATIC_URL = 'static/'
 STORAGES = {
@@ -145,6 +324,8 @@ STORAGES = {
         'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
     },
 }
+# Templates only ever link hashed names ({% static %}), so the originals are left out
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -152,4 +333,30 @@ STORAGES = {
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # The login url for unauthenticated users who try to visit the secure views
-LOGIN_URL = '/login/'
\ No newline at end of file
+LOGIN_URL = '/login/'
+
+# Admin changelists switch to keyset pagination and estimated counts once a table's
+# estimated row count (pg_class.reltuples) reaches this size
+ADMIN_LARGE_TABLE_THRESHOLD = int(os.getenv('ADMIN_LARGE_TABLE_THRESHOLD', '100000'))
+# Resolved user/group permissions are cached across requests (main/permissions.py) and
+# invalidated on group, permission and user changes. Permission sets are immutable under
+# their versioned keys, so they go through the local layer; the versions themselves live in
+# CACHE_VERSION_ALIAS.
+AUTHENTICATION_BACKENDS = ['main.permissions.CachedPermissionBackend']
+PERMISSION_CACHE_ALIAS = 'default'
+PERMISSION_CACHE_TIMEOUT = int(os.getenv('PERMISSION_CACHE_TIMEOUT', '300'))
+
+# Per-user admin fragments (app list, recent actions) are cached under the user's permission
+# version and invalidated by permission changes and new admin log entries (main/fragments.py).
+# The dashboard request overview is shared and simply expires.
+ADMIN_FRAGMENT_CACHE_ALIAS = 'default'
+ADMIN_FRAGMENT_CACHE_TIMEOUT = int(os.getenv('ADMIN_FRAGMENT_CACHE_TIMEOUT', '3600'))
+ADMIN_DASHBOARD_CACHE_TIMEOUT = int(os.getenv('ADMIN_DASHBOARD_CACHE_TIMEOUT', '60'))
+# Autocomplete lookups (client picker on request forms) are cached per term and page in the
+# fragment cache alias. Entries are dropped on client saves; the timeout bounds staleness
+# after bulk loads that skip signals (main/autocomplete.py).
+ADMIN_AUTOCOMPLETE_CACHE_TIMEOUT = int(os.getenv('ADMIN_AUTOCOMPLETE_CACHE_TIMEOUT', '30'))
+# Changelist filter counts are cached per facet and filter combination in the same alias and
+# dropped on ORM writes and status actions; the timeout bounds staleness after bulk loads
+# (main/facets.py).
+ADMIN_FACET_CACHE_TIMEOUT = int(os.getenv('ADMIN_FACET_CACHE_TIMEOUT', '300'))